@@ -2,6 +2,7 @@ import tkinter as tk
 import numpy as np
 import abc
 from sensor import *
+from ring_buffer import RingBuffer
 
 
 __author__ = "Anton Höß"
@@ -36,6 +37,8 @@ class BaseVisu:
         if not omit_clear:
             self.clear()
 
+        self.canvas.begin_layer(self)
+
         # Draw cross
         if draw_origin_cross:
             x0, y0 = self.canvas.scale_point(0, 0)
@@ -47,20 +50,20 @@ class BaseVisu:
     # end def
 
     def clear(self):
-        """Clears the canvas."""
+        """Clears the canvas (incl. the items retained for reuse in the next frame)."""
 
-        self.canvas.delete(tk.ALL)
+        self.canvas.clear()
     # end def
 
     @staticmethod
-    def draw_trace(canvas, trace, draw_arrow=True, proj_dim=0, proj_scale=1., fill_format="#000000", color="black", trace_length_max=100, **kwargs):
+    def draw_trace(canvas, trace, draw_arrow=True, proj_dim=0, proj_scale=1., fill_format="#000000", color="black", trace_length_max=100, n_color_bands=None, steps=None, **kwargs):
         """Draws a trace onto the VehicleVisu's canvas.
 
         Parameters
         ----------
         canvas
             Th canvas to draw on.
-        trace
+        trace : RingBuffer or numpy.ndarray or list
             The trace to be drawn.
         draw_arrow : bool, optional
             Indicates if the trace's arrow shall be drawn.
@@ -77,13 +80,29 @@ class BaseVisu:
             The trace color.
         trace_length_max : int
             Max. trace length.
+        n_color_bands : int, optional
+            Number of color bands the gradient gets quantized to. Each band is drawn as one polyline instead of one
+            line per segment. If not set, each segment gets its own color.
+        steps : numpy.ndarray, optional
+            The positions (indices) of the trace's points within the original trace, if the trace got decimated
+            (see TraceDecimator). They are used for the color gradient and the projection.
         **kwargs : dict, optional
             Keyword arguments passed to tkinter.Canvas.create_line().
         """
 
+        if isinstance(trace, RingBuffer):
+            trace = trace.last()  # Contiguous and chronologically ordered view
+
         num_steps = len(trace)
 
-        if num_steps > 1:
+        if steps is None:
+            steps = range(num_steps)
+
+        if num_steps > 1 and n_color_bands is not None:
+            BaseVisu._draw_trace_bands(canvas, trace, draw_arrow, proj_dim, proj_scale, fill_format, color,
+                                       trace_length_max, n_color_bands, steps, **kwargs)
+
+        elif num_steps > 1:
             p0 = None
             p1 = None
             fill = None
@@ -92,7 +111,7 @@ class BaseVisu:
             capstyle = tk.ROUND
 
             for step in range(1, num_steps):
-                x = step / float(trace_length_max - 1)
+                x = steps[step] / float(trace_length_max - 1)
 
                 fill = fill_format.format(int(x * 255), int((1 - x) * 255))
 
@@ -100,12 +119,12 @@ class BaseVisu:
                 p1 = trace[step]
 
                 if proj_dim == 1:
-                    p0 = p0 * np.asarray([1., 0.]) + np.asarray([0., (step - 1) * proj_scale])
-                    p1 = p1 * np.asarray([1., 0.]) + np.asarray([0., step * proj_scale])
+                    p0 = p0 * np.asarray([1., 0.]) + np.asarray([0., steps[step - 1] * proj_scale])
+                    p1 = p1 * np.asarray([1., 0.]) + np.asarray([0., steps[step] * proj_scale])
 
                 elif proj_dim == 2:
-                    p0 = p0 * np.asarray([0., 1.]) + np.asarray([(step - 1) * proj_scale, 0.])
-                    p1 = p1 * np.asarray([0., 1.]) + np.asarray([step * proj_scale, 0.])
+                    p0 = p0 * np.asarray([0., 1.]) + np.asarray([steps[step - 1] * proj_scale, 0.])
+                    p1 = p1 * np.asarray([0., 1.]) + np.asarray([steps[step] * proj_scale, 0.])
 
                 canvas.create_line(p0[0],
                                    p0[1],
@@ -132,6 +151,52 @@ class BaseVisu:
         # end if
     # end def
 
+    @staticmethod
+    def _draw_trace_bands(canvas, trace, draw_arrow, proj_dim, proj_scale, fill_format, color, trace_length_max, n_color_bands, steps, **kwargs):
+        """Draws a trace with its color gradient quantized to color bands, each drawn as one polyline.
+        See draw_trace() for the parameters."""
+
+        num_steps = len(trace)
+        points = np.asarray(trace, dtype=float)
+        steps = np.asarray(steps)
+
+        if proj_dim == 1:
+            points = points * np.asarray([1., 0.]) + np.outer(steps * proj_scale, [0., 1.])
+
+        elif proj_dim == 2:
+            points = points * np.asarray([0., 1.]) + np.outer(steps * proj_scale, [1., 0.])
+
+        # The band of each segment (the segment step - 1 goes from points[step - 1] to points[step])
+        x = steps[1:] / float(trace_length_max - 1)
+        bands = np.clip((x * n_color_bands).astype(int), 0, n_color_bands - 1)
+        starts = np.flatnonzero(np.diff(bands, prepend=-1))
+        ends = np.append(starts[1:], num_steps - 1)
+
+        fill = None
+
+        for start, end in zip(starts, ends):
+            x_band = (bands[start] + .5) / n_color_bands  # The band's center
+            fill = fill_format.format(int(x_band * 255), int((1 - x_band) * 255))
+
+            canvas.create_line(points[start:end + 1].ravel().tolist(),
+                               fill=fill, capstyle=tk.ROUND, joinstyle=tk.ROUND, **kwargs)
+        # end for
+
+        if draw_arrow:
+            if color is not None:
+                fill = color
+
+            p1 = points[-1]
+            p0 = p1 - (p1 - points[-2]) * 1.e-10
+
+            canvas.create_line(p0[0],
+                               p0[1],
+                               p1[0],
+                               p1[1],
+                               fill=fill, arrow=tk.LAST, **kwargs)
+        # end if
+    # end def
+
     def draw_cov_mat_ell(self, sensor, vehicle, cov_mat, cov_ell_cnt, fill, orient=False):
         """Draws the covariance ellipses.
 
@@ -184,27 +249,64 @@ class TraceVisu(abc.ABC):
     ----------
     trace_length_max : int
         Max. trace length.
+    n_color_bands : int, optional
+        Number of color bands the traces' color gradients get quantized to (see BaseVisu.draw_trace()).
+        If set to None, each trace segment gets drawn with its own color.
     """
 
-    def __init__(self, trace_length_max=10):
-        self.trace_length_max = trace_length_max
+    def __init__(self, trace_length_max=10, n_color_bands=16):
+        self._traces = list()  # All traces created by create_trace() - they get resized together
+        self._trace_length_max = trace_length_max
+        self.n_color_bands = n_color_bands
+    # end def
+
+    @property
+    def trace_length_max(self):
+        """The max. trace length. Setting it resizes all traces while keeping their latest values."""
+
+        return self._trace_length_max
+    # end def
+
+    @trace_length_max.setter
+    def trace_length_max(self, value):
+        self._trace_length_max = value
+
+        for trace in self._traces:
+            trace.resize(value)
+    # end def
+
+    def create_trace(self, dim=2):
+        """Creates a new trace with a length of trace_length_max. The trace is a fixed-size circular array.
+
+        Parameters
+        ----------
+        dim : int, optional
+            The dimension of the trace's values.
+
+        Returns
+        -------
+        RingBuffer
+            The trace.
+        """
+
+        trace = RingBuffer(self._trace_length_max, (dim,))
+        self._traces.append(trace)
+
+        return trace
     # end def
 
     def add_cur_val_to_trace(self, trace, val):
-        """Updates the trace array.
+        """Updates the trace array. Once the trace is full, the oldest value gets overwritten.
 
         Parameters
         ----------
-        trace : list
-            The trace list.
+        trace : RingBuffer
+            The trace.
         val
             Value added to the trace.
         """
 
         trace.append(val)
-
-        while len(trace) > self.trace_length_max:  # Limit trace array length
-            trace.pop(0)
     # end def
 
     @abc.abstractmethod
@@ -0,0 +1,547 @@
+#!/usr/bin/env python
+
+
+"""A headless benchmark suite timing the simulator's hot paths at several scales (number of vehicles, sensors,
+filters, items, ...). The results can be stored as baseline and later runs can be compared against it, which allows to
+gate performance regressions (the exit code is 1 if any benchmark got slower than the tolerance allows).
+
+Examples
+--------
+./benchmark.py --output baseline.json
+./benchmark.py --compare baseline.json --tolerance 0.25
+"""
+
+
+from vehicle import Vehicle
+from vehicle_fleet import VehicleFleet
+from sensor import *
+from sensor_group import HomogeneousTriggeredSensorGroup
+from kalman_filter import EKF
+from kalman_filter_factory import *
+from simulation_engine import SimulationEngine
+from scale_trans_canvas import ScaleTransCanvas
+from base_visu import BaseVisu
+import tkinter as tk
+import numpy as np
+import argparse
+import platform
+import json
+import time
+import sys
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+# The stand-ins for the Tk commands used by the canvas: winfo reports the canvas' size, the canvas command only returns
+# increasing item ids
+_NULL_CANVAS_PROCS = """
+proc winfo {what window} {
+    global null_canvas_size
+    return [dict get $null_canvas_size $what]
+}
+proc .null_canvas {cmd args} {
+    global null_canvas_next_id
+    if {$cmd eq "create"} {
+        return [incr null_canvas_next_id]
+    }
+}
+set null_canvas_next_id 0
+"""
+
+
+class NullCanvas(ScaleTransCanvas):
+    """A ScaleTransCanvas without a window (and without the need of a display). It uses a Tcl interpreter without Tk,
+    where the canvas command is a stub that doesn't draw anything. This way the Python side of the drawing code and
+    the transfer of the drawing commands to Tcl can still be timed.
+
+    Parameters
+    ----------
+    width : int, optional
+        The canvas width.
+    height : int, optional
+        The canvas height.
+    **kwargs : dict, optional
+        The ScaleTransCanvas' settings (scale_factor, scale_ratio, invert_y, center_origin, offset_x, offset_y,
+        zoom_factor).
+    """
+
+    def __init__(self, width=800, height=400, **kwargs):  # Doesn't call the base class' constructor on purpose
+        self.tk = tk.Tcl().tk
+        self.tk.eval(_NULL_CANVAS_PROCS)
+        self.tk.call("set", "null_canvas_size", ("width", width, "height", height))
+        self._w = ".null_canvas"
+
+        self.scale_factor = kwargs.get("scale_factor", 1.)
+        self.scale_ratio = kwargs.get("scale_ratio", None)
+        self.invert_y = kwargs.get("invert_y", False)
+        self.center_origin = kwargs.get("center_origin", False)
+        self.offset_x = kwargs.get("offset_x", 0)
+        self.offset_y = kwargs.get("offset_y", 0)
+        self.zoom_factor = kwargs.get("zoom_factor", 1.)
+
+        self.zoom = 1.
+        self.ratio_scale_factor = 1.
+
+        self.invalidate_transform()
+        self._reset_scene()
+    # end def
+# end class
+
+
+def create_canvas(headless=False):
+    """Creates the canvas to benchmark the drawing code with. Uses a real (withdrawn) tkinter window if a display
+    is available, otherwise a NullCanvas.
+
+    Parameters
+    ----------
+    headless : bool, optional
+        Forces the use of the NullCanvas.
+
+    Returns
+    -------
+    ScaleTransCanvas
+        The canvas.
+    """
+
+    settings = dict(scale_factor=.8e-4, scale_ratio=1., invert_y=True, center_origin=True)
+
+    if not headless:
+        try:
+            master = tk.Tk()
+            master.withdraw()
+            canvas = ScaleTransCanvas(master, width=800, height=400, **settings)
+            canvas.pack()
+            master.update()
+
+            return canvas
+
+        except tk.TclError:
+            pass
+        # end try
+    # end if
+
+    return NullCanvas(width=800, height=400, **settings)
+# end def
+
+
+def _create_vehicles(n):
+    return [Vehicle("V{}".format(i), True, 100. + i % 200, 10. + i % 20) for i in range(n)]
+# end def
+
+
+def _create_fleet_vehicles(n):
+    fleet = VehicleFleet(capacity=n)
+
+    for i in range(n):
+        fleet.add_vehicle("V{}".format(i), True, 100. + i % 200, 10. + i % 20)
+
+    fleet.update(100.)
+
+    return fleet.vehicles
+# end def
+
+
+def _create_kalman_filter(steady_state=False):
+    return KalmanFilterFactory.get_kalman_filter(KalmanFilterType.PLANE_2D, 5., np.identity(2) * 5.e2 ** 2, 20.,
+                                                 x_init=np.asarray([10000, 10000, 150, 300, 0, 0]),
+                                                 steady_state=steady_state)
+# end def
+
+
+def _create_planes(n):
+    return [_seeded(Plane("P{}".format(i), True, np.asarray([1000. * (i % 20), -1000. * (i // 20)]), 1.,
+                          np.asarray([[1.e5, 8.e4], [8.e4, 1.e5]])), i) for i in range(n)]
+# end def
+
+
+def _seeded(sensor, seed=0):
+    sensor.set_rng(np.random.default_rng(seed))
+
+    return sensor
+# end def
+
+
+def _bench_vehicle_update(n, _canvas):
+    vehicles = _create_vehicles(n)
+
+    def run():
+        for v in vehicles:
+            v.update(100.)
+    # end def
+
+    return run
+# end def
+
+
+def _bench_vehicle_fleet_update(n, _canvas):
+    fleet = VehicleFleet(capacity=n)
+
+    for i in range(n):
+        fleet.add_vehicle("V{}".format(i), True, 100. + i % 200, 10. + i % 20)
+
+    return lambda: fleet.update(100.)
+# end def
+
+
+def _bench_plane_measure(n, _canvas):
+    vehicles = _create_vehicles(n)
+
+    for v in vehicles:
+        v.update(100.)
+
+    plane = _seeded(Plane("P", True, np.asarray([3000, 8000]), 3., np.asarray([[1.e5, 8.e4], [8.e4, 1.e5]])))
+
+    def run():
+        for v in vehicles:
+            plane._measure(v)
+    # end def
+
+    return run
+# end def
+
+
+def _bench_plane_measure_all(n, _canvas):
+    vehicles = _create_fleet_vehicles(n)
+    plane = _seeded(Plane("P", True, np.asarray([3000, 8000]), 3., np.asarray([[1.e5, 8.e4], [8.e4, 1.e5]])))
+
+    return lambda: plane.measure_all(vehicles)
+# end def
+
+
+def _bench_radar_measure(n, _canvas):
+    vehicles = _create_vehicles(n)
+
+    for v in vehicles:
+        v.update(100.)
+
+    radar = _seeded(Radar("R", True, np.asarray([4000, 7000]), 12., np.asarray([[.001, 0.], [0., .01]])))
+
+    def run():
+        for v in vehicles:
+            radar._measure(v)
+    # end def
+
+    return run
+# end def
+
+
+def _bench_radar_measure_all(n, _canvas):
+    vehicles = _create_fleet_vehicles(n)
+    radar = _seeded(Radar("R", True, np.asarray([4000, 7000]), 12., np.asarray([[.001, 0.], [0., .01]])))
+
+    return lambda: radar.measure_all(vehicles)
+# end def
+
+
+def _bench_ekf_predict_filter(n, _canvas, steady_state=False):
+    rng = np.random.default_rng(0)
+    filters = [_create_kalman_filter(steady_state) for _ in range(n)]
+    z = rng.normal(10000., 500., (n, 2))
+    u = np.zeros(6)
+
+    def run():
+        for kf, z_kf in zip(filters, z):
+            kf.predict(u)
+            kf.filter(z_kf)
+        # end for
+    # end def
+
+    return run
+# end def
+
+
+def _bench_ekf_join_measurements(n, _canvas):
+    rng = np.random.default_rng(0)
+    R_z_list = [(np.identity(2) * (1. + i % 10) * 1.e4, rng.normal(10000., 500., 2)) for i in range(n)]
+
+    return lambda: EKF.join_measurements(R_z_list)
+# end def
+
+
+def _bench_sensor_group_measure(n, _canvas):
+    vehicles = _create_vehicles(n)
+
+    for v in vehicles:
+        v.update(100.)
+
+    sensors = [_seeded(Plane("P{}".format(i), True, np.asarray([x, y]), None, None), i)
+               for i, (x, y) in enumerate([(0, 0), (10000, -3000), (5000, 5000), (-8000, 6000)])]
+    sensor_group = HomogeneousTriggeredSensorGroup("G", sensors, meas_interval=5., cov_mat=np.identity(2) * 5.e2 ** 2)
+
+    def setup():
+        for sensor in sensors:
+            for v in vehicles:
+                sensor.measure(v)
+        # end for
+    # end def
+
+    def run():
+        for v in vehicles:
+            sensor_group._measure(v)
+    # end def
+
+    return setup, run
+# end def
+
+
+def _bench_sensor_group_measure_all(n_vehicles, n_sensors, steady_state=False):
+    vehicles = _create_fleet_vehicles(n_vehicles)
+    sensors = _create_planes(n_sensors)
+    sensor_group = HomogeneousTriggeredSensorGroup("G", sensors, meas_interval=5., cov_mat=np.identity(2) * 5.e2 ** 2,
+                                                   steady_state=steady_state)
+
+    def setup():
+        for sensor in sensors:
+            sensor.measure_all(vehicles)
+    # end def
+
+    return setup, lambda: sensor_group.measure_all(vehicles)
+# end def
+
+
+def _bench_simulation_engine_step(n, _canvas):
+    # n sensors measuring the vehicles of a fleet on every step
+    engine = SimulationEngine(seed=0)
+
+    for vehicle in _create_fleet_vehicles(10):
+        engine.add_vehicle(vehicle)
+
+    for sensor in _create_planes(n):
+        engine.add_sensor(sensor)
+
+    engine.run(n_steps=2, skip_idle=False)  # Creates the measurement logs
+
+    return engine.step
+# end def
+
+
+def _bench_calc_cov_ell_params_2d(n, _canvas):
+    rng = np.random.default_rng(0)
+    A = rng.normal(0., 1., (n, 2, 2))
+    covs = [a @ a.T + np.identity(2) for a in A]
+
+    def run():
+        for cov in covs:
+            ISensor.calc_cov_ell_params_2d(cov)
+    # end def
+
+    return run
+# end def
+
+
+def _bench_create_oval_rotated(n, canvas):
+    def setup():
+        canvas.delete(tk.ALL)
+
+    def run():
+        for i in range(n):
+            canvas.create_oval_rotated(1000. * (i % 20), 1000. * (i % 17), 800., 300., i * .01, n_segments=20,
+                                       fill="", width=1, outline="black")
+    # end def
+
+    return setup, run
+# end def
+
+
+def _bench_draw_trace(n, canvas, n_color_bands=None):
+    t = np.linspace(0., 1000., max(n, 2))
+    trace = Vehicle("V", True, 300., 9.).calc_states(t)[0]
+
+    def setup():
+        canvas.delete(tk.ALL)
+
+    def run():
+        BaseVisu.draw_trace(canvas, trace, draw_arrow=True, fill_format="#{0:02x}00{1:02x}", color="black",
+                            trace_length_max=len(trace), n_color_bands=n_color_bands, width=5.)
+    # end def
+
+    return setup, run
+# end def
+
+
+def _bench_retained_frame(n, canvas):
+    frames = [0]
+
+    def draw_frame():
+        shift = 100. * (frames[0] % 2)  # Every frame moves all items
+        frames[0] += 1
+
+        canvas.begin_frame()
+        canvas.begin_layer(None)
+
+        for i in range(n):
+            x = 1000. * (i % 20) + shift
+            y = 1000. * (i % 17)
+            canvas.create_line(x, y, x + 500., y + 500., fill="black", width=1)
+        # end for
+
+        canvas.end_frame()
+    # end def
+
+    def setup():
+        canvas.clear()
+        draw_frame()  # Creates the items, so the timed frame updates them
+    # end def
+
+    return setup, draw_frame
+# end def
+
+
+BENCHMARKS = {
+    "Vehicle.update": _bench_vehicle_update,
+    "VehicleFleet.update": _bench_vehicle_fleet_update,
+    "Plane._measure": _bench_plane_measure,
+    "Plane.measure_all(VehicleFleet)": _bench_plane_measure_all,
+    "Radar._measure": _bench_radar_measure,
+    "Radar.measure_all(VehicleFleet)": _bench_radar_measure_all,
+    "EKF.predict+filter": _bench_ekf_predict_filter,
+    "EKF.predict+filter(steady_state=True)": lambda n, canvas: _bench_ekf_predict_filter(n, canvas, steady_state=True),
+    "EKF.join_measurements": _bench_ekf_join_measurements,
+    "HomogeneousTriggeredSensorGroup._measure": _bench_sensor_group_measure,
+    "HomogeneousTriggeredSensorGroup.measure_all": lambda n, _canvas: _bench_sensor_group_measure_all(n, 4),
+    "HomogeneousTriggeredSensorGroup.measure_all(steady_state=True)":
+        lambda n, _canvas: _bench_sensor_group_measure_all(n, 4, steady_state=True),
+    "HomogeneousTriggeredSensorGroup.measure_all(sensors)": lambda n, _canvas: _bench_sensor_group_measure_all(10, n),
+    "SimulationEngine.step(sensors)": _bench_simulation_engine_step,
+    "ISensor.calc_cov_ell_params_2d": _bench_calc_cov_ell_params_2d,
+    "ScaleTransCanvas.create_oval_rotated": _bench_create_oval_rotated,
+    "BaseVisu.draw_trace": _bench_draw_trace,
+    "BaseVisu.draw_trace(n_color_bands=16)": lambda n, canvas: _bench_draw_trace(n, canvas, n_color_bands=16),
+    "ScaleTransCanvas.begin_frame+end_frame": _bench_retained_frame,
+}
+
+
+def run_benchmarks(scales, repeat=5, names=None, headless=False):
+    """Runs the benchmarks at the given scales.
+
+    Parameters
+    ----------
+    scales : list of int
+        The scales (e.g. the number of vehicles, sensors, filters or items - benchmarks ending with "(sensors)" scale
+        the number of sensors).
+    repeat : int, optional
+        The number of repetitions per benchmark and scale. The fastest repetition counts.
+    names : list of str, optional
+        The benchmarks to run. If not set, all benchmarks are run.
+    headless : bool, optional
+        Forces the use of the NullCanvas for the drawing benchmarks.
+
+    Returns
+    -------
+    dict
+        The meta information and the results (min. and median duration in [s]) by "<benchmark>@<scale>".
+    """
+
+    canvas = create_canvas(headless)
+    results = dict()
+
+    for name, bench in BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+
+        for n in scales:
+            setup = None
+            run = bench(n, canvas)
+
+            if isinstance(run, tuple):
+                setup, run = run
+
+            durations = list()
+
+            for _ in range(repeat):
+                if setup is not None:
+                    setup()
+
+                start = time.perf_counter()
+                run()
+                durations.append(time.perf_counter() - start)
+            # end for
+
+            results["{}@{}".format(name, n)] = {"min": min(durations), "median": float(np.median(durations))}
+            print("{:<70s} {:>12.6f} s".format("{}@{}".format(name, n), min(durations)))
+        # end for
+    # end for
+
+    return {"meta": {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+                     "canvas": type(canvas).__name__, "repeat": repeat},
+            "results": results}
+# end def
+
+
+def compare(results, baseline, tolerance):
+    """Compares the results with a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        The results (see run_benchmarks()).
+    baseline : dict
+        The baseline results (see run_benchmarks()).
+    tolerance : float
+        The allowed relative slowdown, e.g. 0.2 for 20 %.
+
+    Returns
+    -------
+    list of str
+        The benchmarks that got slower than allowed.
+    """
+
+    regressions = list()
+
+    for key, result in results["results"].items():
+        if key not in baseline["results"]:
+            continue
+
+        ratio = result["min"] / max(baseline["results"][key]["min"], 1.e-12)
+        status = "REGRESSION" if ratio > 1. + tolerance else "ok"
+        print("{:<70s} {:>8.2f}x  {}".format(key, ratio, status))
+
+        if ratio > 1. + tolerance:
+            regressions.append(key)
+    # end for
+
+    return regressions
+# end def
+
+
+def main():
+    """The main program. Parses the arguments, runs the benchmarks and stores or compares the results."""
+
+    parser = argparse.ArgumentParser(description="Benchmarks the simulator's hot paths.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100, 10000], help="The scales to run at.")
+    parser.add_argument("--repeat", type=int, default=5, help="The number of repetitions (the fastest one counts).")
+    parser.add_argument("--bench", nargs="+", default=None, choices=list(BENCHMARKS), help="The benchmarks to run.")
+    parser.add_argument("--headless", action="store_true", help="Don't use a tkinter window even if possible.")
+    parser.add_argument("--output", default=None, help="The file to store the results in (e.g. as baseline).")
+    parser.add_argument("--compare", default=None, help="The baseline file to compare the results with.")
+    parser.add_argument("--tolerance", type=float, default=.2, help="The allowed relative slowdown.")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.scales, args.repeat, args.bench, args.headless)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    # end if
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        # The drawing benchmarks are not comparable between a real canvas and the NullCanvas
+        if baseline["meta"].get("canvas") != results["meta"]["canvas"]:
+            sys.exit("The baseline was measured with {} instead of {} - use the same (--headless) setting.".format(
+                baseline["meta"].get("canvas"), results["meta"]["canvas"]))
+        # end if
+
+        if len(compare(results, baseline, args.tolerance)) > 0:
+            sys.exit(1)
+    # end if
+# end def
+
+
+if __name__ == "__main__":
+    main()
+# end def
@@ -0,0 +1,188 @@
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+class FrameBuilder:
+    """Collects the drawing commands of a canvas (create, coords, itemconfigure, raise, delete) and evaluates them
+    as one Tcl script, i.e. with a single Python to Tcl round trip instead of one per command.
+    Items created within the batch are referenced by their index within the batch until the script got evaluated,
+    since their handles are not known before.
+    The script only contains the commands - all values (coordinates, options, tags) are passed as arguments of the
+    script, so they never get substituted or evaluated by Tcl, whatever characters they contain.
+
+    Parameters
+    ----------
+    canvas : tkinter.Canvas
+        The canvas to draw on.
+    """
+
+    def __init__(self, canvas):
+        self._canvas = canvas
+        self._commands = list()
+        self._args = list()  # The values referenced by the commands by their index
+        self._n_created = 0
+    # end def
+
+    def __len__(self):
+        return len(self._commands)
+    # end def
+
+    def _arg(self, value) -> str:
+        # Passes the value as argument of the script and returns the reference to it
+        self._args.append(value)
+
+        return "[lindex $v {}]".format(len(self._args) - 1)
+    # end def
+
+    def _options(self, options) -> str:
+        # Converted by tkinter's option handling (e.g. a trailing underscore allows to use reserved words as option
+        # names) and passed as one list, which gets expanded
+        return "{*}" + self._arg(self._canvas._options(options))
+    # end def
+
+    def _ref(self, item) -> str:
+        # A pending item (created within the batch) is referenced by a Tcl variable, an existing one by its handle
+        if isinstance(item, PendingItem):
+            return "$i{}".format(item.index)
+
+        return str(item) if isinstance(item, int) else self._arg(item)
+    # end def
+
+    def create(self, item_type, coords, options):
+        """Adds the creation of an item.
+
+        Parameters
+        ----------
+        item_type : str
+            The item type, e.g. "line".
+        coords : list of float
+            The item's (canvas) coordinates x0, y0, x1, y1, ...
+        options : dict
+            The item's options.
+
+        Returns
+        -------
+        PendingItem
+            The reference to the item within the batch. Its handle is available after flush().
+        """
+
+        item = PendingItem(self._n_created)
+        self._n_created += 1
+
+        self._commands.append("lappend ids [set i{} [$w create {} {{*}}{} {}]]".format(
+            item.index, self._arg(item_type), self._arg(tuple(coords)), self._options(options)))
+
+        return item
+    # end def
+
+    def coords(self, item, coords):
+        """Adds the update of an item's coordinates.
+
+        Parameters
+        ----------
+        item : int or PendingItem
+            The item.
+        coords : list of float
+            The item's new (canvas) coordinates x0, y0, x1, y1, ...
+        """
+
+        self._commands.append("$w coords {} {{*}}{}".format(self._ref(item), self._arg(tuple(coords))))
+    # end def
+
+    def itemconfigure(self, item, options):
+        """Adds the update of an item's options.
+
+        Parameters
+        ----------
+        item : int or PendingItem
+            The item.
+        options : dict
+            The item's changed options.
+        """
+
+        self._commands.append("$w itemconfigure {} {}".format(self._ref(item), self._options(options)))
+    # end def
+
+    def tag_raise(self, item, above_this=None):
+        """Adds the raising of an item in the stacking order.
+
+        Parameters
+        ----------
+        item : int or PendingItem
+            The item.
+        above_this : int or PendingItem, optional
+            The item to raise the item just above. If not set, the item gets raised to the top.
+        """
+
+        self._commands.append("$w raise {} {}".format(self._ref(item),
+                                                     self._ref(above_this) if above_this is not None else ""))
+    # end def
+
+    def tag_lower(self, item):
+        """Adds the lowering of an item to the bottom of the stacking order.
+
+        Parameters
+        ----------
+        item : int or PendingItem
+            The item.
+        """
+
+        self._commands.append("$w lower {}".format(self._ref(item)))
+    # end def
+
+    def delete(self, *items):
+        """Adds the deletion of items.
+
+        Parameters
+        ----------
+        *items : tuple of int or PendingItem
+            The items.
+        """
+
+        if len(items) > 0:
+            self._commands.append("$w delete {}".format(" ".join(self._ref(item) for item in items)))
+    # end def
+
+    def flush(self) -> list:
+        """Evaluates all collected commands as one Tcl script and starts a new batch.
+
+        Returns
+        -------
+        list of int
+            The handles of the items created within the batch, ordered by their index (see PendingItem).
+        """
+
+        if len(self._commands) == 0:
+            return list()
+
+        # Run the script as anonymous procedure (so the variables stay local) with the canvas and the list of values as
+        # arguments (one list instead of one argument per value, since Tcl handles many parameters slowly)
+        body = "set ids [list]\n" + "\n".join(self._commands) + "\nreturn $ids"
+        args = tuple(self._args)
+
+        self._commands = list()
+        self._args = list()
+        self._n_created = 0
+
+        tk_ = self._canvas.tk
+
+        return [tk_.getint(x) for x in tk_.splitlist(tk_.call("apply", ("w v", body), self._canvas._w, args))]
+    # end def
+# end class
+
+
+class PendingItem:
+    """A reference to an item created within a FrameBuilder's batch, which is not evaluated yet.
+
+    Parameters
+    ----------
+    index : int
+        The item's index within the batch's created items.
+    """
+
+    __slots__ = ("index",)
+
+    def __init__(self, index):
+        self.index = index
+    # end def
+# end class
@@ -7,6 +7,8 @@ from sensor_group_visu import SensorGroupVisu
 from scale_trans_canvas import ScaleTransCanvas
 from scroll_frame import ScrollFrame
 from popup_menu import PopupMenu
+from simulation_engine import SimulationEngine
+from step_metrics import StepMetrics
 import time
 from enum import Enum
 import signal
@@ -33,6 +35,10 @@ class Gui:
         Max. length of the traces.
     meas_buf_max : int, optional
         Max. length of the buffer holding the measurements.
+    engine : SimulationEngine, optional
+        The simulation engine to visualize. If not set, a new one is created.
+    fast_forward_factor : float, optional
+        The ratio of simulated time to wall-clock time in fast forward mode. None means as fast as possible.
     """
 
     class Frame(tk.Frame):
@@ -82,7 +88,7 @@ class Gui:
     # end class
 
     def __init__(self, canvas_width=500, canvas_height=500, base_scale_factor=1.e-2, zoom_factor=1.1,
-                 trace_length_max=100, meas_buf_max=100):
+                 trace_length_max=100, meas_buf_max=100, engine=None, fast_forward_factor=100.):
         self._BASE_SCALE_FACTOR = base_scale_factor  # Set to a fixed value that is good for zoom == 1.0
         self._ZOOM_FACTOR = zoom_factor
 
@@ -93,11 +99,23 @@ class Gui:
 
         self._sg = []  # Sensor groups
 
-        self._t = 0.0       # Absolute time
-        self._t_incr = 1.   # Time increase per tick
+        self._vv_by_vehicle = dict()  # Vehicle visualizations by vehicle
+        self._visu_by_sensor = dict()  # Sensor and sensor group visualizations by sensor (group)
+
+        # The simulation engine owns the clock (absolute time and time increase per tick)
+        self._engine = engine if engine is not None else SimulationEngine(t_start=0.0, t_incr=1.)
+        self._engine.add_vehicle_listener(self._cb_vehicle_updated)
+        self._engine.add_measure_listener(self._cb_measured)
+
+        # The drawing's timing and counters - separated from the engine's metrics, since the frames are not bound to
+        # the engine's ticks (e.g. in fast forward mode or on redrawing after changing the settings), one tick per frame
+        self.draw_metrics = StepMetrics()
+
         self._t_tick = .01  # Sleep [s] per tick
+        self._fast_forward = False  # Jump from sensor event to sensor event instead of using fixed time steps
+        self._fast_forward_factor = fast_forward_factor  # Simulated time per wall-clock time - None means unbounded
 
-        self._trace_length_max = int(trace_length_max / self._t_incr)  # Max. length of the trace
+        self._trace_length_max = int(trace_length_max / self._engine.t_incr)  # Max. length of the trace
         self._meas_buf_max = meas_buf_max  # Max. size of measurements
 
         self._gui_inited = False
@@ -471,6 +489,24 @@ class Gui:
                 scl_time_tick.pack(expand=True, fill=tk.X, side=tk.LEFT)
                 frm = frm.parent
 
+            # Fast forward (real-time factor)
+            with self.Frame(frm) as frm:
+                frm.pack(fill=tk.X, side=tk.TOP)
+                self.fast_forward = tk.BooleanVar()
+                chk_fast_forward = tk.Checkbutton(frm, text="Fast fwd. x", variable=self.fast_forward,
+                                                  command=self.cb_fast_forward)
+                chk_fast_forward.pack(fill=tk.X, side=tk.LEFT)
+                self.lbl_fast_forward_factor_val = tk.Label(frm, bg="white", anchor=tk.E)
+                self.lbl_fast_forward_factor_val.pack(expand=True, fill=tk.X, side=tk.LEFT)
+
+                self.fast_forward_factor = tk.IntVar()
+                scl_fast_forward_factor = tk.Scale(frm, orient=tk.HORIZONTAL, showvalue=False, from_=0, to=1000,
+                                                   resolution=10, length=70, variable=self.fast_forward_factor,
+                                                   command=self.cb_fast_forward)
+                scl_fast_forward_factor.set(self._fast_forward_factor or 0)
+                scl_fast_forward_factor.pack(expand=True, fill=tk.X, side=tk.LEFT)
+                frm = frm.parent
+
             # Trace length max.
             sep_hor = tk.Frame(frm, height=2, bd=1, relief=tk.SUNKEN)
             sep_hor.pack(fill=tk.X, padx=5, pady=5)
@@ -558,7 +594,7 @@ class Gui:
                                            scale_ratio=1., invert_y=True, center_origin=True, offset_x=0, offset_y=0,
                                            zoom_factor=self._ZOOM_FACTOR)
             self.canvas.pack(expand=True, fill=tk.BOTH)
-            self.canvas.bind('<Configure>', self.cb_canvas_configure)
+            self.canvas.bind('<Configure>', self.cb_canvas_configure, add="+")
             self.canvas.bind('<MouseWheel>', self.cb_mouse_wheel)  # With Windows OS
             self.canvas.bind('<Button-4>', self.cb_mouse_wheel)  # With Linux OS
             self.canvas.bind('<Button-5>', self.cb_mouse_wheel)  # "
@@ -859,8 +895,8 @@ class Gui:
             Event information. Not used.
         """
 
-        self._t_incr = self.time_incr.get()
-        self.lbl_time_incr_val.config(text="{:.1f}".format(self._t_incr))
+        self._engine.t_incr = self.time_incr.get()
+        self.lbl_time_incr_val.config(text="{:.1f}".format(self._engine.t_incr))
     # end def
 
     def cb_time_tick(self, _event):
@@ -876,6 +912,34 @@ class Gui:
         self.lbl_time_tick_val.config(text="{:.2f}".format(self._t_tick))
     # end def
 
+    @property
+    def engine(self):
+        """The simulation engine visualized by the gui.
+
+        Returns
+        -------
+        SimulationEngine
+            The simulation engine.
+        """
+
+        return self._engine
+    # end def
+
+    def cb_fast_forward(self, _event=None):
+        """Callback that toggles the fast forward mode and sets its real-time factor (0 means unbounded).
+
+        Parameters
+        ----------
+        _event optional
+            Event information. Not used.
+        """
+
+        self._fast_forward = self.fast_forward.get()
+        factor = self.fast_forward_factor.get()
+        self._fast_forward_factor = float(factor) if factor > 0 else None
+        self.lbl_fast_forward_factor_val.config(text="{:d}".format(factor) if factor > 0 else "max")
+    # end def
+
     def cb_trace_length_max(self, _event):
         """Callback that sets the max. trace length.
 
@@ -1042,11 +1106,23 @@ class Gui:
     def draw(self):
         """Draws the canvas suing the current settings (what to draw)."""
 
-        self.clear()
-        self._bv.draw(draw_origin_cross=self.draw_origin_cross.get())
-        self._draw_vehicles()
-        self._draw_sensors()
-        self._draw_sensors_groups()
+        metrics = self.draw_metrics
+
+        with metrics.timer("draw"):
+            # The items of the previous frame get reused and only updated if they have changed
+            self.canvas.begin_frame()
+            self._bv.draw(omit_clear=True, draw_origin_cross=self.draw_origin_cross.get())
+            self._draw_vehicles()
+            self._draw_sensors()
+            self._draw_sensors_groups()
+            frame_stats = self.canvas.end_frame()
+        # end with
+
+        metrics.add("canvas_items", frame_stats["items"])
+        metrics.add("canvas_items_created", frame_stats["created"])
+        metrics.add("canvas_items_updated", frame_stats["updated"])
+        metrics.add("canvas_items_deleted", frame_stats["deleted"])
+        metrics.end_tick()
     # end def
 
     def _draw_vehicles(self):
@@ -1136,10 +1212,43 @@ class Gui:
         return None
     # end def
 
+    def _cb_vehicle_updated(self, vehicle):
+        """Callback that adds the updated vehicle's state values to its traces.
+
+        Parameters
+        ----------
+        vehicle
+            The vehicle that got updated.
+        """
+
+        vv = self._vv_by_vehicle.get(vehicle)
+
+        if vv is not None:
+            vv.add_cur_vals_to_traces()
+    # end def
+
+    def _cb_measured(self, sensor, vehicle, _measurement):
+        """Callback that adds a new measurement to the trace of the corresponding sensor (group) visualization.
+
+        Parameters
+        ----------
+        sensor
+            The sensor (or sensor group) that did the measurement.
+        vehicle
+            The measured vehicle.
+        _measurement
+            The measurement. Not used.
+        """
+
+        visu = self._visu_by_sensor.get(sensor)
+
+        if visu is not None:
+            visu.add_cur_vals_to_traces(vehicle)
+    # end def
+
     def step(self):
         """Performs a simulation step and updates the drawing canvas."""
 
-        draw = False
         # Update gui elements with current values
         for vv in self._vv:
             if vv.vehicle.active:
@@ -1158,45 +1267,48 @@ class Gui:
             # end if
         # end for
 
-        # Update vehicle positions
-        for vv in self._vv:
-            v = vv.vehicle
-            v.update(self._t)
-            vv.add_cur_vals_to_traces()
-            draw = True
-        # end for
-
-        # Update sensor measurements
-        for sv in self._sv:
-            if sv.sensor.trigger(self._t):
-                for vv in self._vv:
-                    v = vv.vehicle
-                    sv.sensor.measure(v)
-                    sv.add_cur_vals_to_traces(v)
-                    draw = True
-                # end for
-            # end if
-        # end for
+        # Advance the simulation (the traces get updated by the engine's listeners)
+        t = self._engine.t
 
-        # Make Kalman filtered measurements
-        for sgv in self._sgv:
-            if sgv.sensor_group.trigger(self._t):
-                for vv in self._vv:
-                    v = vv.vehicle
-                    sgv.sensor_group.measure(v)
-                    sgv.add_cur_vals_to_traces(v)
-                    draw = True
-                # end for
-            # end if
+        if self._fast_forward:
+            draw = self._step_fast_forward()
+            t = self._engine.t
+        else:
+            draw = self._engine.step()
         # end if
 
-        self.lbl_time_val.config(text="{:.1f}".format(self._t))
-        self._t += self._t_incr
+        self.lbl_time_val.config(text="{:.1f}".format(t))
 
         if draw:
             self.draw()
     # end def
 
+    def _step_fast_forward(self):
+        """Advances the simulation from sensor event to sensor event for the duration of one tick. With a real-time
+        factor the simulated time advances by factor * tick, otherwise as many events as possible are processed
+        within one tick.
+
+        Returns
+        -------
+        bool
+            True if any event has been processed.
+        """
+
+        if self._fast_forward_factor is not None:
+            return self._engine.run(t_end=self._engine.t + self._fast_forward_factor * self._t_tick,
+                                    variable_step=True) > 0
+
+        else:
+            n_events = 0
+            end = time.time() + self._t_tick
+
+            while time.time() < end and self._engine.step_event():
+                n_events += 1
+
+            return n_events > 0
+        # end if
+    # end def
+
     def add_vehicle(self, v, **kwargs):
         """Adds a vehicle control and status-variable to the gui.
 
@@ -1209,7 +1321,11 @@ class Gui:
 
         """
 
-        self._vv.append(VehicleVisu(v, self.canvas, trace_length_max=self._trace_length_max, **kwargs))
+        vv = VehicleVisu(v, self.canvas, trace_length_max=self._trace_length_max, **kwargs)
+        self._vv.append(vv)
+        self._vv_by_vehicle[v] = vv
+        self._engine.add_vehicle(v)
+
         var = tk.BooleanVar()
         chk = tk.Checkbutton(self.scf_vehicle.frame, text=v.name, variable=var,
                              command=lambda variable=var, vehicle=v: self._cb_toggle_vehicle_active(variable, vehicle))
@@ -1233,7 +1349,11 @@ class Gui:
             Passed to VehicleVisu().
         """
 
-        self._sv.append(SensorVisu(s, self.canvas, trace_length_max=self._trace_length_max, meas_buf_max=self._meas_buf_max, **kwargs))
+        sv = SensorVisu(s, self.canvas, trace_length_max=self._trace_length_max, meas_buf_max=self._meas_buf_max, **kwargs)
+        self._sv.append(sv)
+        self._visu_by_sensor[s] = sv
+        self._engine.add_sensor(s)
+
         var = tk.BooleanVar()
         chk = tk.Checkbutton(self.scf_sensor.frame, text=s.name, variable=var,
                              command=lambda variable=var, sensor=s: self._cb_toggle_sensor_active(variable, sensor))
@@ -1257,7 +1377,11 @@ class Gui:
             Passed to SensorGroupVisu().
         """
 
-        self._sgv.append(SensorGroupVisu(sg, self.canvas, trace_length_max=self._trace_length_max, **kwargs))
+        sgv = SensorGroupVisu(sg, self.canvas, trace_length_max=self._trace_length_max, **kwargs)
+        self._sgv.append(sgv)
+        self._visu_by_sensor[sg] = sgv
+        self._engine.add_sensor_group(sg)
+    # end def
 
     def run(self, auto_play=False, cb_main_loop=None):
         """Adds a sensor-group control and status-variable to the gui.
@@ -1,3 +1,5 @@
+from collections import OrderedDict
+from small_matrix import *
 import numpy as np
 
 
@@ -34,6 +36,11 @@ class EKF:
         Callback that returns the matrix H (calculated for the current time).
     init_with_first_meas : bool
         Indicates if the first measurement shall be used to initialize the filters extimated position.
+    steady_state : bool, optional
+        Indicates if the steady-state Kalman gain shall be used instead of propagating the covariance matrix.
+        Only possible for constant F, Q, H and R (i.e. without the EKF callbacks). See calc_steady_state_gain().
+        The gain is calculated once and only recalculated if one of these matrices gets replaced (not if it gets
+        changed in place).
 
     Returns
     -------
@@ -41,7 +48,13 @@ class EKF:
         An initialized (Extended) Kalman filter object which can be used for further filtering.
     """
 
-    def __init__(self, x_init, P_init, F, B, Q, H, R, cb_f=None, cb_F=None, cb_h=None, cb_H=None, init_with_first_meas=False):
+    _steady_state_cache = OrderedDict()  # Steady-state solutions by (F, Q, H, R) in least recently used order
+    _STEADY_STATE_CACHE_SIZE_MAX = 1024
+    _information_cache = dict()  # Information matrices by stacked R
+    _INFORMATION_CACHE_SIZE_MAX = 1024
+
+    def __init__(self, x_init, P_init, F, B, Q, H, R, cb_f=None, cb_F=None, cb_h=None, cb_H=None, init_with_first_meas=False,
+                 steady_state=False):
         # KF
         self.x = x_init
         self.P = P_init
@@ -64,6 +77,34 @@ class EKF:
             raise ValueError("cb_h() and cb_H() need to be set both or none of them.")
 
         self._inited = not init_with_first_meas  # Makes the first measurement used as the initial state
+
+        self.steady_state = steady_state
+        self._steady_state_gain = None  # The steady-state solution (K, P_pred, P) ...
+        self._steady_state_src = None  # ... and the matrices (F, Q, H, R) it was calculated for
+
+        if self.steady_state and (self.f is not None or self.h is not None):
+            raise ValueError("The steady-state mode requires constant F and H, i.e. no callbacks.")
+    # end def
+
+    def _get_steady_state_gain(self):
+        """Returns the steady-state solution for the filter's current matrices (see calc_steady_state_gain()).
+        It's only recalculated if one of the matrices F, Q, H or R got replaced by a different one since the last call.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            The steady-state Kalman gain K, the predicted covariance matrix P and the updated covariance matrix P.
+        """
+
+        src = (self.F, self.Q, self.H, self.R)
+
+        if self._steady_state_src is None or \
+                not all(m is m_src or np.array_equal(m, m_src) for m, m_src in zip(src, self._steady_state_src)):
+            self._steady_state_gain = self.calc_steady_state_gain(*src)
+            self._steady_state_src = src
+        # end if
+
+        return self._steady_state_gain
     # end def
 
     def predict(self, u):
@@ -77,6 +118,12 @@ class EKF:
         if not self._inited:
             return
 
+        if self.steady_state:
+            self.x = np.dot(self.F, self.x) + np.dot(self.B, u)
+            self.P = self._get_steady_state_gain()[1]
+            return
+        # end if
+
         # Predict new state
         if self.f is None:
             self.x = np.dot(self.F, self.x) + np.dot(self.B, u)
@@ -108,6 +155,13 @@ class EKF:
         if R is not None:
             self.R = R
 
+        if self.steady_state:
+            K, _P_pred, P = self._get_steady_state_gain()
+            self.x = self.x + np.dot(K, z - np.dot(self.H, self.x))
+            self.P = P
+            return
+        # end if
+
         # Compute innovation y
         if self.h is None:
             y = z - np.dot(self.H, self.x)
@@ -122,7 +176,7 @@ class EKF:
 
         # Compute Kalman gain matrix the Kalman gain matrix tells us how strongly to correct each dimension of the
         # predicted state vector by the help of the measurement
-        K = np.dot(self.P, np.dot(self.H.T, np.linalg.inv(S)))
+        K = np.dot(self.P, np.dot(self.H.T, inv_2x2(S) if S.shape == (2, 2) else np.linalg.inv(S)))
 
         # Correct previously predicted new state vector
         self.x = self.x + np.dot(K, y)
@@ -160,6 +214,123 @@ class EKF:
         return self.P
     # end def
 
+    @staticmethod
+    def calc_steady_state_gain(F, Q, H, R, tol=1.e-12, max_iter=100):
+        """Calculates the steady-state Kalman gain by solving the discrete algebraic Riccati equation
+        P = F * (P - P * H.T * (H * P * H.T + R)^-1 * H * P) * F.T + Q with the structured doubling algorithm, which
+        converges quadratically, i.e. within a few dozen iterations. The result is cached per (F, Q, H, R) - the least
+        recently used results get dropped once the cache is full.
+
+        Parameters
+        ----------
+        F : numpy.ndarray
+            State transition matrix.
+        Q : numpy.ndarray
+            Process noise covariance matrix.
+        H : numpy.ndarray
+            Measurement matrix.
+        R : numpy.ndarray
+            Measurement noise covariance matrix.
+        tol : float, optional
+            Relative tolerance for the convergence of the covariance matrix.
+        max_iter : int, optional
+            Max. number of doubling iterations.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            The steady-state Kalman gain K, the predicted covariance matrix P and the updated covariance matrix P.
+        """
+
+        F, Q, H, R = (np.asarray(m, dtype=float) for m in (F, Q, H, R))
+        key = tuple((m.shape, m.tobytes()) for m in (F, Q, H, R))
+        res = EKF._steady_state_cache.get(key)
+
+        if res is not None:
+            EKF._steady_state_cache.move_to_end(key)
+            return res
+        # end if
+
+        # With A = F.T, G = H.T * R^-1 * H the equation reads P = A.T * P * (I + G * P)^-1 * A + Q. Each doubling
+        # step makes P_pred the solution of the Riccati recursion with twice as many steps (starting with Q).
+        A = F.T
+        G = np.dot(H.T, np.linalg.solve(R, H))
+        P_pred = Q
+        I = np.identity(len(F))
+
+        for _ in range(max_iter):
+            W = I + np.dot(G, P_pred)
+            W_A = np.linalg.solve(W, A)
+            P_pred_new = P_pred + np.dot(A.T, np.dot(P_pred, W_A))
+            G = G + np.dot(A, np.dot(np.linalg.solve(W, G), A.T))
+            A = np.dot(A, W_A)
+
+            converged = np.max(np.abs(P_pred_new - P_pred)) <= tol * np.max(np.abs(P_pred_new))
+            P_pred = P_pred_new
+
+            if converged:
+                break
+        else:
+            raise ValueError("The Riccati equation didn't converge - is (F, H) detectable?")
+        # end for
+
+        P_pred = (P_pred + P_pred.T) / 2.
+        S = np.dot(H, np.dot(P_pred, H.T)) + R
+        K = np.linalg.solve(S, np.dot(H, P_pred)).T  # K = P_pred * H.T * S^-1 (P_pred and S are symmetric)
+        P = P_pred - np.dot(K, np.dot(H, P_pred))
+
+        if len(EKF._steady_state_cache) >= EKF._STEADY_STATE_CACHE_SIZE_MAX:
+            EKF._steady_state_cache.popitem(last=False)
+
+        res = EKF._steady_state_cache[key] = (K, P_pred, P)
+
+        return res
+    # end def
+
+    @staticmethod
+    def calc_steady_state_gain_error(F, Q, H, R, P_init, n_steps):
+        """Calculates the error of the steady-state Kalman gain against the gain of the full filter during the
+        transient phase, i.e. for the first n_steps predict/filter cycles starting with P_init.
+
+        Parameters
+        ----------
+        F : numpy.ndarray
+            State transition matrix.
+        Q : numpy.ndarray
+            Process noise covariance matrix.
+        H : numpy.ndarray
+            Measurement matrix.
+        R : numpy.ndarray
+            Measurement noise covariance matrix.
+        P_init : numpy.ndarray
+            Initial (uncertainty) covariance matrix of the full filter.
+        n_steps : int
+            The number of steps to calculate the error for.
+
+        Returns
+        -------
+        numpy.ndarray
+            The relative error ||K_full - K_steady|| / ||K_steady|| (Frobenius norm) for each step.
+        """
+
+        K_ss = EKF.calc_steady_state_gain(F, Q, H, R)[0]
+        K_ss_norm = np.linalg.norm(K_ss)
+
+        errors = np.zeros(n_steps)
+        P = P_init
+
+        for step in range(n_steps):
+            P_pred = np.dot(F, np.dot(P, F.T)) + Q
+            S = np.dot(H, np.dot(P_pred, H.T)) + R
+            K = np.dot(P_pred, np.dot(H.T, np.linalg.inv(S)))
+            P = P_pred - np.dot(K, np.dot(H, P_pred))
+
+            errors[step] = np.linalg.norm(K - K_ss) / K_ss_norm
+        # end for
+
+        return errors
+    # end def
+
     @staticmethod
     def join_measurements(R_z_list, mode=1):
         """Joins multiple measurements.
@@ -181,19 +352,80 @@ class EKF:
             if not isinstance(R_z_list, list):
                 R_z_list = [R_z_list]
 
-            # Calculate R and z
-            R_res = 0
-            z_res = 0
+            R_res, z_res = EKF.join_measurements_stacked(np.asarray([R for R, _z in R_z_list]),
+                                                         np.asarray([z for _R, z in R_z_list]))
+        # end if
+
+        return R_res, z_res
+    # end def
+
+    @staticmethod
+    def get_information_matrices(R):
+        """Returns the information matrices (inverse measurement covariance matrices) of the stacked measurement
+        covariance matrices. They are calculated using solves and cached, since the measurement covariance matrices
+        of the sensors are usually constant.
+
+        Parameters
+        ----------
+        R : numpy.ndarray
+            The stacked measurement covariance matrices of shape (M, D, D).
+
+        Returns
+        -------
+        numpy.ndarray
+            The information matrices of shape (M, D, D).
+        """
 
-            for R, z in R_z_list:
-                R_res += np.linalg.inv(R)
-                z_res += np.dot(np.linalg.inv(R), z)
+        key = (R.shape, R.tobytes())
+        Y = EKF._information_cache.get(key)
 
-            R_res = np.linalg.inv(R_res)
-            z_res = np.dot(z_res, R_res)
+        if Y is None:
+            if len(EKF._information_cache) >= EKF._INFORMATION_CACHE_SIZE_MAX:
+                EKF._information_cache.clear()
+
+            # The information matrices are needed explicitly (as summands), but they are calculated by solves
+            Y = np.linalg.solve(R, np.broadcast_to(np.identity(R.shape[-1]), R.shape))
+            EKF._information_cache[key] = Y
         # end if
 
-        return R_res, z_res
+        return Y
+    # end def
+
+    @staticmethod
+    def join_measurements_stacked(R, z):
+        """Joins multiple measurements in the information form, i.e. R_res = (sum(R_i^-1))^-1 and
+        z_res = R_res * sum(R_i^-1 * z_i), using solves instead of multiplying with explicit inverses: The information
+        vectors R_i^-1 * z_i are solved for (with all sets of measurements as right-hand sides) and R_res and z_res are
+        solved for at once.
+
+        Parameters
+        ----------
+        R : numpy.ndarray
+            The stacked measurement covariance matrices of shape (M, D, D).
+        z : numpy.ndarray
+            The stacked measurements of shape (M, D). Multiple sets of measurements sharing the same R can be joined
+            at once by using the shape (N, M, D).
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+            The joined measurement covariance matrix R_res of shape (D, D) and the joined measurement(s) z_res of
+            shape (D,) or (N, D).
+        """
+
+        R = np.asarray(R, dtype=float)
+        z = np.asarray(z, dtype=float)
+
+        dim = R.shape[-1]
+        z_sets = z.reshape(-1, len(R), dim)  # (N, M, D)
+
+        Y = EKF.get_information_matrices(R).sum(axis=0)
+        y = np.linalg.solve(R, np.transpose(z_sets, (1, 2, 0))).sum(axis=0)  # (D, N)
+
+        # Solve Y * [R_res, z_res.T] = [I, y] (R_res is an output, so it needs to be calculated explicitly)
+        res = np.linalg.solve(Y, np.concatenate((np.identity(dim), y), axis=1))
+
+        return res[:, :dim], res[:, dim:].T.reshape(z.shape[:-2] + (dim,))
     # end def
 
 
@@ -204,3 +436,302 @@ class KF(EKF):
         EKF.__init__(self, x_init, P_init, F, B, Q, H, R, init_with_first_meas=init_with_first_meas)
     # end def
 # end class
+
+
+class KalmanFilterBank:
+    """A bank of linear Kalman filters (one per track) sharing the same F, B and H. The states of all tracks are stored
+    as (N, D) array and the covariances as (N, D, D) array, so predict() and filter() run for all tracks (or a subset)
+    at once using stacked matrix operations and batched solves.
+
+    Parameters
+    ----------
+    F : numpy.ndarray
+        State transition matrix: For predicting the next state from the current state.
+    B : numpy.ndarray
+        Control matrix: For predicting the next state from the current state using control signals.
+    H : numpy.ndarray
+        Measurement matrix: Describes how we think that our sensors map states to measurements z.
+    capacity : int, optional
+        The initial number of tracks to allocate memory for. The bank grows automatically if needed.
+    steady_state : bool, optional
+        Indicates if the steady-state Kalman gains shall be used instead of propagating the covariance matrices
+        (see EKF). The tracks are grouped by their process and measurement noise covariance matrices (Q, R) and all
+        tracks of a group share one gain, which is calculated on the group's first update. A track switches groups if
+        its R changes. The process noise covariance matrices Q must not change.
+    """
+
+    def __init__(self, F, B, H, capacity=16, steady_state=False):
+        self.F = F
+        self.B = B
+        self.H = H
+        self.steady_state = steady_state
+
+        dim_x = F.shape[0]
+        dim_z = H.shape[0]
+        self._n = 0
+        self._x = np.zeros((capacity, dim_x))
+        self._P = np.zeros((capacity, dim_x, dim_x))
+        self._Q = np.zeros((capacity, dim_x, dim_x))
+
+        # The steady-state solutions (K, P_pred, P) by gain index and the gain index of each track (-1 if none yet)
+        self._K_ss = np.zeros((0, dim_x, dim_z))
+        self._P_pred_ss = np.zeros((0, dim_x, dim_x))
+        self._P_ss = np.zeros((0, dim_x, dim_x))
+        self._gain_index = np.full(capacity, -1)
+        self._gain_indices = dict()  # Gain index by (Q id, R)
+
+        self._q_id = np.zeros(capacity, dtype=int)  # The id of each track's Q - tracks with equal Qs share the id
+        self._q_ids = dict()  # Q id by Q
+        self._q_by_id = list()  # Q by Q id
+
+        self._indices = dict()  # Track index by key
+    # end def
+
+    def __len__(self):
+        return self._n
+    # end def
+
+    def __contains__(self, key):
+        return key in self._indices
+    # end def
+
+    @property
+    def x(self):
+        """The state vectors of all tracks of shape (N, D)."""
+
+        return self._x[:self._n]
+    # end def
+
+    @property
+    def P(self):
+        """The uncertainty covariance matrices of all tracks of shape (N, D, D)."""
+
+        return self._P[:self._n]
+    # end def
+
+    @property
+    def Q(self):
+        """The process noise covariance matrices of all tracks of shape (N, D, D)."""
+
+        return self._Q[:self._n]
+    # end def
+
+    def get_index(self, key):
+        """Returns the index of the track with the given key.
+
+        Parameters
+        ----------
+        key
+            The track's key (e.g. the vehicle).
+
+        Returns
+        -------
+        int
+            The track's index.
+        """
+
+        return self._indices[key]
+    # end def
+
+    def add_track(self, key, x_init, P_init, Q):
+        """Adds a new track to the bank.
+
+        Parameters
+        ----------
+        key
+            The track's key (e.g. the vehicle).
+        x_init : numpy.ndarray
+            Initial state vector.
+        P_init : numpy.ndarray
+            Initial (uncertainty) covariance matrix.
+        Q : numpy.ndarray
+            Process noise covariance matrix of this track.
+
+        Returns
+        -------
+        int
+            The track's index.
+        """
+
+        if self._n == len(self._x):
+            for name in ("_x", "_P", "_Q", "_gain_index", "_q_id"):
+                arr = getattr(self, name)
+                arr_new = np.full((2 * len(arr),) + arr.shape[1:], -1 if name == "_gain_index" else 0, dtype=arr.dtype)
+                arr_new[:self._n] = arr[:self._n]
+                setattr(self, name, arr_new)
+            # end for
+        # end if
+
+        Q = np.asarray(Q, dtype=float)
+        q_key = Q.tobytes()
+
+        if q_key not in self._q_ids:
+            self._q_ids[q_key] = len(self._q_by_id)
+            self._q_by_id.append(Q)
+        # end if
+
+        index = self._n
+        self._x[index] = x_init
+        self._P[index] = P_init
+        self._Q[index] = Q
+        self._q_id[index] = self._q_ids[q_key]
+        self._gain_index[index] = -1
+        self._indices[key] = index
+        self._n += 1
+
+        return index
+    # end def
+
+    def predict(self, u=None, indices=None):
+        """Predicts the new state vectors using the transition matrix F and the specified control vectors u and updates
+        the uncertainty covariances of all tracks (or the given subset).
+
+        Parameters
+        ----------
+        u : numpy.ndarray, optional
+            Control vectors of shape (D,) or (N, D) applied by the control-input-model B.
+        indices : numpy.ndarray, optional
+            The indices of the tracks to predict. If not set, all tracks get predicted.
+        """
+
+        if indices is None:
+            indices = slice(0, self._n)
+
+        x = self._x[indices]
+        P = self._P[indices]
+
+        # Predict new state
+        x = np.dot(x, self.F.T)
+
+        if u is not None:
+            x += np.dot(u, self.B.T)
+
+        self._x[indices] = x
+
+        # Update uncertainty covariance matrix (in steady-state mode it's constant once the track's gain is known)
+        if self.steady_state:
+            indices = np.arange(self._n)[indices]
+            gain_index = self._gain_index[indices]
+            steady = gain_index >= 0
+
+            if not np.all(steady):
+                full = ~steady
+                self._P[indices[full]] = np.matmul(np.matmul(self.F, P[full]), self.F.T) + self._Q[indices[full]]
+                indices = indices[steady]
+                gain_index = gain_index[steady]
+            # end if
+
+            self._P[indices] = self._P_pred_ss[gain_index]
+        else:
+            self._P[indices] = np.matmul(np.matmul(self.F, P), self.F.T) + self._Q[indices]
+        # end if
+    # end def
+
+    def _update_steady_state_gains(self, R, indices):
+        """Assigns the given tracks the steady-state gain of their (Q, R). Only the gains of (Q, R) combinations that
+        didn't occur before get calculated.
+
+        Parameters
+        ----------
+        R : numpy.ndarray
+            Measurement covariance matrices of shape (M, M) or (N, M, M).
+        indices : numpy.ndarray
+            The indices of the tracks.
+
+        Returns
+        -------
+        numpy.ndarray
+            The gain indices of the tracks.
+        """
+
+        # Group the tracks by the ids of their Q and (if there are several) their R
+        q_id = self._q_id[indices]
+
+        if R.ndim == 2:
+            R_unique = R[np.newaxis]
+            keys, key_index = np.unique(q_id, return_inverse=True)
+            keys = np.stack((keys, np.zeros_like(keys)), axis=-1)
+        else:
+            R_unique, r_id = np.unique(R.reshape(len(R), -1), axis=0, return_inverse=True)
+            R_unique = R_unique.reshape((-1,) + R.shape[1:])
+            keys, key_index = np.unique(np.stack((q_id, r_id.reshape(-1)), axis=-1), axis=0, return_inverse=True)
+        # end if
+
+        gain_index = np.zeros(len(keys), dtype=int)
+
+        for k, (q_id_key, r_id_key) in enumerate(keys):
+            R_key = R_unique[r_id_key]
+            key = (int(q_id_key), R_key.tobytes())
+
+            if key not in self._gain_indices:
+                K, P_pred, P = EKF.calc_steady_state_gain(self.F, self._q_by_id[q_id_key], self.H, R_key)
+
+                self._gain_indices[key] = len(self._K_ss)
+                self._K_ss = np.concatenate((self._K_ss, K[np.newaxis]))
+                self._P_pred_ss = np.concatenate((self._P_pred_ss, P_pred[np.newaxis]))
+                self._P_ss = np.concatenate((self._P_ss, P[np.newaxis]))
+            # end if
+
+            gain_index[k] = self._gain_indices[key]
+        # end for
+
+        gain_index = gain_index[key_index.reshape(-1)]
+        self._gain_index[indices] = gain_index
+
+        return gain_index
+    # end def
+
+    def filter(self, z, R, indices=None):
+        """Updates the previously predicted states of all tracks (or the given subset) by incorporating the new measurements.
+
+        Parameters
+        ----------
+        z : numpy.ndarray
+            Measurement vectors of shape (N, M).
+        R : numpy.ndarray
+            Measurement covariance matrices of shape (M, M) or (N, M, M).
+        indices : numpy.ndarray, optional
+            The indices of the tracks to update. If not set, all tracks get updated.
+        """
+
+        if indices is None:
+            indices = slice(0, self._n)
+
+        x = self._x[indices]
+
+        # Compute innovation y
+        y = z - np.dot(x, self.H.T)
+
+        if self.steady_state:
+            indices = np.arange(self._n)[indices]
+            gain_index = self._update_steady_state_gains(np.asarray(R, dtype=float), indices)
+
+            self._x[indices] = x + np.matmul(self._K_ss[gain_index], y[..., np.newaxis])[..., 0]
+            self._P[indices] = self._P_ss[gain_index]
+            return
+        # end if
+
+        P = self._P[indices]
+
+        # Compute residual covariance matrix S
+        PHt = np.matmul(P, self.H.T)
+        S = np.matmul(self.H, PHt) + R
+
+        # Compute Kalman gain matrix K = P * H.T * S^-1
+        if S.shape[-1] == 2:
+            K = np.matmul(PHt, inv_2x2_batch(S))
+        else:
+            # Solve S.T * K.T = (P * H.T).T
+            K = np.swapaxes(np.linalg.solve(np.swapaxes(S, -1, -2), np.swapaxes(PHt, -1, -2)), -1, -2)
+        # end if
+
+        # Correct previously predicted new state vector
+        x = x + np.matmul(K, y[..., np.newaxis])[..., 0]
+
+        # Update uncertainty covariance matrix
+        P = P - np.matmul(K, np.matmul(self.H, P))
+
+        self._x[indices] = x
+        self._P[indices] = P
+    # end def
+# end class
@@ -19,7 +19,7 @@ class KalmanFilterFactory:
     """A Kalman filter factory creating Kalman filters."""
 
     @staticmethod
-    def get_kalman_filter(filter_type, meas_interval, cov_mat, q_sigma, x_init=None, P_init=None, F=None, B=None, Q=None, H=None, R=None, cb_f=None, cb_F=None, cb_h=None, cb_H=None):
+    def get_kalman_filter(filter_type, meas_interval, cov_mat, q_sigma, x_init=None, P_init=None, F=None, B=None, Q=None, H=None, R=None, cb_f=None, cb_F=None, cb_h=None, cb_H=None, steady_state=False):
         """Creates a Kalman filter.
 
         Parameters
@@ -54,6 +54,9 @@ class KalmanFilterFactory:
             Callback that transforms a point from the state space to the measurement space (necessary for the EKF). If set, overwrites H.
         cb_H : callable, optional
             Callback that returns the matrix H (calculated for the current time).
+        steady_state : bool, optional
+            Indicates if the filter shall use the (cached) steady-state Kalman gain instead of propagating the
+            covariance matrix. Only possible for filter types with constant F, Q, H and R, i.e. PLANE_2D.
 
         Returns
         -------
@@ -173,6 +176,6 @@ class KalmanFilterFactory:
         if cb_H is not None:
             _cb_H = cb_H
 
-        return EKF(_x_init, _P_init, _F, _B, _Q, _H, _R, cb_f, cb_F, cb_h, cb_H)
+        return EKF(_x_init, _P_init, _F, _B, _Q, _H, _R, cb_f, cb_F, cb_h, cb_H, steady_state=steady_state)
     # end def
 # end class
@@ -0,0 +1,853 @@
+import numpy as np
+import math
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+class MeasurementRecord:
+    """A lightweight, read-only view on one measurement stored in a MeasurementLog. It provides the same interface
+    as a Measurement (vehicle, val, sensor_pos, get_abs_cartesian()) without holding any data itself.
+    The measurement's storage slot is resolved once on creation, since it doesn't change until the measurement gets
+    overwritten in the log. Accessing an overwritten measurement raises an IndexError.
+
+    Parameters
+    ----------
+    log : MeasurementLog
+        The log holding the measurement.
+    seq : int
+        The measurement's sequence number within the log (counting all measurements ever appended).
+    """
+
+    __slots__ = ("_log", "_seq", "_slot")
+
+    def __init__(self, log, seq):
+        self._log = log
+        self._seq = seq
+        self._slot = seq % log.allocated
+    # end def
+
+    def _get_slot(self):
+        if self._seq < self._log.first_seq:
+            raise IndexError("the measurement has already been overwritten")
+
+        return self._slot
+    # end def
+
+    @property
+    def t(self) -> float:
+        return float(self._log._t[self._get_slot()])
+    # end def
+
+    @property
+    def sensor(self):
+        return self._log.sensors[self._log._sensor_id[self._get_slot()]]
+    # end def
+
+    @property
+    def vehicle(self):
+        return self._log.vehicles[self._log._vehicle_id[self._get_slot()]]
+    # end def
+
+    @property
+    def val(self) -> np.ndarray:
+        return self._log._val[self._get_slot()]
+    # end def
+
+    @property
+    def sensor_pos(self) -> np.ndarray:
+        return self._log._sensor_pos[self._get_slot()]
+    # end def
+
+    @property
+    def POLAR(self) -> bool:
+        # Named like Measurement.POLAR, so a record can be appended to another log like a Measurement
+        return self._log.polar[self._log._sensor_id[self._get_slot()]]
+    # end def
+
+    def get_abs_cartesian(self) -> np.ndarray:
+        """Return the measurements position as cartesian coordinates.
+
+        Returns
+        -------
+        numpy.ndarray
+            The cartesian coordinates.
+        """
+
+        val = self.val
+        sensor_pos = self.sensor_pos
+
+        if self.POLAR:
+            return val[0] * np.asarray([math.cos(val[1]), math.sin(val[1])]) + sensor_pos
+        else:
+            return val + sensor_pos
+        # end if
+    # end def
+# end class
+
+
+class MeasurementLog:
+    """A columnar log of measurements. Instead of keeping a Python object per measurement, the timestamp, the sensor
+    id, the vehicle id, the measurement value and the sensor position are stored in typed arrays. The log has a fixed
+    capacity - once it's full, the oldest measurements get overwritten (the arrays are used circularly, the
+    measurement with sequence number seq is stored in slot seq % allocated). The arrays start small and grow
+    (doubling) up to the capacity, so many sparsely used logs stay cheap. Single measurements can be accessed as
+    MeasurementRecord views, whole columns as arrays.
+    Per 2D measurement this makes 8 (timestamp) + 4 (sensor id) + 4 (vehicle id) + 16 (value) + 16 (sensor position)
+    = 48 bytes (see nbytes). The sensors store their own measurements more compactly in a SensorMeasurementLog.
+
+    Parameters
+    ----------
+    capacity : int
+        The max. number of measurements.
+    """
+
+    INITIAL_CAPACITY = 16  # The number of measurements the arrays get allocated for on the first append
+
+    def __init__(self, capacity):
+        self.capacity = max(int(capacity), 1)
+
+        self.sensors = list()  # The sensors by sensor id
+        self.vehicles = list()  # The vehicles by vehicle id
+        self.polar = list()  # Indicates by sensor id if the sensor's measurements are in polar coordinates
+        self._sensor_ids = dict()
+        self._vehicle_ids = dict()
+        self._batch_vehicle_ids = None  # The vehicle ids of the last batch's vehicle list (see append_batch())
+
+        self.allocated = 1  # The number of measurements the arrays are allocated for
+        self.total_count = 0  # The total number of measurements ever appended (incl. the overwritten ones)
+        self.first_seq = 0  # The sequence number of the oldest measurement in the log
+
+        # The arrays are created on the first append, since the value's dimension is not known beforehand
+        self._t = None
+        self._sensor_id = None
+        self._vehicle_id = None
+        self._val = None
+        self._sensor_pos = None
+    # end def
+
+    def __len__(self):
+        return self.total_count - self.first_seq
+    # end def
+
+    def __getitem__(self, index):
+        n = len(self)
+
+        if index < 0:
+            index += n
+
+        if not 0 <= index < n:
+            raise IndexError("measurement log index out of range")
+
+        return MeasurementRecord(self, self.first_seq + index)
+    # end def
+
+    def __iter__(self):
+        return iter(self.last())
+    # end def
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes allocated for the stored measurements."""
+
+        return sum(arr.nbytes for arr in self._arrays())
+    # end def
+
+    def _arrays(self):
+        return [arr for arr in (self._t, self._sensor_id, self._vehicle_id, self._val, self._sensor_pos)
+                if arr is not None]
+    # end def
+
+    def _column(self, arr):
+        # The column in chronological order - a view as long as the log has not wrapped around, a copy afterwards
+        if arr is None:
+            return np.zeros(0)
+
+        start = self.first_seq % self.allocated
+
+        if start + len(self) <= self.allocated:
+            return arr[start:start + len(self)]
+
+        return np.concatenate((arr[start:], arr[:start]))
+    # end def
+
+    @property
+    def t(self) -> np.ndarray:
+        return self._column(self._t)
+    # end def
+
+    @property
+    def sensor_id(self) -> np.ndarray:
+        return self._column(self._sensor_id)
+    # end def
+
+    @property
+    def vehicle_id(self) -> np.ndarray:
+        return self._column(self._vehicle_id)
+    # end def
+
+    @property
+    def val(self) -> np.ndarray:
+        return self._column(self._val)
+    # end def
+
+    @property
+    def sensor_pos(self) -> np.ndarray:
+        return self._column(self._sensor_pos)
+    # end def
+
+    def get_sensor_id(self, sensor) -> int:
+        """Returns the sensor's id within the log. Unknown sensors get registered.
+
+        Parameters
+        ----------
+        sensor : ISensorMeasure
+            The sensor (or sensor group).
+
+        Returns
+        -------
+        int
+            The sensor id.
+        """
+
+        if sensor not in self._sensor_ids:
+            self._sensor_ids[sensor] = len(self.sensors)
+            self.sensors.append(sensor)
+            self.polar.append(False)
+        # end if
+
+        return self._sensor_ids[sensor]
+    # end def
+
+    def get_vehicle_id(self, vehicle) -> int:
+        """Returns the vehicle's id within the log. Unknown vehicles get registered.
+
+        Parameters
+        ----------
+        vehicle : Vehicle
+            The vehicle.
+
+        Returns
+        -------
+        int
+            The vehicle id.
+        """
+
+        if vehicle not in self._vehicle_ids:
+            self._vehicle_ids[vehicle] = len(self.vehicles)
+            self.vehicles.append(vehicle)
+        # end if
+
+        return self._vehicle_ids[vehicle]
+    # end def
+
+    def _create_arrays(self, val_shape, sensor_pos_shape):
+        self.allocated = min(self.INITIAL_CAPACITY, self.capacity)
+
+        self._t = np.zeros(self.allocated)
+        self._sensor_id = np.zeros(self.allocated, dtype=np.int32)
+        self._vehicle_id = np.zeros(self.allocated, dtype=np.int32)
+        self._val = np.zeros((self.allocated,) + val_shape)
+        self._sensor_pos = np.zeros((self.allocated,) + sensor_pos_shape)
+    # end def
+
+    def _grow(self):
+        # Only called before the log wraps around for the first time, i.e. the slots of the stored measurements
+        # (seq % allocated = seq) stay the same
+        self.allocated = min(2 * self.allocated, self.capacity)
+
+        for name in ("_t", "_sensor_id", "_vehicle_id", "_val", "_sensor_pos"):
+            arr = getattr(self, name)
+            arr_new = np.zeros((self.allocated,) + arr.shape[1:], dtype=arr.dtype)
+            arr_new[:len(arr)] = arr
+            setattr(self, name, arr_new)
+        # end for
+    # end def
+
+    def append(self, t, sensor, meas):
+        """Appends a measurement. Only its data is stored, not the Measurement object itself.
+
+        Parameters
+        ----------
+        t : float
+            The measurement's timestamp.
+        sensor : ISensorMeasure
+            The sensor (or sensor group) that made the measurement.
+        meas : Measurement
+            The measurement.
+
+        Returns
+        -------
+        MeasurementRecord
+            The view on the appended measurement.
+        """
+
+        return self.append_values(t, sensor, meas.vehicle, meas.val, meas.sensor_pos, meas.POLAR)
+    # end def
+
+    def append_values(self, t, sensor, vehicle, val, sensor_pos, polar=False):
+        """Appends a measurement given by its values, i.e. without the need to create a Measurement object.
+
+        Parameters
+        ----------
+        t : float
+            The measurement's timestamp.
+        sensor : ISensorMeasure
+            The sensor (or sensor group) that made the measurement.
+        vehicle : Vehicle
+            The measured vehicle.
+        val : numpy.ndarray
+            The measurement vector relative to the sensor's position.
+        sensor_pos : numpy.ndarray
+            The sensor's position.
+        polar : bool, optional
+            Indicates if the measurement is in polar coordinates.
+
+        Returns
+        -------
+        MeasurementRecord
+            The view on the appended measurement.
+        """
+
+        if self._t is None:
+            self._create_arrays(np.shape(val), np.shape(sensor_pos))
+
+        elif self.total_count == self.allocated < self.capacity:
+            self._grow()
+        # end if
+
+        slot = self.total_count % self.allocated
+        sensor_id = self.get_sensor_id(sensor)
+
+        self.polar[sensor_id] = polar
+        self._t[slot] = t
+        self._sensor_id[slot] = sensor_id
+        self._vehicle_id[slot] = self.get_vehicle_id(vehicle)
+        self._sensor_pos[slot] = sensor_pos
+        self._val[slot] = val
+
+        self.total_count += 1
+        self.first_seq = max(self.total_count - self.allocated, 0)
+
+        return MeasurementRecord(self, self.total_count - 1)
+    # end def
+
+    def append_batch(self, t, sensor, batch):
+        """Appends all measurements of a batch measurement (see ISensorMeasure.measure_all()) at once.
+
+        Parameters
+        ----------
+        t : float
+            The measurements' timestamp.
+        sensor : ISensorMeasure
+            The sensor (or sensor group) that made the measurements.
+        batch : MeasurementBatch
+            The measurements.
+        """
+
+        n = len(batch)
+
+        if n == 0:
+            return
+
+        val = np.asarray(batch.val)
+        sensor_pos = np.asarray(batch.sensor_pos)
+
+        if self._t is None:
+            self._create_arrays(val.shape[1:], sensor_pos.shape)
+
+        while self.allocated < self.capacity and self.total_count + n > self.allocated:
+            self._grow()
+
+        vehicles = batch.vehicles
+
+        # The vehicle ids of a batch only need to be looked up again if the vehicle list changes
+        if self._batch_vehicle_ids is None or self._batch_vehicle_ids[0] is not vehicles or \
+                len(self._batch_vehicle_ids[1]) != n:
+            vehicle_ids = np.asarray([self.get_vehicle_id(vehicle) for vehicle in vehicles], dtype=np.int32)
+            self._batch_vehicle_ids = vehicles, vehicle_ids
+        # end if
+
+        k = min(n, self.allocated)  # Only the newest measurements are kept if the batch exceeds the capacity
+        slots = np.arange(self.total_count + n - k, self.total_count + n) % self.allocated
+        sensor_id = self.get_sensor_id(sensor)
+
+        self.polar[sensor_id] = batch.POLAR
+        self._t[slots] = t
+        self._sensor_id[slots] = sensor_id
+        self._vehicle_id[slots] = self._batch_vehicle_ids[1][n - k:]
+        self._sensor_pos[slots] = sensor_pos
+        self._val[slots] = val[n - k:]
+
+        self.total_count += n
+        self.first_seq = max(self.total_count - self.allocated, 0)
+    # end def
+
+    def last(self, k=None) -> list:
+        """Returns the last k measurements in chronological order (oldest first).
+
+        Parameters
+        ----------
+        k : int, optional
+            The number of measurements. If not set, all measurements are returned.
+
+        Returns
+        -------
+        list of MeasurementRecord
+            The measurements.
+        """
+
+        n = len(self)
+        k = n if k is None else min(max(int(k), 0), n)
+
+        return [MeasurementRecord(self, seq) for seq in range(self.total_count - k, self.total_count)]
+    # end def
+# end class
+
+
+class SensorMeasurementRecord(MeasurementRecord):
+    """A lightweight, read-only view on one measurement stored in a SensorMeasurementLog (see MeasurementRecord).
+
+    Parameters
+    ----------
+    log : SensorMeasurementLog
+        The log holding the measurement.
+    seq : int
+        The sequence number of the measurement's row within the log.
+    col : int
+        The measured vehicle's column within the log.
+    """
+
+    __slots__ = ("_col",)
+
+    def __init__(self, log, seq, col):
+        super().__init__(log, seq)
+        self._col = col
+    # end def
+
+    @property
+    def sensor(self):
+        return self._log.sensor
+    # end def
+
+    @property
+    def vehicle(self):
+        return self._log.vehicles[self._col]
+    # end def
+
+    @property
+    def val(self) -> np.ndarray:
+        return self._log._val[self._get_slot(), self._col]
+    # end def
+
+    @property
+    def sensor_pos(self) -> np.ndarray:
+        return self._log._sensor_pos[self._get_slot()]
+    # end def
+
+    @property
+    def POLAR(self) -> bool:
+        return self._log.polar
+    # end def
+# end class
+
+
+class MeasurementBatch:
+    """A read-only view on the measurements of several vehicles made by one sensor at the same time (i.e. one row of a
+    SensorMeasurementLog). The whole batch can be accessed as arrays, single measurements as SensorMeasurementRecord
+    views (which are only created on access).
+
+    Parameters
+    ----------
+    log : SensorMeasurementLog
+        The log holding the measurements.
+    seq : int
+        The sequence number of the measurements' row within the log.
+    cols : slice or numpy.ndarray
+        The measured vehicles' columns within the log.
+    vehicles : list of Vehicle
+        The measured vehicles (in the order of the measurements).
+    """
+
+    __slots__ = ("_log", "_seq", "_slot", "_cols", "vehicles")
+
+    def __init__(self, log, seq, cols, vehicles):
+        self._log = log
+        self._seq = seq
+        self._slot = seq % log.allocated
+        self._cols = cols
+        self.vehicles = vehicles
+    # end def
+
+    def __len__(self):
+        return len(self.vehicles)
+    # end def
+
+    def __getitem__(self, index):
+        n = len(self)
+
+        if index < 0:
+            index += n
+
+        if not 0 <= index < n:
+            raise IndexError("measurement batch index out of range")
+
+        cols = self._cols
+        col = cols.start + index if isinstance(cols, slice) else int(cols[index])
+
+        return SensorMeasurementRecord(self._log, self._seq, col)
+    # end def
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+    # end def
+
+    def _get_slot(self):
+        if self._seq < self._log.first_seq:
+            raise IndexError("the measurements have already been overwritten")
+
+        return self._slot
+    # end def
+
+    @property
+    def t(self) -> float:
+        return float(self._log._t[self._get_slot()])
+    # end def
+
+    @property
+    def sensor(self):
+        return self._log.sensor
+    # end def
+
+    @property
+    def val(self) -> np.ndarray:
+        """The measurements of shape (N, D) - a view on the log, if the vehicles occupy consecutive columns."""
+
+        return self._log._val[self._get_slot(), self._cols]
+    # end def
+
+    @property
+    def sensor_pos(self) -> np.ndarray:
+        return self._log._sensor_pos[self._get_slot()]
+    # end def
+
+    @property
+    def POLAR(self) -> bool:
+        return self._log.polar
+    # end def
+# end class
+
+
+class VehicleMeasurements:
+    """A read-only view on the measurements of one vehicle stored in a SensorMeasurementLog. It behaves like a list of
+    SensorMeasurementRecords in chronological order (oldest first).
+
+    Parameters
+    ----------
+    log : SensorMeasurementLog
+        The log holding the measurements.
+    col : int
+        The vehicle's column within the log.
+    """
+
+    __slots__ = ("_log", "_col")
+
+    def __init__(self, log, col):
+        self._log = log
+        self._col = col
+    # end def
+
+    def _seqs(self) -> np.ndarray:
+        # The sequence numbers of the rows holding a measurement of the vehicle (oldest first)
+        log = self._log
+        seqs = np.arange(log.first_seq, log.total_count)
+
+        if log._valid is None:
+            return seqs
+
+        return seqs[log._valid[seqs % log.allocated, self._col]]
+    # end def
+
+    def __len__(self):
+        return len(self._seqs())
+    # end def
+
+    def __getitem__(self, index):
+        log = self._log
+
+        # Fast path for the newest measurement, which usually is in the newest row
+        if index == -1 and log.total_count > log.first_seq:
+            seq = log.total_count - 1
+
+            if log._valid[seq % log.allocated, self._col]:
+                return SensorMeasurementRecord(log, seq, self._col)
+        # end if
+
+        seqs = self._seqs()
+
+        if index < 0:
+            index += len(seqs)
+
+        if not 0 <= index < len(seqs):
+            raise IndexError("measurement index out of range")
+
+        return SensorMeasurementRecord(log, int(seqs[index]), self._col)
+    # end def
+
+    def __iter__(self):
+        return iter(self.last())
+    # end def
+
+    def last(self, k=None) -> list:
+        """Returns the last k measurements of the vehicle in chronological order (oldest first).
+
+        Parameters
+        ----------
+        k : int, optional
+            The number of measurements. If not set, all measurements are returned.
+
+        Returns
+        -------
+        list of SensorMeasurementRecord
+            The measurements.
+        """
+
+        seqs = self._seqs()
+
+        if k is not None:
+            seqs = seqs[len(seqs) - min(max(int(k), 0), len(seqs)):]
+
+        return [SensorMeasurementRecord(self._log, int(seq), self._col) for seq in seqs]
+    # end def
+# end class
+
+
+class SensorMeasurementLog:
+    """The measurement log of one sensor (or sensor group). It's a table with one row per measuring time and one column
+    per vehicle, which lets a batch measurement of all vehicles be written as one row at once (see append_batch()).
+    Like in a MeasurementLog, the rows are used circularly (the row with sequence number seq is stored in slot
+    seq % allocated) and grow (doubling) up to the capacity. Columns get added (doubling) for new vehicles.
+    The log maps each measured vehicle to the view on its measurements (see VehicleMeasurements).
+    Per 2D measurement this makes 16 (value) + 1 (valid flag) bytes plus 8 (timestamp) + 16 (sensor position) bytes
+    per row shared by all vehicles (see nbytes).
+
+    Parameters
+    ----------
+    capacity : int
+        The max. number of rows, i.e. of measurements per vehicle.
+    sensor : ISensorMeasure
+        The sensor (or sensor group) the log belongs to.
+    """
+
+    INITIAL_CAPACITY = 16  # The number of rows the arrays get allocated for on the first append
+    INITIAL_COLUMNS = 16  # The min. number of vehicle columns the arrays get allocated for
+
+    def __init__(self, capacity, sensor):
+        self.capacity = max(int(capacity), 1)
+        self.sensor = sensor
+        self.polar = False  # Indicates if the sensor's measurements are in polar coordinates
+
+        self.vehicles = list()  # The vehicles by column
+        self._cols = dict()
+        self._batch_cols = None  # The columns of the last batch's vehicle list (see append_batch())
+
+        self.allocated = 1  # The number of rows the arrays are allocated for
+        self.total_count = 0  # The total number of rows ever appended (incl. the overwritten ones)
+        self.first_seq = 0  # The sequence number of the oldest row in the log
+
+        # The arrays are created on the first append, since the value's dimension is not known beforehand
+        self._t = None  # Shape (rows,)
+        self._sensor_pos = None  # Shape (rows, P)
+        self._val = None  # Shape (rows, columns, D)
+        self._valid = None  # Shape (rows, columns), indicates if a vehicle got measured in a row
+    # end def
+
+    def __len__(self):
+        return len(self.vehicles)
+    # end def
+
+    def __contains__(self, vehicle):
+        return vehicle in self._cols
+    # end def
+
+    def __iter__(self):
+        return iter(self.vehicles)
+    # end def
+
+    def __getitem__(self, vehicle):
+        return VehicleMeasurements(self, self._cols[vehicle])
+    # end def
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes allocated for the stored measurements."""
+
+        return sum(arr.nbytes for arr in (self._t, self._sensor_pos, self._val, self._valid) if arr is not None)
+    # end def
+
+    def _get_col(self, vehicle) -> int:
+        col = self._cols.get(vehicle)
+
+        if col is None:
+            col = self._cols[vehicle] = len(self.vehicles)
+            self.vehicles.append(vehicle)
+
+            if self._val is not None and col == self._val.shape[1]:
+                self._grow_cols(col + 1)
+        # end if
+
+        return col
+    # end def
+
+    def _get_cols(self, vehicles):
+        # The columns of the given vehicles - a slice as long as they occupy consecutive columns
+        n = len(vehicles)
+
+        if self._batch_cols is not None and self._batch_cols[0] is vehicles and self._batch_cols[1] == n:
+            return self._batch_cols[2]
+
+        cols = np.asarray([self._get_col(vehicle) for vehicle in vehicles], dtype=np.intp)
+
+        if n > 0 and cols[0] + n - 1 == cols[-1] and np.all(np.diff(cols) == 1):
+            cols = slice(int(cols[0]), int(cols[0]) + n)
+
+        self._batch_cols = vehicles, n, cols
+
+        return cols
+    # end def
+
+    def _grow_cols(self, n_cols):
+        n_cols = max(n_cols, 2 * self._val.shape[1])
+
+        val = np.zeros((self._val.shape[0], n_cols) + self._val.shape[2:])
+        val[:, :self._val.shape[1]] = self._val
+        valid = np.zeros((self._valid.shape[0], n_cols), dtype=bool)
+        valid[:, :self._valid.shape[1]] = self._valid
+
+        self._val = val
+        self._valid = valid
+    # end def
+
+    def _add_row(self, t, val_shape, sensor_pos, polar) -> int:
+        # Appends an empty row and returns its slot
+        if self._t is None:
+            self.allocated = min(self.INITIAL_CAPACITY, self.capacity)
+            n_cols = max(len(self.vehicles), self.INITIAL_COLUMNS)
+
+            self._t = np.zeros(self.allocated)
+            self._sensor_pos = np.zeros((self.allocated,) + np.shape(sensor_pos))
+            self._val = np.zeros((self.allocated, n_cols) + val_shape)
+            self._valid = np.zeros((self.allocated, n_cols), dtype=bool)
+
+        elif self.total_count == self.allocated < self.capacity:
+            # The log has not wrapped around yet, i.e. the slots of the stored rows (seq % allocated) stay the same
+            self.allocated = min(2 * self.allocated, self.capacity)
+
+            for name in ("_t", "_sensor_pos", "_val", "_valid"):
+                arr = getattr(self, name)
+                arr_new = np.zeros((self.allocated,) + arr.shape[1:], dtype=arr.dtype)
+                arr_new[:len(arr)] = arr
+                setattr(self, name, arr_new)
+            # end for
+        # end if
+
+        slot = self.total_count % self.allocated
+
+        self.polar = polar
+        self._t[slot] = t
+        self._sensor_pos[slot] = sensor_pos
+        self._valid[slot] = False
+
+        self.total_count += 1
+        self.first_seq = max(self.total_count - self.allocated, 0)
+
+        return slot
+    # end def
+
+    def append(self, t, vehicle, val, sensor_pos, polar=False):
+        """Appends a single measurement. It's added to the newest row, if that has the same timestamp and doesn't hold a
+        measurement of the vehicle yet, otherwise a new row gets appended.
+
+        Parameters
+        ----------
+        t : float
+            The measurement's timestamp.
+        vehicle : Vehicle
+            The measured vehicle.
+        val : numpy.ndarray
+            The measurement vector relative to the sensor's position.
+        sensor_pos : numpy.ndarray
+            The sensor's position.
+        polar : bool, optional
+            Indicates if the measurement is in polar coordinates.
+
+        Returns
+        -------
+        SensorMeasurementRecord
+            The view on the appended measurement.
+        """
+
+        col = self._get_col(vehicle)
+        slot = (self.total_count - 1) % self.allocated
+
+        if self.total_count == 0 or self._t[slot] != t or self._valid[slot, col] or \
+                np.any(self._sensor_pos[slot] != sensor_pos):
+            slot = self._add_row(t, np.shape(val), sensor_pos, polar)
+
+        self._val[slot, col] = val
+        self._valid[slot, col] = True
+
+        return SensorMeasurementRecord(self, self.total_count - 1, col)
+    # end def
+
+    def append_batch(self, t, vehicles, val, sensor_pos, polar=False):
+        """Appends the measurements of several vehicles made at the same time as a new row at once.
+
+        Parameters
+        ----------
+        t : float
+            The measurements' timestamp.
+        vehicles : list of Vehicle
+            The measured vehicles.
+        val : numpy.ndarray
+            The measurements relative to the sensor's position of shape (N, D) (in the order of the vehicles).
+        sensor_pos : numpy.ndarray
+            The sensor's position.
+        polar : bool, optional
+            Indicates if the measurements are in polar coordinates.
+
+        Returns
+        -------
+        MeasurementBatch
+            The view on the appended measurements.
+        """
+
+        cols = self._get_cols(vehicles)
+        slot = self._add_row(t, np.shape(val)[1:], sensor_pos, polar)
+
+        self._val[slot, cols] = val
+        self._valid[slot, cols] = True
+
+        return MeasurementBatch(self, self.total_count - 1, cols, vehicles)
+    # end def
+
+    def get_batch(self, vehicle):
+        """Returns the newest measurement of the given vehicle as a batch of one measurement.
+
+        Parameters
+        ----------
+        vehicle : Vehicle
+            The vehicle.
+
+        Returns
+        -------
+        MeasurementBatch
+            The view on the measurement.
+        """
+
+        record = self[vehicle][-1]
+
+        return MeasurementBatch(self, record._seq, slice(record._col, record._col + 1), [vehicle])
+    # end def
+# end class
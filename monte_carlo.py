@@ -0,0 +1,178 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import math
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+class ErrorStatistics:
+    """Accumulates the position errors (measured or estimated position minus true position) of one sensor.
+    The statistics of several runs can be merged.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.err_sum = np.zeros(2)
+        self.err_sq_sum = np.zeros(2)
+        self.err_norm_max = 0.
+    # end def
+
+    def __str__(self):
+        return "n={:d}, mean=({:10.4f} {:10.4f}), rmse={:10.4f}, max={:10.4f}".format(
+            self.count, self.mean[0], self.mean[1], self.rmse, self.err_norm_max)
+    # end def
+
+    def add(self, err: np.ndarray):
+        """Adds a position error.
+
+        Parameters
+        ----------
+        err : numpy.ndarray
+            The position error of shape (2,).
+        """
+
+        self.count += 1
+        self.err_sum += err
+        self.err_sq_sum += err * err
+        self.err_norm_max = max(self.err_norm_max, math.hypot(err[0], err[1]))
+    # end def
+
+    def merge(self, other):
+        """Merges the statistics of another run into this one.
+
+        Parameters
+        ----------
+        other : ErrorStatistics
+            The statistics to merge.
+        """
+
+        self.count += other.count
+        self.err_sum += other.err_sum
+        self.err_sq_sum += other.err_sq_sum
+        self.err_norm_max = max(self.err_norm_max, other.err_norm_max)
+    # end def
+
+    @property
+    def mean(self) -> np.ndarray:
+        """The mean error (bias) per coordinate."""
+
+        return self.err_sum / max(self.count, 1)
+    # end def
+
+    @property
+    def rmse(self) -> float:
+        """The root mean squared error of the position."""
+
+        return math.sqrt(np.sum(self.err_sq_sum) / max(self.count, 1))
+    # end def
+# end class
+
+
+def _run_single(scenario: callable, t_end: float, seed_seq: np.random.SeedSequence) -> dict:
+    """Performs a single Monte Carlo run. Defined on module level to be usable by worker processes.
+
+    Parameters
+    ----------
+    scenario : callable
+        The scenario factory.
+    t_end : float
+        The simulation time to stop at.
+    seed_seq : numpy.random.SeedSequence
+        The run's seed sequence.
+
+    Returns
+    -------
+    dict
+        The ErrorStatistics by sensor name.
+    """
+
+    engine = scenario()
+    engine.seed(seed_seq)
+    stats = dict()
+
+    def cb_measured(sensor, vehicle, meas):
+        if sensor.name not in stats:
+            stats[sensor.name] = ErrorStatistics()
+
+        stats[sensor.name].add(meas.get_abs_cartesian()[:2] - vehicle.r)
+    # end def
+
+    engine.add_measure_listener(cb_measured)
+    engine.run(t_end=t_end)
+
+    return stats
+# end def
+
+
+class MonteCarloRunner:
+    """Runs a scenario many times with independent noise realisations, spread over a pool of worker processes,
+    and merges the per-run error statistics.
+    Each run gets its own seed spawned from the runner's seed. The runs' results are merged in run order, which makes
+    the merged statistics bit-reproducible regardless of the number of workers.
+
+    Parameters
+    ----------
+    scenario : callable
+        A factory without parameters that creates the scenario as a SimulationEngine. It needs to be picklable
+        (e.g. a module level function) to be sent to the worker processes.
+    n_runs : int
+        The number of runs.
+    t_end : float
+        The simulation time to stop each run at.
+    seed : int, optional
+        The seed all runs' seeds get spawned from. If not set, fresh entropy is used.
+    n_workers : int, optional
+        The number of worker processes. If not set, one per CPU is used. A value of 1 runs in the current process.
+    """
+
+    def __init__(self, scenario: callable, n_runs: int, t_end: float, seed=None, n_workers=None):
+        self.scenario = scenario
+        self.n_runs = n_runs
+        self.t_end = t_end
+        self.seed_seq = np.random.SeedSequence(seed)
+        self.n_workers = n_workers
+
+        self.run_stats = list()  # The ErrorStatistics by sensor name of each run
+        self.stats = dict()  # The merged ErrorStatistics by sensor name
+    # end def
+
+    def __str__(self):
+        return "\n".join("{}: {}".format(name, stats) for name, stats in self.stats.items())
+    # end def
+
+    def run(self) -> dict:
+        """Performs all runs and merges their error statistics.
+
+        Returns
+        -------
+        dict
+            The merged ErrorStatistics by sensor name.
+        """
+
+        seed_seqs = self.seed_seq.spawn(self.n_runs)
+        n = self.n_runs
+
+        if self.n_workers == 1:
+            self.run_stats = list(map(_run_single, [self.scenario] * n, [self.t_end] * n, seed_seqs))
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+                self.run_stats = list(executor.map(_run_single, [self.scenario] * n, [self.t_end] * n, seed_seqs))
+        # end if
+
+        # Merge in run order (and not in order of completion) to always get the same floating point results
+        self.stats = dict()
+
+        for stats in self.run_stats:
+            for name, sensor_stats in stats.items():
+                if name not in self.stats:
+                    self.stats[name] = ErrorStatistics()
+
+                self.stats[name].merge(sensor_stats)
+            # end for
+        # end for
+
+        return self.stats
+    # end def
+# end class
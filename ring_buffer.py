@@ -0,0 +1,126 @@
+import numpy as np
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+class RingBuffer:
+    """A preallocated, NumPy-backed ring buffer with a fixed capacity. Appending is O(1) and overwrites the oldest
+    entry once the buffer is full.
+    The buffer is stored twice in a row (mirrored), i.e. each entry is written to index i and to index i + capacity.
+    This way the last k entries are always a contiguous, chronologically ordered slice, which allows to return them
+    as a view without copying.
+
+    Parameters
+    ----------
+    capacity : int
+        The max. number of entries.
+    shape : tuple of int, optional
+        The shape of a single entry, e.g. (2,) for 2D positions.
+    dtype : numpy.dtype, optional
+        The data type of the entries.
+    """
+
+    def __init__(self, capacity, shape=(), dtype=float):
+        self._capacity = max(int(capacity), 1)
+        self._data = np.zeros((2 * self._capacity,) + tuple(shape), dtype=dtype)
+        self._pos = 0  # The index the next entry gets written to
+        self._len = 0
+        self.total_count = 0  # The total number of entries ever appended (incl. the overwritten ones)
+    # end def
+
+    def __len__(self):
+        return self._len
+    # end def
+
+    def __getitem__(self, index):
+        return self.last()[index]
+    # end def
+
+    def __iter__(self):
+        return iter(self.last())
+    # end def
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+    # end def
+
+    @property
+    def shape(self) -> tuple:
+        """The shape of a single entry."""
+
+        return self._data.shape[1:]
+    # end def
+
+    def append(self, value):
+        """Appends an entry and overwrites the oldest one, if the buffer is full.
+
+        Parameters
+        ----------
+        value : numpy.ndarray or scalar
+            The entry to append.
+        """
+
+        self._data[self._pos] = value
+        self._data[self._pos + self._capacity] = value
+
+        self._pos = (self._pos + 1) % self._capacity
+        self._len = min(self._len + 1, self._capacity)
+        self.total_count += 1
+    # end def
+
+    def last(self, k=None) -> np.ndarray:
+        """Returns the last k entries in chronological order (oldest first) as a view, i.e. without copying.
+        The view gets overwritten by subsequent appends - copy it if it needs to be kept.
+
+        Parameters
+        ----------
+        k : int, optional
+            The number of entries. If not set, all entries are returned.
+
+        Returns
+        -------
+        numpy.ndarray
+            The entries of shape (k,) + shape.
+        """
+
+        k = self._len if k is None else min(max(int(k), 0), self._len)
+        end = self._pos + self._capacity
+
+        return self._data[end - k:end]
+    # end def
+
+    def resize(self, capacity):
+        """Changes the capacity while keeping the latest entries (as many as fit into the new capacity).
+
+        Parameters
+        ----------
+        capacity : int
+            The new max. number of entries.
+        """
+
+        capacity = max(int(capacity), 1)
+
+        if capacity == self._capacity:
+            return
+
+        entries = self.last(capacity).copy()
+
+        self._capacity = capacity
+        self._data = np.zeros((2 * capacity,) + self._data.shape[1:], dtype=self._data.dtype)
+        self._len = len(entries)
+        self._pos = self._len % capacity
+        self._data[:self._len] = entries
+        self._data[capacity:capacity + self._len] = entries
+    # end def
+
+    def clear(self):
+        """Removes all entries and resets the total count, i.e. the buffer behaves like a new one afterwards."""
+
+        self._pos = 0
+        self._len = 0
+        self.total_count = 0
+    # end def
+# end class
@@ -122,7 +122,7 @@ class ScaleCanvas(tk.Canvas):
             The x and y-coordinate of the scaled point.
         """
 
-        p = np.asarray([x, y], dtype=np.float)
+        p = np.asarray([x, y], dtype=float)
 
         width = self.winfo_width()
         height = self.winfo_height()
@@ -1,6 +1,7 @@
 import tkinter as tk
 import numpy as np
 import math
+from frame_builder import FrameBuilder, PendingItem
 
 
 __author__ = "Anton Höß"
@@ -45,8 +46,92 @@ class ScaleTransCanvas(tk.Canvas):
         self.zoom_factor = zoom_factor
 
         self.zoom = 1.
+        self.ratio_scale_factor = 1.
+
+        self.invalidate_transform()
+        self._reset_scene()
 
         self.bind("<Motion>", self._cb_motion)
+        self.bind("<Configure>", lambda _event: self.invalidate_transform(), add="+")
+    # end def
+
+    def _reset_scene(self):
+        """Forgets all retained items (see begin_frame())."""
+
+        self._items = dict()  # (layer, ordinal) -> [item, item type, coords, options]
+        self._frame_keys = None  # The keys drawn in the current frame - None if no frame is active
+        self._layer = None
+        self._layer_ordinal = 0
+        self._last_item = None  # The item drawn last in the current frame (for keeping the stacking order)
+        self._batch = FrameBuilder(self)  # Collects the frame's drawing commands
+        self._pending = list()  # The entries of the items created within the current frame
+        self.frame_stats = {"created": 0, "updated": 0, "deleted": 0, "items": 0}
+    # end def
+
+    def clear(self):
+        """Deletes all items, including the retained ones."""
+
+        self.delete(tk.ALL)
+        self._reset_scene()
+    # end def
+
+    def begin_frame(self):
+        """Starts drawing a frame in retained mode. Instead of creating new items, the create_*() functions reuse the
+        items of the previous frame, which got drawn at the same position (layer and ordinal number within the layer,
+        see begin_layer()). Their coordinates and options only get updated if they have changed.
+        Items of the previous frame that don't get drawn again are deleted by end_frame().
+        All drawing commands of the frame are collected and sent to the Tcl interpreter in one go by end_frame()."""
+
+        self._frame_keys = set()
+        self._layer = None
+        self._layer_ordinal = 0
+        self._last_item = None
+
+        self.frame_stats = {"created": 0, "updated": 0, "deleted": 0, "items": 0}
+    # end def
+
+    def begin_layer(self, layer):
+        """Starts a new layer within the current frame. Items are matched with the ones of the previous frame by their
+        ordinal number within the layer, i.e. a changing number of items in one layer doesn't affect other layers.
+
+        Parameters
+        ----------
+        layer
+            The layer's (hashable) key, e.g. the visualization object drawing into the layer.
+        """
+
+        self._layer = layer
+        self._layer_ordinal = 0
+    # end def
+
+    def end_frame(self):
+        """Finishes the current frame, deletes all items of the previous frame that were not drawn again and evaluates
+        the frame's drawing commands.
+
+        Returns
+        -------
+        dict
+            The number of items created, updated and deleted within the frame and the number of items of the frame.
+        """
+
+        stale = [key for key in self._items if key not in self._frame_keys]
+
+        if len(stale) > 0:
+            self._batch.delete(*[self._items.pop(key)[0] for key in stale])
+            self.frame_stats["deleted"] = len(stale)
+        # end if
+
+        # The handles of the created items are known only after evaluating the commands
+        ids = self._batch.flush()
+
+        for entry in self._pending:
+            entry[0] = ids[entry[0].index]
+
+        self._pending = list()
+        self._frame_keys = None
+        self.frame_stats["items"] = len(self._items)
+
+        return self.frame_stats
     # end def
 
     def _cb_motion(self, event):
@@ -75,6 +160,7 @@ class ScaleTransCanvas(tk.Canvas):
         zoom_factor_update = 1. * self.zoom_factor
         zoom_factor_diff = abs(zoom_factor_update - 1)
         self.zoom *= self.zoom_factor
+        self.invalidate_transform()
 
         # Zoom center around the canvas origin if cursor is outside of the canvas
         pointerx = self.winfo_pointerx() - self.winfo_rootx()
@@ -98,6 +184,7 @@ class ScaleTransCanvas(tk.Canvas):
         zoom_factor_update = 1. / self.zoom_factor
         zoom_factor_diff = abs(zoom_factor_update - 1)
         self.zoom /= self.zoom_factor
+        self.invalidate_transform()
 
         # Zoom center around the canvas origin if cursor is outside of the canvas
         pointerx = self.winfo_pointerx() - self.winfo_rootx()
@@ -121,6 +208,7 @@ class ScaleTransCanvas(tk.Canvas):
     def set_offset(self, offset_x, offset_y):
         self.offset_x = offset_x
         self.offset_y = offset_y
+        self.invalidate_transform()
     # end def
 
     def get_center_origin(self):
@@ -155,39 +243,25 @@ class ScaleTransCanvas(tk.Canvas):
             The handle of the created object.
         """
 
-        coords = list()
-
         # Adapted from https://stackoverflow.com/questions/22694850/approximating-an-ellipse-with-a-polygon
         # I've removed Nth point calculation, that involves indefinite Tan(Pi/2)
         # It would better to assign known value 0 to Fi in this point
-        for i in range(-n_segments, n_segments):
-            _theta = math.pi / 2. * i / n_segments
-            phi = math.pi / 2. - math.atan(math.tan(_theta) * r1 / r2)
-            _x = r1 * math.cos(phi)
-            _y = r2 * math.sin(phi)
-            coords.append(np.asarray([_x, _y]))
-        # end for
+        _theta = math.pi / 2. * np.arange(-n_segments, n_segments) / n_segments
+        phi = math.pi / 2. - np.arctan(np.tan(_theta) * r1 / r2)
+        coords = np.stack((r1 * np.cos(phi), r2 * np.sin(phi)), axis=-1)
 
         # Duplicate the upper half of the ellipse to the bottom (mirrored)
-        for c in range(len(coords) - 1, 0, -1):
-            coords.append(np.copy(coords[c]) * np.asarray([1, -1]))
+        coords = np.concatenate((coords, coords[:0:-1] * np.asarray([1., -1.])))
 
         # Rotate and translate the ellipse
         c, s = np.cos(theta), np.sin(theta)
         R = np.array(((c, -s), (s, c)))  # Rotation matrix
         O = np.asarray([x, y])  # Offset vector
 
-        for c in range(len(coords)):
-            coords[c] = np.dot(coords[c], R.T) + O
+        coords = coords @ R.T + O
 
         # Create list with x0, y0, x1, y1, x2, ...
-        _coords = list()
-        for c in coords:
-            _coords.append(c[0])
-            _coords.append(c[1])
-        # end for
-
-        return self.create_polygon(_coords, *args, **kwargs)
+        return self.create_polygon(coords.ravel().tolist(), *args, **kwargs)
     # end def
 
     def scale_point(self, x, y):
@@ -206,81 +280,169 @@ class ScaleTransCanvas(tk.Canvas):
             The x and y-coordinate of the scaled point.
         """
 
-        p = np.asarray([x, y], dtype=np.float)
+        sx, sy, tx, ty = self.get_transform()
 
-        width = self.winfo_width()
-        height = self.winfo_height()
+        return (x - tx) / sx, (y - ty) / sy
+    # end def
 
-        if self.center_origin:
-            p -= np.asarray([width / 2, height / 2])
+    def invalidate_transform(self):
+        """Invalidates the cached world to canvas transformation, e.g. after resizing the canvas."""
 
-        p -= np.asarray([self.offset_x, self.offset_y])
+        self._transform_params = None
+        self._transform = None
+    # end def
 
-        if self.scale_ratio is not None:
-            ratio = width / height
+    def get_transform(self):
+        """Returns the affine transformation from world to canvas coordinates, which combines the ratio scaling,
+        the y-inversion, the basic scaling factor, the zoom factor, the origin centering and the offset.
+        The transformation gets cached and is only calculated anew after resizing, zooming or panning.
 
-            if ratio < self.scale_ratio:
-                ratio_scale_factor = (width / 2.0 * self.scale_ratio)
+        Returns
+        -------
+        (float, float, float, float)
+            The scale factors sx and sy and the translations tx and ty, i.e. (x, y) -> (x * sx + tx, y * sy + ty).
+        """
+
+        params = (self.scale_factor, self.scale_ratio, self.invert_y, self.center_origin, self.offset_x,
+                  self.offset_y, self.zoom)
+
+        if self._transform is None or params != self._transform_params:
+            width = self.winfo_width()
+            height = self.winfo_height()
+
+            if self.scale_ratio is not None:
+                ratio = width / height
+
+                if ratio < self.scale_ratio:
+                    ratio_scale_factor = (width / 2.0 * self.scale_ratio)
+                else:
+                    ratio_scale_factor = (height / 2.0 * self.scale_ratio)
+
+                self.ratio_scale_factor = ratio_scale_factor  # XXX this needs to be implemented properly. There needs to be a function that returns the total scaling.
             else:
-                ratio_scale_factor = (height / 2.0 * self.scale_ratio)
+                ratio_scale_factor = 1.
+            # end if
+
+            sx = ratio_scale_factor * self.scale_factor * self.zoom
+            sy = -sx if self.invert_y else sx
+            tx = self.offset_x + (width / 2 if self.center_origin else 0.)
+            ty = self.offset_y + (height / 2 if self.center_origin else 0.)
 
-            p /= ratio_scale_factor
+            self._transform_params = params
+            self._transform = (sx, sy, tx, ty)
         # end if
 
-        if self.invert_y:
-            p *= np.asarray([1., -1.])
+        return self._transform
+    # end def
+
+    def transform_coords(self, coords) -> list:
+        """Transforms points from world to canvas coordinates.
+
+        Parameters
+        ----------
+        coords : sequence of float
+            The points' coordinates x0, y0, x1, y1, ...
 
-        p /= self.scale_factor
+        Returns
+        -------
+        list of float
+            The transformed coordinates x0, y0, x1, y1, ...
+        """
 
-        p /= self.zoom
+        sx, sy, tx, ty = self.get_transform()
 
-        return p[0], p[1]
+        if len(coords) <= 16:  # For a few points NumPy's overhead outweighs its benefit
+            return [float(c) * sx + tx if i % 2 == 0 else float(c) * sy + ty for i, c in enumerate(coords)]
+
+        return (np.asarray(coords, dtype=float).reshape(-1, 2) * np.asarray([sx, sy]) +
+                np.asarray([tx, ty])).ravel().tolist()
     # end def
 
-    def _create(self, *args, **kwargs):
-        """Applies some transformations after using the tkinter create() function to transform the object's points.
+    def _create(self, item_type, args, kw):
+        """Transforms the object's points from world to canvas coordinates (see get_transform()) before using the
+        tkinter create() function, i.e. the item gets created in one go with its final coordinates.
+        Within a frame (see begin_frame()) the item drawn at the same position in the previous frame gets reused and
+        the drawing commands are only collected, to be evaluated by end_frame().
 
         Parameters
         ----------
-        *args : tuple, optional
-            Arguments passed to tkinter.Canvas._create().
-        **kwargs : dict, optional
-            Keyword arguments passed to tkinter.Canvas._create().
+        item_type : str
+            The item type, e.g. "line".
+        args : tuple
+            Arguments passed to tkinter.Canvas._create() - the coordinates, optionally followed by an options dict.
+        kw : dict
+            Keyword arguments passed to tkinter.Canvas._create() - the options.
 
         Returns
         -------
         int
-            The handle of the created object.
+            The handle of the created (or reused) object. None for an object created within a frame, since its handle
+            is not known before end_frame().
         """
-        x = super()._create(*args, **kwargs)
 
-        width = self.winfo_width()
-        height = self.winfo_height()
+        # Split the arguments into the coordinates and the options
+        args = tk._flatten(args)
+        options = dict()
 
-        if self.scale_ratio is not None:
-            ratio = width / height
+        if len(args) > 0 and isinstance(args[-1], dict):
+            options.update(args[-1])
+            args = args[:-1]
+        # end if
 
-            if ratio < self.scale_ratio:
-                ratio_scale_factor = (width / 2.0 * self.scale_ratio)
-            else:
-                ratio_scale_factor = (height / 2.0 * self.scale_ratio)
+        options.update(kw)
+        coords = self.transform_coords(args)
 
-            self.ratio_scale_factor = ratio_scale_factor  # XXX this needs to be implemented properly. There needs to be a function that returns the total scaling.
-            self.scale(x, 0., 0., ratio_scale_factor, ratio_scale_factor)
-        # end if
+        if self._frame_keys is None:
+            return super()._create(item_type, coords, options)
+
+        options = {k: v for k, v in options.items() if v is not None}  # tkinter ignores None-valued options
 
-        if self.invert_y:
-            self.scale(x, 0., 0., 1., -1.)
+        key = (self._layer, self._layer_ordinal)
+        self._layer_ordinal += 1
+        self._frame_keys.add(key)
 
-        self.scale(x, 0., 0., self.scale_factor, self.scale_factor)
+        entry = self._items.get(key)
 
-        self.scale(x, 0., 0., self.zoom, self.zoom)
+        # Reuse the item, if it's of the same type and no option got removed (options can't be reset to their defaults)
+        if entry is not None and entry[1] == item_type and entry[3].keys() <= options.keys():
+            x = entry[0]
+            updated = False
 
-        if self.center_origin:
-            self.move(x, width / 2, height / 2)
+            if coords != entry[2]:
+                self._batch.coords(x, coords)
+                entry[2] = coords
+                updated = True
+            # end if
+
+            changed = {k: v for k, v in options.items() if k not in entry[3] or entry[3][k] != v}
+
+            if len(changed) > 0:
+                self._batch.itemconfigure(x, changed)
+                entry[3] = options
+                updated = True
+            # end if
+
+            self.frame_stats["updated"] += int(updated)
+
+        else:
+            if entry is not None:
+                self._batch.delete(entry[0])
+
+            x = self._batch.create(item_type, coords, options)
+            entry = [x, item_type, coords, options]
+            self._items[key] = entry
+            self._pending.append(entry)
+            self.frame_stats["created"] += 1
+
+            # Keep the stacking order in line with the drawing order, since the new item is created on top
+            if self._last_item is not None:
+                self._batch.tag_raise(x, self._last_item)
+            else:
+                self._batch.tag_lower(x)
+        # end if
 
-        self.move(x, self.offset_x, self.offset_y)
+        self._last_item = x
 
-        return x
+        return x if not isinstance(x, PendingItem) else None
     # end def
 # end class
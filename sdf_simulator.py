@@ -8,8 +8,11 @@ from vehicle import Vehicle
 from sensor import *
 from sensor_group import HomogeneousTriggeredSensorGroup
 from gui import Gui
+from simulation_engine import SimulationEngine
+from monte_carlo import MonteCarloRunner
 import numpy as np
 import math
+import sys
 
 
 __author__ = "Anton Höß"
@@ -45,18 +48,33 @@ def cb_main_loop(gui: Gui):
 # end def
 
 
-def main():
-    """The main program. Defines all simulation and visualization components and runs the simulation."""
-    
-    gui = Gui(canvas_width=800, canvas_height=400, base_scale_factor=.8e-4, zoom_factor=1.1, trace_length_max=100,
-              meas_buf_max=10)
+def create_scenario(gui: Gui = None) -> SimulationEngine:
+    """Defines all simulation components (and their visualization, if a gui is given).
+
+    Parameters
+    ----------
+    gui : Gui, optional
+        The gui to add the components to. If not set, they get added to a new (headless) SimulationEngine.
+
+    Returns
+    -------
+    SimulationEngine
+        The simulation engine holding all components.
+    """
+
+    engine = gui.engine if gui is not None else SimulationEngine()
+
+    def add(kind, obj, **kwargs):
+        # Add to the gui (incl. visualization settings) or directly to the engine
+        getattr(gui if gui is not None else engine, "add_" + kind)(obj, **(kwargs if gui is not None else {}))
+    # end def
 
     # Add vehicles
     # ------------
     vehicle1 = Vehicle("Vehicle1", True, 300.0, 9.0)
-    gui.add_vehicle(vehicle1, color="black")
+    add("vehicle", vehicle1, color="black")
     vehicle2 = Vehicle("Vehicle2", False, 200.0, 20.0)
-    gui.add_vehicle(vehicle2, color="red")
+    add("vehicle", vehicle2, color="red")
 
     # Add sensors
     # -----------
@@ -64,14 +82,14 @@ def main():
     sensor = Plane("P1", False, np.asarray([3000, 8000]), 3., np.asarray([[100000, 80000],
                                                                           [80000, 100000]]))
 
-    gui.add_sensor(sensor, fill="orange", outline="white", radius=3500, n_sides=3, font_size_scale=.8)
+    add("sensor", sensor, fill="orange", outline="white", radius=3500, n_sides=3, font_size_scale=.8)
 
     # > Add sensor
     sensor = Plane("P2", False, np.asarray([-9000, -5000]), 5., np.asarray([[100000, 30000],
                                                                             [30000, 100000]]))
 
-    gui.add_sensor(sensor, fill="lightblue", outline="black", radius=2500, n_sides=4, font_size_scale=1.0)
-    # gui.add_sensor_group(HomogeneousTriggeredSensorGroup("Group 2", radar, 5., cov_mat=None), fill="pink")
+    add("sensor", sensor, fill="lightblue", outline="black", radius=2500, n_sides=4, font_size_scale=1.0)
+    # add("sensor_group", HomogeneousTriggeredSensorGroup("Group 2", radar, 5., cov_mat=None), fill="pink")
 
     # > Add sensors
     sigma_c = 5.e2  # m
@@ -86,22 +104,57 @@ def main():
 
     for i in range(len(radar_positions)):
         sensor = Plane("P3 KF #{:02d}".format(i), False, np.asarray([radar_positions[i]["r_x"], radar_positions[i]["r_y"]]), None, None)
-        gui.add_sensor(sensor, fill="violet", outline="black", radius=1000, n_sides=5, rot_offset=math.pi / 5,
-                       font_size_scale=0.5)
+        add("sensor", sensor, fill="violet", outline="black", radius=1000, n_sides=5, rot_offset=math.pi / 5,
+            font_size_scale=0.5)
         sensors.append(sensor)
     # end for
-    gui.add_sensor_group(HomogeneousTriggeredSensorGroup("Multi Group", sensors, meas_interval=5., cov_mat=np.identity(2) * sigma_c ** 2), fill="pink")
+    add("sensor_group", HomogeneousTriggeredSensorGroup("Multi Group", sensors, meas_interval=5., cov_mat=np.identity(2) * sigma_c ** 2), fill="pink")
 
     # > Add sensor
     sensor = Radar("R1", True, np.asarray([4000, 7000]), 12., np.asarray([[.001, 0],
                                                                           [0, .01]]))
 
-    gui.add_sensor(sensor, fill="green", outline="white", radius=3500, n_sides=3, rot_offset=math.pi, font_size_scale=.7)
+    add("sensor", sensor, fill="green", outline="white", radius=3500, n_sides=3, rot_offset=math.pi, font_size_scale=.7)
+
+    return engine
+# end def
+
+
+def main():
+    """The main program. Defines all simulation and visualization components and runs the simulation."""
+    
+    gui = Gui(canvas_width=800, canvas_height=400, base_scale_factor=.8e-4, zoom_factor=1.1, trace_length_max=100,
+              meas_buf_max=10)
+
+    create_scenario(gui)
 
     gui.run(cb_main_loop=cb_main_loop)
 # end def
 
 
+def main_monte_carlo(n_runs=100, t_end=3600., seed=0):
+    """Runs the scenario headless many times and prints the merged error statistics per sensor.
+
+    Parameters
+    ----------
+    n_runs : int, optional
+        The number of Monte Carlo runs.
+    t_end : float, optional
+        The simulation time to stop each run at.
+    seed : int, optional
+        The seed all runs' seeds get spawned from.
+    """
+
+    runner = MonteCarloRunner(create_scenario, n_runs, t_end, seed=seed)
+    runner.run()
+    print(runner)
+# end def
+
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "--monte-carlo":
+        main_monte_carlo(*[int(arg) for arg in sys.argv[2:3]])
+    else:
+        main()
+    # end if
 # end def
@@ -1,5 +1,8 @@
 import abc
 from vehicle import *
+from vehicle_fleet import FleetVehicle
+from small_matrix import *
+from measurement_log import MeasurementBatch, MeasurementRecord, SensorMeasurementLog
 from type_check import *
 
 
@@ -20,6 +23,8 @@ class Measurement(abc.ABC):
         The sensor's position.
     """
 
+    POLAR = False  # Indicates if the measurement is in polar coordinates (see MeasurementLog)
+
     @accepts(Vehicle, np.ndarray, np.ndarray)
     def __init__(self, vehicle: Vehicle, meas: np.ndarray, sensor_pos: np.ndarray):
         self.vehicle = vehicle
@@ -42,6 +47,10 @@ class Measurement(abc.ABC):
 # end class
 
 
+# The sensors store their measurements in SensorMeasurementLogs and return views on them, which provide the same interface
+Measurement.register(MeasurementRecord)
+
+
 class PlaneMeasurement(Measurement):
     """A measurement in a rectangular 2D plane."""
 
@@ -72,6 +81,8 @@ class PlaneMeasurement(Measurement):
 class RadarMeasurement(Measurement):
     """A measurement in polar coordinates."""
 
+    POLAR = True
+
     @accepts(Vehicle, np.ndarray, np.ndarray)
     def __init__(self, vehicle: Vehicle, meas: np.ndarray, sensor_pos: np.ndarray):
         super().__init__(vehicle, meas, sensor_pos)
@@ -93,12 +104,43 @@ class RadarMeasurement(Measurement):
     def get_abs_cartesian(self) -> np.ndarray:
         return self.rho * np.asarray([math.cos(self.phi), math.sin(self.phi)]) + self.sensor_pos
     # end def
+
+    @staticmethod
+    @accepts(np.ndarray, np.ndarray)
+    @returns(np.ndarray)
+    def polar_to_cartesian(meas: np.ndarray, sensor_pos: np.ndarray) -> np.ndarray:
+        """Converts many polar measurements at once to absolute cartesian coordinates (vectorized version of get_abs_cartesian()).
+
+        Parameters
+        ----------
+        meas : numpy.ndarray
+            The measurements (range, bearing) of shape (..., 2), e.g. (N, 2) for one radar or (S, N, 2) for S radars.
+        sensor_pos : numpy.ndarray
+            The sensor position(s) of shape (2,) for one radar or (S, 2) for S radars.
+
+        Returns
+        -------
+        numpy.ndarray
+            The cartesian coordinates of the same shape as meas.
+        """
+
+        rho = meas[..., 0]
+        phi = meas[..., 1]
+
+        res = np.stack((rho * np.cos(phi), rho * np.sin(phi)), axis=-1)
+        res += sensor_pos[..., np.newaxis, :] if sensor_pos.ndim > 1 else sensor_pos
+
+        return res
+    # end def
 # end class
 
 
 class ISensorMeasure(abc.ABC):
     """A sensor measurement interface."""
 
+    NOISE_POOL_SIZE = 4096  # Number of standard normal samples drawn at once when refilling the noise pool
+    MEAS_BUF_CAPACITY = 1000  # The default number of measurements kept per vehicle
+
     @accepts(float, np.ndarray)
     def __init__(self, meas_interval: float, cov_mat: np.ndarray):
         """Initializes the ISensorMeasure interface.
@@ -115,10 +157,20 @@ class ISensorMeasure(abc.ABC):
         self.cov_mat = cov_mat
 
         self.cov_mat_draw = True
-        self.measurements = {}
+        self.meas_buf_capacity = self.MEAS_BUF_CAPACITY
+        self.measurements = SensorMeasurementLog(self.meas_buf_capacity, self)  # Maps the vehicles to their measurements
         self.last_meas_time = 0.
+        self.scheduler = None  # The SensorScheduler this sensor is scheduled by (if any)
+
+        self._batch_meas_buf = np.zeros((0, 2))  # Reused by measure_batch()
+
+        self._cov_mat_chol = None  # Cached Cholesky factor of cov_mat - invalidated by set_cov_mat()
+        self.rng = np.random.default_rng()  # The sensor's own random number generator - see set_rng()
+        self._noise_pool = np.zeros((0, 2))  # Pre-drawn standard normal samples
+        self._noise_pool_pos = 0
 
         self.listeners = list()
+        self.batch_listeners = list()
     # end def
 
     @accepts(float)
@@ -132,6 +184,26 @@ class ISensorMeasure(abc.ABC):
         """
 
         self.meas_interval = meas_interval
+
+        if self.scheduler is not None:
+            self.scheduler.reschedule(self)
+    # end def
+
+    @property
+    def next_trigger_time(self):
+        """The time the sensor triggers next.
+
+        Returns
+        -------
+        float
+            The next trigger time or None if no measurement interval is set.
+        """
+
+        if self.meas_interval is None:
+            return None
+        else:
+            return self.last_meas_time + self.meas_interval
+        # end if
     # end def
 
     @accepts(np.ndarray)
@@ -146,6 +218,113 @@ class ISensorMeasure(abc.ABC):
 
         self.cov_mat_draw = False
         self.cov_mat = cov_mat
+        self._cov_mat_chol = None
+    # end def
+
+    @returns(np.ndarray)
+    def get_cov_mat_chol(self) -> np.ndarray:
+        """Returns the (cached) lower triangular factor L of the covariance matrix with L * L.T = cov_mat.
+
+        Returns
+        -------
+        numpy.ndarray
+            The factor L.
+        """
+
+        if self._cov_mat_chol is None:
+            cov_mat = np.asarray(self.cov_mat, dtype=float)
+
+            try:
+                if cov_mat.shape == (2, 2):
+                    self._cov_mat_chol = chol_2x2(cov_mat)
+                else:
+                    self._cov_mat_chol = np.linalg.cholesky(cov_mat)
+                # end if
+
+            except np.linalg.LinAlgError:
+                # The covariance matrix is only positive semi-definite - use the eigen decomposition instead
+                eVa, eVe = np.linalg.eigh(cov_mat)
+                self._cov_mat_chol = eVe * np.sqrt(np.clip(eVa, 0., None))
+            # end try
+        # end if
+
+        return self._cov_mat_chol
+    # end def
+
+    @accepts(np.random.Generator)
+    def set_rng(self, rng: np.random.Generator):
+        """Sets the sensor's random number generator all its measurement noise gets drawn from.
+        Since each sensor owns its generator, the sensors' noise doesn't depend on each other (e.g. on their order).
+        Already pooled samples get discarded.
+
+        Parameters
+        ----------
+        rng : numpy.random.Generator
+            The random number generator, e.g. created by numpy.random.default_rng() from a spawned SeedSequence.
+        """
+
+        self.rng = rng
+        self._noise_pool = np.zeros((0, 2))
+        self._noise_pool_pos = 0
+    # end def
+
+    @accepts(int)
+    @returns(np.ndarray)
+    def draw_standard_normal(self, n: int) -> np.ndarray:
+        """Draws n two-dimensional standard normal samples from the sensor's random number generator.
+        The samples are taken from a pool that gets refilled in large blocks. The pool gets used up before refilling,
+        so drawing n samples at once yields the same samples as drawing them one by one.
+
+        Parameters
+        ----------
+        n : int
+            The number of samples.
+
+        Returns
+        -------
+        numpy.ndarray
+            The samples of shape (n, 2).
+        """
+
+        if self._noise_pool_pos + n > len(self._noise_pool):
+            rest = self._noise_pool[self._noise_pool_pos:]
+
+            self._noise_pool = self.rng.standard_normal((max(n - len(rest), self.NOISE_POOL_SIZE), 2))
+            self._noise_pool_pos = n - len(rest)
+
+            if len(rest) > 0:
+                return np.concatenate((rest, self._noise_pool[:self._noise_pool_pos]))
+            # end if
+        else:
+            self._noise_pool_pos += n
+        # end if
+
+        return self._noise_pool[self._noise_pool_pos - n:self._noise_pool_pos]
+    # end def
+
+    @accepts(int)
+    @returns(np.ndarray)
+    def draw_noise(self, n: int) -> np.ndarray:
+        """Draws n samples of the zero-mean measurement noise with the sensor's covariance matrix.
+        The samples are calculated as L * z with z taken from draw_standard_normal().
+
+        Parameters
+        ----------
+        n : int
+            The number of samples.
+
+        Returns
+        -------
+        numpy.ndarray
+            The noise samples of shape (n, 2).
+        """
+
+        z = self.draw_standard_normal(n)
+        L = self.get_cov_mat_chol()
+
+        # Elementwise instead of z * L.T, since the matrix product may round differently depending on n - this way a
+        # batch measurement yields exactly the same noise as measuring the vehicles one by one
+        return z[:, :1] * L[:, 0] + z[:, 1:] * L[:, 1]
     # end def
 
     @accepts(float)
@@ -198,6 +377,33 @@ class ISensorMeasure(abc.ABC):
         self.listeners.remove(l)
     # end def
 
+    @accepts(callable)
+    def add_measure_batch_listener(self, l: callable):
+        """Adds a batch measurement listener to the list of batch listeners. It gets called once per measure_all()
+        (and measure()) with the MeasurementBatch, i.e. without creating an object per measurement.
+
+        Parameters
+        ----------
+        l : callable
+            The listener callback to add.
+        """
+
+        self.batch_listeners.append(l)
+    # end def
+
+    @accepts(callable)
+    def remove_measure_batch_listener(self, l: callable):
+        """Removes a batch measurement listener from the list of batch listeners.
+
+        Parameters
+        ----------
+        l : callable
+            The listener callback to remove.
+        """
+
+        self.batch_listeners.remove(l)
+    # end def
+
     @abc.abstractmethod
     @accepts(Vehicle)
     @returns(Measurement)
@@ -243,25 +449,159 @@ class ISensorMeasure(abc.ABC):
         for l in self.listeners:
             l(vehicle, res)  # Callback
 
+        if len(self.batch_listeners) > 0:
+            batch = self.measurements.get_batch(vehicle)
+
+            for l in self.batch_listeners:
+                l(batch)  # Callback
+        # end if
+
         return res
     # end def
 
-    @accepts(Vehicle, Measurement)
-    def append_measurement(self, vehicle: Vehicle, meas: Measurement):
-        """Adds a position measurement to the measurement list.
+    @accepts(int)
+    @returns(np.ndarray)
+    def _get_batch_meas_buf(self, n: int) -> np.ndarray:
+        """Returns the (reused) buffer for a batch measurement of n vehicles. The buffer only gets reallocated if it's too small.
+
+        Parameters
+        ----------
+        n : int
+            The number of measurements.
+
+        Returns
+        -------
+        numpy.ndarray
+            The buffer of shape (n, 2).
+        """
+
+        if len(self._batch_meas_buf) < n:
+            self._batch_meas_buf = np.zeros((max(n, 2 * len(self._batch_meas_buf)), 2))
+
+        return self._batch_meas_buf[:n]
+    # end def
+
+    @abc.abstractmethod
+    @accepts(list)
+    @returns(MeasurementBatch)
+    def measure_all(self, vehicles: list) -> MeasurementBatch:
+        """Creates a measurement of each of the given vehicles at once and informs all listeners.
+
+        Parameters
+        ----------
+        vehicles : list of Vehicle
+            The vehicles to measure.
+
+        Returns
+        -------
+        MeasurementBatch
+            The created measurements (in the order of the vehicles).
+        """
+
+        pass
+    # end def
+
+    @staticmethod
+    @accepts(list)
+    @returns(np.ndarray)
+    def get_positions(vehicles: list) -> np.ndarray:
+        """Returns the positions of the given vehicles as one array. If the list is the vehicle list of a VehicleFleet,
+        the fleet's position array is returned directly (without copying).
+
+        Parameters
+        ----------
+        vehicles : list of Vehicle
+            The vehicles.
+
+        Returns
+        -------
+        numpy.ndarray
+            The positions of shape (N, 2).
+        """
+
+        if len(vehicles) > 0 and isinstance(vehicles[0], FleetVehicle) and vehicles is vehicles[0].fleet.vehicles:
+            return vehicles[0].fleet.r
+
+        return np.asarray([vehicle.r for vehicle in vehicles], dtype=float).reshape(-1, 2)
+    # end def
+
+    @accepts(list, np.ndarray, np.ndarray, bool)
+    @returns(MeasurementBatch)
+    def _append_batch(self, vehicles: list, meas: np.ndarray, sensor_pos: np.ndarray, polar: bool) -> MeasurementBatch:
+        """Adds the measurements of a batch measurement (see measure_all()) to the measurement log at once and informs
+        all listeners. Objects for the single measurements are only created if there are (per-vehicle) listeners.
+
+        Parameters
+        ----------
+        vehicles : list of Vehicle
+            The measured vehicles.
+        meas : numpy.ndarray
+            The measurements of shape (N, 2) (in the order of the vehicles).
+        sensor_pos : numpy.ndarray
+            The sensor's position.
+        polar : bool
+            Indicates if the measurements are in polar coordinates.
+
+        Returns
+        -------
+        MeasurementBatch
+            The added measurements (in the order of the vehicles).
+        """
+
+        batch = self.measurements.append_batch(self.last_meas_time, vehicles, meas, sensor_pos, polar)
+
+        for l in self.batch_listeners:
+            l(batch)  # Callback
+
+        if len(self.listeners) > 0:
+            for vehicle, measurement in zip(vehicles, batch):
+                for l in self.listeners:
+                    l(vehicle, measurement)  # Callback
+            # end for
+        # end if
+
+        return batch
+    # end def
+
+    @accepts(int)
+    def set_meas_buf_capacity(self, capacity: int):
+        """Sets the number of measurements kept per vehicle. Already stored measurements get dropped.
+
+        Parameters
+        ----------
+        capacity : int
+            The max. number of measurements per vehicle.
+        """
+
+        self.meas_buf_capacity = capacity
+        self.measurements = SensorMeasurementLog(capacity, self)
+    # end def
+
+    @accepts(Vehicle, np.ndarray, np.ndarray, bool)
+    @returns(Measurement)
+    def append_measurement(self, vehicle: Vehicle, val: np.ndarray, sensor_pos: np.ndarray, polar: bool) -> Measurement:
+        """Adds a measurement to the measurement log (timestamped with the latest trigger time).
+        The values are written to the log directly, i.e. no Measurement object is needed.
+        Once the log is full, the oldest measurement gets overwritten.
 
         Parameters
         ----------
         vehicle : Vehicle
             The vehicle to add the measurement to.
-        meas : Measurement
-            The measurement to add.
-        """
+        val : numpy.ndarray
+            The measurement vector relative to the sensor's position.
+        sensor_pos : numpy.ndarray
+            The sensor's position.
+        polar : bool
+            Indicates if the measurement is in polar coordinates.
 
-        if vehicle not in self.measurements:
-            self.measurements[vehicle] = []
+        Returns
+        -------
+        Measurement
+            The view on the added measurement.
+        """
 
-        self.measurements[vehicle].append(meas)
+        return self.measurements.append(self.last_meas_time, vehicle, val, sensor_pos, polar)
     # end def
 # end class
 
@@ -333,7 +673,13 @@ class ISensor:
         """
 
         # Calculate eigenvalues
-        eVa, eVe = np.linalg.eig(np.asarray(cov))
+        cov = np.asarray(cov)
+
+        if cov.shape == (2, 2):
+            eVa, eVe = eig_sym_2x2(cov)
+        else:
+            eVa, eVe = np.linalg.eig(cov)
+        # end if
 
         # Calculate transformation matrix from eigen decomposition
         R, S = eVe, np.diag(np.sqrt(eVa))
@@ -397,8 +743,8 @@ class Plane(ISensor, ISensorMeasure):
     # end def
 
     @accepts(Vehicle)
-    @returns(PlaneMeasurement)
-    def _measure(self, vehicle: Vehicle, **kwargs) -> PlaneMeasurement:
+    @returns(Measurement)
+    def _measure(self, vehicle: Vehicle, **kwargs) -> Measurement:
         """Creates a measurement of the given vehicle.
 
         Parameters
@@ -410,18 +756,64 @@ class Plane(ISensor, ISensorMeasure):
 
         Returns
         -------
-        PlaneMeasurement
-            The created plane measurement.
+        Measurement
+            The created plane measurement (a view on the measurement log).
         """
 
         # Measure position
-        meas = np.random.multivariate_normal(np.asarray([0, 0]), self.cov_mat, 1)[0]
+        meas = self.draw_noise(1)[0]
         meas += vehicle.r - self.pos
 
-        measurement = PlaneMeasurement(vehicle, meas, self.pos)
-        self.append_measurement(vehicle, measurement)
+        return self.append_measurement(vehicle, meas, self.pos, False)
+    # end def
 
-        return measurement
+    @accepts(np.ndarray)
+    @returns(np.ndarray)
+    def measure_batch(self, positions: np.ndarray) -> np.ndarray:
+        """Creates the measurements of all given vehicle positions at once using one noise draw.
+        In contrast to measure(), the listeners are not informed and the measurement logs are not updated.
+
+        Parameters
+        ----------
+        positions : numpy.ndarray
+            The vehicles' positions of shape (N, 2), e.g. VehicleFleet.r.
+
+        Returns
+        -------
+        numpy.ndarray
+            The measurements relative to the sensor's position of shape (N, 2). The array gets reused (i.e.
+            overwritten) by the next batch measurement.
+        """
+
+        n = len(positions)
+
+        meas = self._get_batch_meas_buf(n)
+        np.subtract(positions, self.pos, out=meas)
+        meas += self.draw_noise(n)
+
+        return meas
+    # end def
+
+    @accepts(list)
+    @returns(MeasurementBatch)
+    def measure_all(self, vehicles: list) -> MeasurementBatch:
+        """Creates a measurement of each of the given vehicles and informs all listeners.
+        All vehicles get measured at once (see measure_batch()).
+
+        Parameters
+        ----------
+        vehicles : list of Vehicle
+            The vehicles to measure.
+
+        Returns
+        -------
+        MeasurementBatch
+            The created measurements (in the order of the vehicles).
+        """
+
+        meas = self.measure_batch(self.get_positions(vehicles))
+
+        return self._append_batch(vehicles, meas, self.pos, False)
     # end def
 # end class
 
@@ -450,8 +842,8 @@ class Radar(ISensor, ISensorMeasure):
     # end def
 
     @accepts(Vehicle)
-    @returns(RadarMeasurement)
-    def _measure(self, vehicle: Vehicle, **kwargs) -> RadarMeasurement:
+    @returns(Measurement)
+    def _measure(self, vehicle: Vehicle, **kwargs) -> Measurement:
         """Creates a measurement of the given vehicle.
 
         Parameters
@@ -463,16 +855,86 @@ class Radar(ISensor, ISensorMeasure):
 
         Returns
         -------
-        RadarMeasurement
-            The created radar measurement.
+        Measurement
+            The created radar measurement (a view on the measurement log).
         """
 
-        meas = np.random.multivariate_normal(np.asarray([0, 0]), self.cov_mat, 1)[0]
-        meas += np.asarray([np.linalg.norm(vehicle.r - self.pos), self.calc_rotation_angle(vehicle)])
+        meas = self.draw_noise(1)[0]
+        meas += self.calc_range_bearing(self.pos, vehicle.r[np.newaxis])[0]  # Same as measure_batch() for one vehicle
+
+        return self.append_measurement(vehicle, meas, self.pos, True)
+    # end def
+
+    @staticmethod
+    @accepts(np.ndarray, np.ndarray)
+    @returns(np.ndarray)
+    def calc_range_bearing(sensor_pos: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """Calculates the (noise free) range and bearing of all given positions relative to one or many radars at once.
+
+        Parameters
+        ----------
+        sensor_pos : numpy.ndarray
+            The sensor position(s) of shape (2,) for one radar or (S, 2) for S radars.
+        positions : numpy.ndarray
+            The vehicles' positions of shape (N, 2), e.g. VehicleFleet.r.
+
+        Returns
+        -------
+        numpy.ndarray
+            The range and bearing of shape (N, 2) for one radar or (S, N, 2) for S radars.
+        """
+
+        d = positions - (sensor_pos[..., np.newaxis, :] if sensor_pos.ndim > 1 else sensor_pos)
+
+        return np.stack((np.hypot(d[..., 0], d[..., 1]), np.arctan2(d[..., 1], d[..., 0])), axis=-1)
+    # end def
+
+    @accepts(np.ndarray)
+    @returns(np.ndarray)
+    def measure_batch(self, positions: np.ndarray) -> np.ndarray:
+        """Creates the measurements of all given vehicle positions at once using one noise draw.
+        In contrast to measure(), the listeners are not informed and the measurement logs are not updated.
+
+        Parameters
+        ----------
+        positions : numpy.ndarray
+            The vehicles' positions of shape (N, 2), e.g. VehicleFleet.r.
+
+        Returns
+        -------
+        numpy.ndarray
+            The measurements (range, bearing) of shape (N, 2). The array gets reused (i.e. overwritten) by the next
+            batch measurement.
+        """
+
+        n = len(positions)
+
+        meas = self._get_batch_meas_buf(n)
+        meas[:] = self.draw_noise(n)
+        meas += self.calc_range_bearing(self.pos, positions)
+
+        return meas
+    # end def
+
+    @accepts(list)
+    @returns(MeasurementBatch)
+    def measure_all(self, vehicles: list) -> MeasurementBatch:
+        """Creates a measurement of each of the given vehicles and informs all listeners.
+        All vehicles get measured at once (see measure_batch()).
+
+        Parameters
+        ----------
+        vehicles : list of Vehicle
+            The vehicles to measure.
+
+        Returns
+        -------
+        MeasurementBatch
+            The created measurements (in the order of the vehicles).
+        """
 
-        measurement = RadarMeasurement(vehicle, meas, self.pos)
-        self.append_measurement(vehicle, measurement)
+        meas = self.measure_batch(self.get_positions(vehicles))
 
-        return measurement
+        return self._append_batch(vehicles, meas, self.pos, True)
     # end def
 # end class
@@ -1,5 +1,6 @@
 from kalman_filter_factory import *
 from sensor import *
+from step_metrics import StepMetrics
 import numpy as np
 
 
@@ -46,7 +47,7 @@ class _SensorGroup:
     # end def
 
     @abc.abstractmethod
-    def _cb_meas(self, vehicle, measurement):
+    def _cb_meas_batch(self, batch):
         pass
     # end def
 
@@ -60,7 +61,7 @@ class _SensorGroup:
         """
 
         self.sensors.append(sensor)
-        self.sensors.add_measure_listener(self._cb_meas)
+        sensor.add_measure_batch_listener(self._cb_meas_batch)
     # end def
 
     def remove_sensor(self, sensor):
@@ -73,7 +74,7 @@ class _SensorGroup:
         """
 
         self.sensors.remove(sensor)
-        self.sensors.remove_measure_listener(self._cb_meas)
+        sensor.remove_measure_batch_listener(self._cb_meas_batch)
     # end def
 
 
@@ -90,38 +91,135 @@ class HomogeneousTriggeredSensorGroup(ISensorMeasure, _SensorGroup):
         The measurement interval in [s] (since the last measurement).
     cov_mat : numpy.ndarray, optional
         The measurements covariance matrix.
+    steady_state : bool, optional
+        Indicates if the Kalman filters shall use the steady-state Kalman gain instead of propagating the covariance
+        matrices (see KalmanFilterBank).
     """
 
-    def __init__(self, name, sensors, meas_interval=None, cov_mat=None):
+    def __init__(self, name, sensors, meas_interval=None, cov_mat=None, steady_state=False):
         ISensorMeasure.__init__(self, meas_interval, cov_mat)
         _SensorGroup.__init__(self, name, sensors)
 
-        self.kalman_filter = dict()
+        self.steady_state = steady_state
+        self.kalman_filter = None  # The Kalman filter bank holding the tracks of all vehicles
+        self.metrics = StepMetrics(enabled=False)  # Set by the SimulationEngine for timing the Kalman filter
         self.temp_measurements = dict()
+        self._pending_batches = list()  # The sensors' batch measurements since the last measurement of the group
+        self._cov_mat_stacked = None
+        self._cov_mat_stacked_src = None
 
         for sensor in sensors:
             sensor.set_meas_interval(self.meas_interval)
             sensor.set_cov_mat(self.cov_mat)
-            sensor.add_measure_listener(self._cb_meas)
+            sensor.add_measure_batch_listener(self._cb_meas_batch)
     # end def
 
     def __str__(self):
         return "{}: ∆T={:f}".format(self.name, self.meas_interval)
     # end def
 
-    def _cb_meas(self, vehicle, measurement):
-        """The measurement callback for a certain vehicle.
+    def _cb_meas_batch(self, batch):
+        """The batch measurement callback of the individual sensors.
 
         Parameters
         ----------
-        vehicle
-            The vehicle the measuremet is assigned to.
+        batch : MeasurementBatch
+            The measurements of a sensor.
         """
 
-        if vehicle not in self.temp_measurements:
-            self.temp_measurements[vehicle] = list()
+        self._pending_batches.append(batch)
+    # end def
+
+    def _split_pending_batches(self):
+        """Assigns the measurements of the pending batches to their vehicles (see temp_measurements)."""
+
+        for batch in self._pending_batches:
+            for vehicle, measurement in zip(batch.vehicles, batch):
+                if vehicle not in self.temp_measurements:
+                    self.temp_measurements[vehicle] = list()
+
+                self.temp_measurements[vehicle].append(measurement)
+            # end for
+        # end for
+
+        self._pending_batches.clear()
+    # end def
+
+    def _join_measurements(self, vehicle):
+        """Joins the measurements (of all individual sensors of the sensor group) of the given vehicle made since the last call.
+
+        Parameters
+        ----------
+        vehicle : Vehicle
+            The vehicle to join the measurements for.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+            The joined measurement covariance matrix R and the joined measurement z.
+        """
+
+        measurements = self.temp_measurements[vehicle]
+
+        z = np.asarray([meas.val + meas.sensor_pos for meas in measurements])  # Is it correct to add sensor_pos at this point at this point?
+        R = self._get_stacked_cov_mat(len(measurements))
+
+        measurements.clear()
+
+        return KF.join_measurements_stacked(R, z)
+    # end def
+
+    def _get_stacked_cov_mat(self, n):
+        """Returns the group's covariance matrix stacked n times (reused as long as n and the covariance matrix don't change).
+
+        Parameters
+        ----------
+        n : int
+            The number of measurements.
+
+        Returns
+        -------
+        numpy.ndarray
+            The stacked covariance matrices of shape (n, 2, 2).
+        """
+
+        if self._cov_mat_stacked is None or len(self._cov_mat_stacked) != n or self._cov_mat_stacked_src is not self.cov_mat:
+            self._cov_mat_stacked = np.asarray([self.cov_mat] * n, dtype=float)
+            self._cov_mat_stacked_src = self.cov_mat
+        # end if
+
+        return self._cov_mat_stacked
+    # end def
+
+    def _get_track_index(self, vehicle):
+        """Returns the index of the vehicle's track within the Kalman filter bank. Creates the track if necessary.
+
+        Parameters
+        ----------
+        vehicle : Vehicle
+            The vehicle to get the track for.
+
+        Returns
+        -------
+        int
+            The track's index.
+        """
+
+        if self.kalman_filter is None or vehicle not in self.kalman_filter:
+            # Use the factory to get the filter matrices and the track's initial values
+            kf = KalmanFilterFactory.get_kalman_filter(KalmanFilterType.PLANE_2D,
+                                                       self.meas_interval, self.cov_mat,
+                                                       vehicle.v_max / vehicle.q_max * 0.75,
+                                                       x_init=np.asarray([10000, 10000, 150, 300, 0, 0]),
+                                                       steady_state=self.steady_state)
+
+            if self.kalman_filter is None:
+                self.kalman_filter = KalmanFilterBank(kf.F, kf.B, kf.H, steady_state=kf.steady_state)
+
+            return self.kalman_filter.add_track(vehicle, kf.x, kf.P, kf.Q)
+        # end if
 
-        self.temp_measurements[vehicle].append(measurement)
+        return self.kalman_filter.get_index(vehicle)
     # end def
 
     def _measure(self, vehicle, **kwargs):
@@ -140,34 +238,86 @@ class HomogeneousTriggeredSensorGroup(ISensorMeasure, _SensorGroup):
             The joined measurement.
         """
 
-        meas_res = list()
+        self._split_pending_batches()
 
-        for meas in self.temp_measurements[vehicle]:
-            meas_res.append((self.cov_mat, meas.val + meas.sensor_pos))  # Is it correct to add sensor_pos at this point at this point?
-        # end for
+        R, z = self._join_measurements(vehicle)
+        index = self._get_track_index(vehicle)
+
+        # Add filtered position measurement to the measurement list
+        self.kalman_filter.predict(indices=[index])
+        self.kalman_filter.filter(z=z[np.newaxis], R=R, indices=[index])
 
-        self.temp_measurements[vehicle].clear()
+        x = self.kalman_filter.x[index]
 
-        if vehicle not in self.kalman_filter:
-            self.kalman_filter[vehicle] \
-                = KalmanFilterFactory.get_kalman_filter(KalmanFilterType.PLANE_2D,
-                                                        self.meas_interval, self.cov_mat,
-                                                        vehicle.v_max / vehicle.q_max * 0.75,
-                                                        x_init=np.asarray([10000, 10000, 150, 300, 0, 0]))
+        return self.append_measurement(vehicle, x, np.zeros_like(x), False)
+    # end def
+
+    def measure_all(self, vehicles):
+        """Creates a joined measurement of each of the given vehicles and informs all listeners.
+        The Kalman filters of all vehicles are predicted and updated at once.
+
+        Parameters
+        ----------
+        vehicles : list of Vehicle
+            The vehicles to measure.
+
+        Returns
+        -------
+        MeasurementBatch
+            The joined measurements (in the order of the vehicles).
+        """
+
+        if len(vehicles) == 0:
+            return self._append_batch(vehicles, np.zeros((0, 6)), np.zeros(6), False)  # The tracks' states are 6D
+
+        batches = self._pending_batches
+
+        if len(batches) > 0 and all(batch.vehicles is vehicles for batch in batches) and \
+                not any(self.temp_measurements.values()):
+            # All sensors measured exactly these vehicles: fill the stacked measurements from the sensors' batch arrays
+            z = np.empty((len(vehicles), len(batches), 2))
+
+            for m, batch in enumerate(batches):
+                np.add(batch.val, batch.sensor_pos, out=z[:, m])  # Is it correct to add sensor_pos at this point?
+
+            R, z = KF.join_measurements_stacked(self._get_stacked_cov_mat(len(batches)), z)
+            batches.clear()
+        else:
+            self._split_pending_batches()
+            n_meas = len(self.temp_measurements[vehicles[0]])
+
+            if all(len(self.temp_measurements[vehicle]) == n_meas for vehicle in vehicles):
+                # Join the measurements of all vehicles at once (all share the same stacked covariance matrices)
+                z = np.asarray([[meas.val + meas.sensor_pos for meas in self.temp_measurements[vehicle]]
+                                for vehicle in vehicles])
+                R, z = KF.join_measurements_stacked(self._get_stacked_cov_mat(n_meas), z)
+
+                for vehicle in vehicles:
+                    self.temp_measurements[vehicle].clear()
+            else:
+                R = list()
+                z = list()
+
+                for vehicle in vehicles:
+                    R_vehicle, z_vehicle = self._join_measurements(vehicle)
+                    R.append(R_vehicle)
+                    z.append(z_vehicle)
+                # end for
+            # end if
         # end if
 
-        # Add filtered position measurement to the measurement list
-        self.kalman_filter[vehicle].predict(u=np.zeros(6))
+        indices = np.asarray([self._get_track_index(vehicle) for vehicle in vehicles])
 
-        R, z = KF.join_measurements(meas_res)
+        with self.metrics.timer("kf_predict"):
+            self.kalman_filter.predict(indices=indices)
 
-        self.kalman_filter[vehicle].filter(z=z, R=R)
+        with self.metrics.timer("kf_filter"):
+            self.kalman_filter.filter(z=np.asarray(z), R=np.asarray(R), indices=indices)
 
-        measurement = PlaneMeasurement(vehicle, self.kalman_filter[vehicle].get_current_state_estimate(), np.zeros(6))
-        self.append_measurement(vehicle, measurement)
-        # self.measurements[vehicle].append(self.kalman_filter[vehicle].get_current_state_estimate())
+        x = self.kalman_filter.x[indices]
 
-        return measurement
+        # The filtered measurements are absolute
+        return self._append_batch(vehicles, x, np.zeros(x.shape[1]), False)
     # end def
 
     def add_sensor(self, sensor):
@@ -179,7 +329,7 @@ class HomogeneousTriggeredSensorGroup(ISensorMeasure, _SensorGroup):
             The sensor to be added.
         """
 
-        _SensorGroup.add_sensor(sensor)
+        _SensorGroup.add_sensor(self, sensor)
         sensor.set_meas_interval(self.meas_interval)
         sensor.set_cov_mat(self.cov_mat)
     # end def
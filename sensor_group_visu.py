@@ -1,4 +1,5 @@
 from base_visu import *
+from trace_decimator import TraceDecimator
 
 
 __author__ = "Anton Höß"
@@ -30,6 +31,7 @@ class SensorGroupVisu(BaseVisu, TraceVisu):
         self.cov_ell_cnt = 0
 
         self._trace_pos_filtered = dict()
+        self._lod_pos_filtered = dict()
     # end def
 
     def add_cur_vals_to_traces(self, vehicle):
@@ -54,12 +56,14 @@ class SensorGroupVisu(BaseVisu, TraceVisu):
             The vehicle who's trace to add the position to.
         """
         if vehicle not in self._trace_pos_filtered:
-            self._trace_pos_filtered[vehicle] = list()
+            self._trace_pos_filtered[vehicle] = self.create_trace()
+            self._lod_pos_filtered[vehicle] = TraceDecimator(self._trace_pos_filtered[vehicle])
+        # end if
 
-        self.add_cur_val_to_trace(self._trace_pos_filtered[vehicle], self.sensor_group.measurements[vehicle][-1].get_abs_cartesian())
+        self.add_cur_val_to_trace(self._trace_pos_filtered[vehicle], self.sensor_group.measurements[vehicle][-1].get_abs_cartesian()[:2])
     # end def
 
-    def _draw_trace(self, trace, draw_arrow=True, fill_format="#000000", **kwargs):
+    def _draw_trace(self, trace, draw_arrow=True, fill_format="#000000", steps=None, **kwargs):
         """Draws a trace onto the SensorVisu's canvas.
 
         Parameters
@@ -70,11 +74,13 @@ class SensorGroupVisu(BaseVisu, TraceVisu):
             Indicates if the trace's arrow shall be drawn.
         fill_format : str, optional
             Defines the format string for creating the color gradient depending on the relative trace position.
+        steps : numpy.ndarray, optional
+            The positions of the trace's points within the original trace, if the trace got decimated.
         **kwargs : dict, optional
             Keyword arguments passed to tkinter.Canvas.create_line().
         """
 
-        BaseVisu.draw_trace(self.canvas, trace=trace, draw_arrow=draw_arrow, fill_format=fill_format, color=self.fill, trace_length_max=self.trace_length_max, **kwargs)
+        BaseVisu.draw_trace(self.canvas, trace=trace, draw_arrow=draw_arrow, fill_format=fill_format, color=self.fill, trace_length_max=self.trace_length_max, n_color_bands=self.n_color_bands, steps=steps, **kwargs)
     # end def
 
     def draw(self, draw_meas_filtered=True, vehicles=None):
@@ -93,6 +99,8 @@ class SensorGroupVisu(BaseVisu, TraceVisu):
         if not isinstance(vehicles, list):
             vehicles = [vehicles]
 
+        self.canvas.begin_layer(self)
+
         # For each vehicle draw the measurement information
         for vehicle in vehicles:
             # The covariance ellipses
@@ -102,10 +110,12 @@ class SensorGroupVisu(BaseVisu, TraceVisu):
 
         # For each vehicle draw the Kalman filtered measurement information
         if draw_meas_filtered:
+            scale = abs(self.canvas.get_transform()[0])
+
             for vehicle in self._trace_pos_filtered:
                 if vehicle in vehicles and vehicle.active:
-                    self._draw_trace(self._trace_pos_filtered[vehicle], draw_arrow=True, fill_format="#000000",
-                                     width=1.0)
+                    pos, steps = self._lod_pos_filtered[vehicle].decimate(scale)
+                    self._draw_trace(pos, draw_arrow=True, fill_format="#000000", steps=steps, width=1.0)
                 # end if
             # end for
         # end if
@@ -0,0 +1,135 @@
+from sensor import ISensorMeasure
+import heapq
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+class SensorScheduler:
+    """An event-driven scheduler that keeps the sensors (and sensor groups) in a priority queue keyed by their next
+    trigger time. Instead of polling every sensor on every tick, only the sensors that are due get triggered.
+    Sensors reschedule themselves when their measurement interval gets changed, so each sensor can only be handled
+    by one scheduler at a time.
+    """
+
+    def __init__(self):
+        self._queue = list()  # Heap of (next trigger time, priority, order, sensor)
+        self._scheduled = dict()  # The currently valid next trigger time by sensor (older queue entries are stale)
+        self._order = dict()  # The order of the sensors (for a deterministic processing order)
+        self._priority = dict()
+    # end def
+
+    def __len__(self):
+        return len(self._order)
+    # end def
+
+    def add_sensor(self, sensor: ISensorMeasure, priority=0):
+        """Adds a sensor to the scheduler.
+
+        Parameters
+        ----------
+        sensor : ISensorMeasure
+            The sensor (or sensor group) to add.
+        priority : int, optional
+            Sensors with a lower priority value are processed first if they are due at the same time.
+            Sensors with the same priority are processed in the order they were added.
+        """
+
+        self._order[sensor] = len(self._order)
+        self._priority[sensor] = priority
+        sensor.scheduler = self
+        self.reschedule(sensor)
+    # end def
+
+    def reschedule(self, sensor: ISensorMeasure):
+        """Updates the sensor's position in the queue, e.g. after changing its measurement interval or its last
+        measurement time.
+
+        Parameters
+        ----------
+        sensor : ISensorMeasure
+            The sensor (or sensor group) to reschedule.
+        """
+
+        t_next = sensor.next_trigger_time
+
+        self._scheduled[sensor] = t_next
+
+        if t_next is not None:
+            heapq.heappush(self._queue, (t_next, self._priority[sensor], self._order[sensor], sensor))
+    # end def
+
+    def _drop_stale(self):
+        """Removes stale entries (from rescheduled sensors) from the top of the queue."""
+
+        while len(self._queue) > 0:
+            t_next, _priority, _order, sensor = self._queue[0]
+
+            # Sensors being triggered are not scheduled at all, but may still have stale entries
+            if self._scheduled.get(sensor) == t_next:
+                break
+
+            heapq.heappop(self._queue)
+        # end while
+    # end def
+
+    @property
+    def next_trigger_time(self):
+        """The time of the next sensor event.
+
+        Returns
+        -------
+        float
+            The next trigger time or None if no sensor is scheduled.
+        """
+
+        self._drop_stale()
+
+        if len(self._queue) > 0:
+            return self._queue[0][0]
+        else:
+            return None
+        # end if
+    # end def
+
+    def trigger_due(self, t):
+        """Triggers all sensors that are due at the given time. Each sensor gets triggered at most once per call.
+
+        Parameters
+        ----------
+        t : float
+            The trigger timestamp.
+
+        Returns
+        -------
+        list of ISensorMeasure
+            The sensors that have triggered, ordered by priority and the order they were added.
+        """
+
+        due = list()
+
+        while True:
+            self._drop_stale()
+
+            if len(self._queue) == 0 or self._queue[0][0] > t:
+                break
+
+            _t_next, priority, order, sensor = heapq.heappop(self._queue)
+            del self._scheduled[sensor]
+            due.append((priority, order, sensor))
+        # end while
+
+        due.sort(key=lambda entry: entry[:2])
+        triggered = list()
+
+        for _priority, _order, sensor in due:
+            if sensor.trigger(t):
+                triggered.append(sensor)
+
+            self.reschedule(sensor)
+        # end for
+
+        return triggered
+    # end def
+# end class
@@ -60,6 +60,8 @@ class SensorVisu(BaseVisu, TraceVisu):
         self.cov_ell_cnt = 0
 
         self._trace_pos = dict()
+
+        self._bound = False  # Indicates if the mouse hover callbacks are bound to the sensor's items
     # end def
 
     def add_cur_vals_to_traces(self, vehicle=None):
@@ -85,7 +87,7 @@ class SensorVisu(BaseVisu, TraceVisu):
         """
 
         if vehicle not in self._trace_pos:
-            self._trace_pos[vehicle] = list()
+            self._trace_pos[vehicle] = self.create_trace()
 
         self.add_cur_val_to_trace(self._trace_pos[vehicle], self.sensor.measurements[vehicle][-1].get_abs_cartesian())
     # end def
@@ -105,7 +107,7 @@ class SensorVisu(BaseVisu, TraceVisu):
             Keyword arguments passed to tkinter.Canvas.create_line().
         """
 
-        BaseVisu.draw_trace(self.canvas, trace=trace, draw_arrow=draw_arrow, fill_format=fill_format, color=self.fill, trace_length_max=self.trace_length_max, **kwargs)
+        BaseVisu.draw_trace(self.canvas, trace=trace, draw_arrow=draw_arrow, fill_format=fill_format, color=self.fill, trace_length_max=self.trace_length_max, n_color_bands=self.n_color_bands, **kwargs)
     # end def
 
     def draw(self, draw_meas=True, vehicles=None):
@@ -121,17 +123,19 @@ class SensorVisu(BaseVisu, TraceVisu):
         """
 
         # The sensor itself
-        def cb_mouse_enter(event, item):
-            event.widget.itemconfig(item, fill="red")
+        def cb_mouse_enter(event):
+            event.widget.itemconfig("{:x}_box".format(id(self.sensor)), fill="red")
         # end def
 
-        def cb_mouse_leave(event, item):
-            event.widget.itemconfig(item, fill=self.fill)
+        def cb_mouse_leave(event):
+            event.widget.itemconfig("{:x}_box".format(id(self.sensor)), fill=self.fill)
         # end def
 
         if not isinstance(vehicles, list):
             vehicles = [vehicles]
 
+        self.canvas.begin_layer(self)
+
         # Draw the sensor box itself
         vehicle = None
 
@@ -158,7 +162,9 @@ class SensorVisu(BaseVisu, TraceVisu):
             ps.append(p[1])
         # end for
 
-        shape = self.canvas.create_polygon(ps, fill=self.fill, outline=self.outline, tag="{:x}".format(id(self.sensor)))
+        # The box gets addressed by its own tag, since its handle is not known before the frame got drawn
+        self.canvas.create_polygon(ps, fill=self.fill, outline=self.outline,
+                                   tags=("{:x}".format(id(self.sensor)), "{:x}_box".format(id(self.sensor))))
         font_size = int(self.canvas.scale_factor * self.canvas.zoom * self.canvas.ratio_scale_factor * 1.e03 * self._font_size_scale)
 
         if vehicle is not None:
@@ -168,10 +174,12 @@ class SensorVisu(BaseVisu, TraceVisu):
         self.canvas.create_text(self.sensor.pos[0], self.sensor.pos[1], text=self.sensor.name, fill=self.outline, font=(None, font_size),
                                 anchor=tk.CENTER, tag="{:x}".format(id(self.sensor)))
 
-        self.canvas.tag_bind("{:x}".format(id(self.sensor)), '<Enter>',
-                             lambda event, item=shape: cb_mouse_enter(event, item))
-        self.canvas.tag_bind("{:x}".format(id(self.sensor)), '<Leave>',
-                             lambda event, item=shape: cb_mouse_leave(event, item))
+        # The bindings belong to the tag, i.e. they also apply to the items created later on
+        if not self._bound:
+            self.canvas.tag_bind("{:x}".format(id(self.sensor)), '<Enter>', cb_mouse_enter)
+            self.canvas.tag_bind("{:x}".format(id(self.sensor)), '<Leave>', cb_mouse_leave)
+            self._bound = True
+        # end if
 
         # For each vehicle draw the measurement information
         for vehicle in vehicles:
@@ -182,9 +190,7 @@ class SensorVisu(BaseVisu, TraceVisu):
             # The sensor's measurements
             measurements = list()
             if vehicle in self.sensor.measurements:
-                self.sensor.measurements[vehicle] = self.sensor.measurements[vehicle][-self.meas_buf_max:]
-                measurements = self.sensor.measurements[vehicle]
-            # end if
+                measurements = self.sensor.measurements[vehicle].last(self.meas_buf_max)
 
             if draw_meas:
                 x_style = 1
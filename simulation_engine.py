@@ -0,0 +1,507 @@
+from vehicle import Vehicle
+from vehicle_fleet import FleetVehicle
+from sensor import ISensorMeasure
+from sensor_scheduler import SensorScheduler
+from measurement_log import MeasurementLog
+from step_metrics import StepMetrics
+import numpy as np
+import zlib
+import time
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+class SimulationEngine:
+    """The simulation core that owns the clock, the vehicles, the sensors and the sensor groups.
+    It advances the simulation without any visualization and can therefore run headless (e.g. for batch runs).
+    The sensors and sensor groups are scheduled by their next trigger time, so only the due ones get triggered.
+    Visualizations (like the Gui) can register listeners to get informed about updated vehicles and new measurements.
+
+    Parameters
+    ----------
+    t_start : float, optional
+        The initial simulation time.
+    t_incr : float, optional
+        The time increase per simulation step.
+    seed : int or numpy.random.SeedSequence, optional
+        The scenario's seed each sensor's random number generator gets derived from (see seed()).
+    meas_log_capacity : int, optional
+        If set, all measurements get logged with their exact timestamps in meas_log (sensors) and meas_log_filtered
+        (sensor groups), each keeping up to the given number of measurements.
+    """
+
+    def __init__(self, t_start=0., t_incr=1., seed=None, meas_log_capacity=None):
+        self.t = t_start
+        self.t_incr = t_incr
+        self.seed_seq = None
+        self._rng_keys = dict()  # The number of seeded sensors by name key (see _seed_sensor())
+
+        self.vehicles = list()
+        self.fleets = list()
+        self.sensors = list()
+        self.sensor_groups = list()
+
+        self._single_vehicles = list()  # Vehicles not being part of a fleet
+        self._fleet_all = None  # The fleet holding exactly the simulated vehicles in the same order (if any)
+        self._scheduler = SensorScheduler()
+
+        # The measurement logs (separated, since the filtered measurements have a different dimension)
+        self.meas_log = MeasurementLog(meas_log_capacity) if meas_log_capacity is not None else None
+        self.meas_log_filtered = MeasurementLog(meas_log_capacity) if meas_log_capacity is not None else None
+        self._meas_log_by_sensor = dict()
+        self._phase_by_sensor = dict()  # The name of the measuring phase in the metrics
+
+        self.metrics = StepMetrics()  # Per-phase timing and counters of the step loop
+
+        self._vehicle_listeners = list()
+        self._measure_listeners = list()
+
+        self.seed(seed)
+    # end def
+
+    def seed(self, seed=None):
+        """Sets the scenario's seed and (re-)assigns a random number generator to each sensor and sensor group.
+        Each sensor's generator is spawned from the scenario's SeedSequence using a key derived from the sensor's name
+        (and its occurrence for duplicate names), so adding or reordering sensors doesn't change the noise of the
+        other sensors.
+
+        Parameters
+        ----------
+        seed : int or numpy.random.SeedSequence, optional
+            The seed. If not set, fresh entropy is used.
+        """
+
+        self.seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self._rng_keys = dict()
+
+        for sensor in self.sensors + self.sensor_groups:
+            self._seed_sensor(sensor)
+    # end def
+
+    def _seed_sensor(self, sensor: ISensorMeasure):
+        """Assigns a random number generator derived from the scenario's seed to the sensor (see seed()).
+
+        Parameters
+        ----------
+        sensor : ISensorMeasure
+            The sensor (or sensor group) to seed.
+        """
+
+        name_key = zlib.crc32(sensor.name.encode())
+        occurrence = self._rng_keys.get(name_key, 0)
+        self._rng_keys[name_key] = occurrence + 1
+
+        seed_seq = np.random.SeedSequence(self.seed_seq.entropy,
+                                          spawn_key=self.seed_seq.spawn_key + (name_key, occurrence))
+        sensor.set_rng(np.random.default_rng(seed_seq))
+    # end def
+
+    def add_vehicle(self, vehicle: Vehicle):
+        """Adds a vehicle to the simulation. If the vehicle is part of a VehicleFleet, the whole fleet gets updated at
+        once instead of updating each of its vehicles separately.
+
+        Parameters
+        ----------
+        vehicle : Vehicle
+            The vehicle to add.
+        """
+
+        self.vehicles.append(vehicle)
+
+        # If all vehicles belong to one fleet in the same order, the sensors can measure the fleet's positions at once
+        if isinstance(vehicle, FleetVehicle) and vehicle.index == len(self.vehicles) - 1 and \
+                (len(self.vehicles) == 1 or self._fleet_all is vehicle.fleet):
+            self._fleet_all = vehicle.fleet
+        else:
+            self._fleet_all = None
+        # end if
+
+        if isinstance(vehicle, FleetVehicle):
+            if not any(fleet is vehicle.fleet for fleet in self.fleets):
+                self.fleets.append(vehicle.fleet)
+        else:
+            self._single_vehicles.append(vehicle)
+        # end if
+    # end def
+
+    def add_sensor(self, sensor: ISensorMeasure):
+        """Adds a sensor to the simulation.
+
+        Parameters
+        ----------
+        sensor : ISensorMeasure
+            The sensor to add.
+        """
+
+        self.sensors.append(sensor)
+        self._meas_log_by_sensor[sensor] = self.meas_log
+        self._phase_by_sensor[sensor] = "sensor_measure"
+        self._seed_sensor(sensor)
+        self._scheduler.add_sensor(sensor, priority=0)
+    # end def
+
+    def add_sensor_group(self, sensor_group: ISensorMeasure):
+        """Adds a sensor group to the simulation. The sensors of the group need to be added separately.
+
+        Parameters
+        ----------
+        sensor_group : ISensorMeasure
+            The sensor group to add.
+        """
+
+        self.sensor_groups.append(sensor_group)
+        self._meas_log_by_sensor[sensor_group] = self.meas_log_filtered
+        self._phase_by_sensor[sensor_group] = "sensor_group_measure"
+        sensor_group.metrics = self.metrics  # For timing the Kalman filter
+        self._seed_sensor(sensor_group)
+        self._scheduler.add_sensor(sensor_group, priority=1)  # Sensor groups rely on the measurements of their sensors
+    # end def
+
+    def add_vehicle_listener(self, l: callable):
+        """Adds a listener that gets called with the vehicle after each vehicle update.
+
+        Parameters
+        ----------
+        l : callable
+            The listener callback to add.
+        """
+
+        self._vehicle_listeners.append(l)
+    # end def
+
+    def remove_vehicle_listener(self, l: callable):
+        """Removes a vehicle listener from the list of listeners.
+
+        Parameters
+        ----------
+        l : callable
+            The listener callback to remove.
+        """
+
+        self._vehicle_listeners.remove(l)
+    # end def
+
+    def add_measure_listener(self, l: callable):
+        """Adds a listener that gets called with the sensor (or sensor group), the vehicle and the measurement
+        after each measurement.
+
+        Parameters
+        ----------
+        l : callable
+            The listener callback to add.
+        """
+
+        self._measure_listeners.append(l)
+    # end def
+
+    def remove_measure_listener(self, l: callable):
+        """Removes a measurement listener from the list of listeners.
+
+        Parameters
+        ----------
+        l : callable
+            The listener callback to remove.
+        """
+
+        self._measure_listeners.remove(l)
+    # end def
+
+    def step(self):
+        """Performs a simulation step at the current time and increases the time afterwards.
+
+        Returns
+        -------
+        bool
+            True if anything has changed (i.e. a vehicle got updated or a measurement has been made).
+        """
+
+        changed = self._process()
+
+        self.t += self.t_incr
+
+        return changed
+    # end def
+
+    def step_event(self, t_end=None):
+        """Performs a variable time step: jumps directly to the next sensor event and processes it. The vehicles get
+        evaluated at the exact event time. The time is not increased afterwards.
+
+        Parameters
+        ----------
+        t_end : float, optional
+            The simulation time to stop at (exclusive), i.e. later events are not processed.
+
+        Returns
+        -------
+        bool
+            True if an event has been processed, False if there is no further event (before t_end).
+        """
+
+        t_next = self.next_event_time()
+
+        if t_next is None or (t_end is not None and t_next >= t_end):
+            return False
+
+        self.t = max(self.t, t_next)
+        self._process()
+
+        return True
+    # end def
+
+    def _process(self):
+        """Updates all vehicles and triggers the due sensors (and sensor groups) at the current time.
+
+        Returns
+        -------
+        bool
+            True if anything has changed (i.e. a vehicle got updated or a measurement has been made).
+        """
+
+        changed = False
+        metrics = self.metrics
+        t_start = time.perf_counter()
+
+        # Update vehicle positions
+        with metrics.timer("vehicle_update"):
+            for fleet in self.fleets:
+                fleet.update(self.t)
+
+            for v in self._single_vehicles:
+                v.update(self.t)
+        # end with
+
+        if len(self._vehicle_listeners) > 0:
+            with metrics.timer("listeners"):
+                for v in self.vehicles:
+                    for l in self._vehicle_listeners:
+                        l(v)  # Callback
+                # end for
+            # end with
+        # end if
+
+        if len(self.vehicles) > 0:
+            changed = True
+
+        # Update sensor measurements and make Kalman filtered measurements (sensors first, sensor groups afterwards)
+        n_meas = 0
+
+        for s in self._scheduler.trigger_due(self.t):
+            n_meas += self._measure_all(s)
+            changed = True
+        # end for
+
+        metrics.add("measurements", n_meas)
+        metrics.add("process", time.perf_counter() - t_start)
+        metrics.end_tick()
+
+        return changed
+    # end def
+
+    def _measure_all(self, sensor):
+        """Measures all vehicles with the given sensor (or sensor group) and informs all listeners.
+
+        Parameters
+        ----------
+        sensor : ISensorMeasure
+            The sensor (or sensor group) to measure with.
+
+        Returns
+        -------
+        int
+            The number of measurements made.
+        """
+
+        meas_log = self._meas_log_by_sensor[sensor]
+        vehicles = self.vehicles
+
+        if self._fleet_all is not None and len(self._fleet_all) == len(vehicles):
+            vehicles = self._fleet_all.vehicles  # Same vehicles, but lets the sensors use the fleet's position array
+
+        with self.metrics.timer(self._phase_by_sensor[sensor]):
+            measurements = sensor.measure_all(vehicles)
+
+        if meas_log is not None:
+            meas_log.append_batch(self.t, sensor, measurements)
+
+        if len(self._measure_listeners) > 0:
+            with self.metrics.timer("listeners"):
+                for v, meas in zip(self.vehicles, measurements):
+                    for l in self._measure_listeners:
+                        l(sensor, v, meas)  # Callback
+                # end for
+            # end with
+        # end if
+
+        return len(measurements)
+    # end def
+
+    def next_event_time(self):
+        """Returns the time of the next sensor (or sensor group) event.
+
+        Returns
+        -------
+        float
+            The next event time or None if there are no scheduled sensors.
+        """
+
+        return self._scheduler.next_trigger_time
+    # end def
+
+    def skip_idle(self, t_end=None, n_steps=None):
+        """Advances the time without performing any work up to the step of the next sensor event. Skipping is only
+        possible if nothing else needs an update on every step, i.e. if there are no vehicle listeners. The vehicles'
+        states are then only updated at the steps containing a sensor event.
+
+        Parameters
+        ----------
+        t_end : float, optional
+            The simulation time to stop at (exclusive).
+        n_steps : int, optional
+            The maximum number of steps to skip.
+
+        Returns
+        -------
+        int
+            The number of skipped steps. Nothing gets skipped if there's neither a next sensor event nor a limit
+            (t_end or n_steps), since the skipping would never end.
+        """
+
+        if len(self._vehicle_listeners) > 0:
+            return 0
+
+        t_next = self.next_event_time()
+
+        if t_next is None and t_end is None and n_steps is None:
+            return 0
+
+        # The number of steps up to the first step at or after the next event (or the end time)
+        steps = [self._steps_until(t) for t in (t_next, t_end) if t is not None]
+
+        if n_steps is not None:
+            steps.append(max(n_steps, 0))
+
+        step = min(steps)
+        self.t += step * self.t_incr
+
+        return step
+    # end def
+
+    def _steps_until(self, t):
+        """Returns the number of steps needed to reach the given time (the smallest k with self.t + k * t_incr >= t).
+
+        Parameters
+        ----------
+        t : float
+            The time to reach.
+
+        Returns
+        -------
+        int
+            The number of steps.
+        """
+
+        if self.t >= t:
+            return 0
+
+        k = max(int(np.ceil((t - self.t) / self.t_incr)), 1)
+
+        # Correct rounding errors of the division
+        if self.t + k * self.t_incr < t:
+            k += 1
+        elif k > 1 and self.t + (k - 1) * self.t_incr >= t:
+            k -= 1
+        # end if
+
+        return k
+    # end def
+
+    @staticmethod
+    def _wait(t_sim, t_sim_start, t_wall_start, real_time_factor):
+        """Sleeps until the wall-clock time corresponding to the given simulation time is reached.
+
+        Parameters
+        ----------
+        t_sim : float
+            The simulation time to wait for.
+        t_sim_start : float
+            The simulation time at the start of the run.
+        t_wall_start : float
+            The wall-clock time (see time.perf_counter()) at the start of the run.
+        real_time_factor : float
+            The ratio of simulated time to wall-clock time.
+        """
+
+        delay = (t_sim - t_sim_start) / real_time_factor - (time.perf_counter() - t_wall_start)
+
+        if delay > 0.:
+            time.sleep(delay)
+    # end def
+
+    def run(self, t_end=None, n_steps=None, skip_idle=True, variable_step=False, real_time_factor=None):
+        """Runs the simulation until the given end time or number of steps is reached.
+
+        Parameters
+        ----------
+        t_end : float, optional
+            The simulation time to stop at (exclusive).
+        n_steps : int, optional
+            The number of steps to perform (skipped steps included). In variable step mode it's the number of events.
+        skip_idle : bool, optional
+            If True, the steps without any sensor event get skipped (see skip_idle()). Not used in variable step mode.
+        variable_step : bool, optional
+            If True, the simulation jumps from one sensor event to the next instead of using fixed time steps
+            (see step_event()). At the end, the time gets set to t_end (if given).
+        real_time_factor : float, optional
+            The ratio of simulated time to wall-clock time, e.g. 60. simulates one minute per second.
+            If not set, the simulation runs as fast as possible.
+
+        Returns
+        -------
+        int
+            The number of performed steps (or events in variable step mode).
+        """
+
+        if t_end is None and n_steps is None:
+            raise ValueError("Either t_end or n_steps needs to be set.")
+
+        t_sim_start = self.t
+        t_wall_start = time.perf_counter()
+        step = 0
+
+        while (t_end is None or self.t < t_end) and (n_steps is None or step < n_steps):
+            if variable_step:
+                t_next = self.next_event_time()
+
+                if t_next is None or (t_end is not None and t_next >= t_end):
+                    if t_end is not None:
+                        self.t = float(t_end)
+                    break
+                # end if
+
+                if real_time_factor is not None:
+                    self._wait(t_next, t_sim_start, t_wall_start, real_time_factor)
+
+                self.step_event()
+
+            else:
+                if skip_idle:
+                    step += self.skip_idle(t_end, None if n_steps is None else n_steps - step)
+
+                    if (t_end is not None and self.t >= t_end) or (n_steps is not None and step >= n_steps):
+                        break
+                # end if
+
+                if real_time_factor is not None:
+                    self._wait(self.t, t_sim_start, t_wall_start, real_time_factor)
+
+                self.step()
+            # end if
+
+            step += 1
+        # end while
+
+        return step
+    # end def
+# end class
@@ -0,0 +1,236 @@
+"""Closed-form kernels for 2x2 matrices. At these sizes the per-call overhead of the general numpy.linalg functions
+dominates, so the formulas are written out explicitly. Each kernel exists in a scalar form (for a single (2, 2) matrix)
+and in a batched form (for stacked matrices of shape (..., 2, 2))."""
+
+
+import numpy as np
+import math
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+def det_2x2(m):
+    """Calculates the determinant of a 2x2 matrix.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+        The matrix of shape (2, 2).
+
+    Returns
+    -------
+    float
+        The determinant.
+    """
+
+    return float(m[0, 0] * m[1, 1] - m[0, 1] * m[1, 0])
+# end def
+
+
+def det_2x2_batch(m):
+    """Calculates the determinants of stacked 2x2 matrices.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+        The matrices of shape (..., 2, 2).
+
+    Returns
+    -------
+    numpy.ndarray
+        The determinants of shape (...).
+    """
+
+    return m[..., 0, 0] * m[..., 1, 1] - m[..., 0, 1] * m[..., 1, 0]
+# end def
+
+
+def inv_2x2(m):
+    """Calculates the inverse of a 2x2 matrix.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+        The matrix of shape (2, 2).
+
+    Returns
+    -------
+    numpy.ndarray
+        The inverse of shape (2, 2).
+    """
+
+    a, b, c, d = float(m[0, 0]), float(m[0, 1]), float(m[1, 0]), float(m[1, 1])
+    det = a * d - b * c
+
+    if det == 0.:
+        raise np.linalg.LinAlgError("Singular matrix")
+
+    return np.array(((d / det, -b / det), (-c / det, a / det)))
+# end def
+
+
+def inv_2x2_batch(m):
+    """Calculates the inverses of stacked 2x2 matrices.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+        The matrices of shape (..., 2, 2).
+
+    Returns
+    -------
+    numpy.ndarray
+        The inverses of shape (..., 2, 2).
+    """
+
+    det = det_2x2_batch(m)
+
+    if np.any(det == 0.):
+        raise np.linalg.LinAlgError("Singular matrix")
+
+    res = np.empty(m.shape)
+    res[..., 0, 0] = m[..., 1, 1]
+    res[..., 0, 1] = -m[..., 0, 1]
+    res[..., 1, 0] = -m[..., 1, 0]
+    res[..., 1, 1] = m[..., 0, 0]
+    res /= det[..., np.newaxis, np.newaxis]
+
+    return res
+# end def
+
+
+def eig_sym_2x2(m):
+    """Calculates the eigen decomposition of a symmetric 2x2 matrix.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+        The symmetric matrix of shape (2, 2).
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        The eigenvalues of shape (2,) and the normalized eigenvectors as columns of a rotation matrix of shape (2, 2).
+        The first eigenvector is the one closest to the x-axis, i.e. the rotation angle lies within [-pi/4, pi/4].
+    """
+
+    a, b, d = float(m[0, 0]), (float(m[0, 1]) + float(m[1, 0])) / 2., float(m[1, 1])
+
+    mean = (a + d) / 2.
+    diff = math.hypot((a - d) / 2., b)
+    theta = math.atan2(2. * b, a - d) / 2.  # Direction of the larger eigenvalue's eigenvector
+
+    if abs(theta) > math.pi / 4.:
+        theta -= math.copysign(math.pi / 2., theta)
+        diff = -diff
+    # end if
+
+    c, s = math.cos(theta), math.sin(theta)
+
+    return np.array((mean + diff, mean - diff)), np.array(((c, -s), (s, c)))
+# end def
+
+
+def eig_sym_2x2_batch(m):
+    """Calculates the eigen decompositions of stacked symmetric 2x2 matrices.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+        The symmetric matrices of shape (..., 2, 2).
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        The eigenvalues of shape (..., 2) and the normalized eigenvectors as columns of rotation matrices of shape
+        (..., 2, 2). The first eigenvector is the one closest to the x-axis, i.e. the rotation angle lies within
+        [-pi/4, pi/4].
+    """
+
+    a, b, d = m[..., 0, 0], (m[..., 0, 1] + m[..., 1, 0]) / 2., m[..., 1, 1]
+
+    mean = (a + d) / 2.
+    diff = np.hypot((a - d) / 2., b)
+    theta = np.arctan2(2. * b, a - d) / 2.  # Direction of the larger eigenvalue's eigenvector
+
+    swap = np.abs(theta) > np.pi / 4.
+    theta = np.where(swap, theta - np.copysign(np.pi / 2., theta), theta)
+    diff = np.where(swap, -diff, diff)
+
+    c, s = np.cos(theta), np.sin(theta)
+
+    eVe = np.empty(m.shape)
+    eVe[..., 0, 0] = c
+    eVe[..., 0, 1] = -s
+    eVe[..., 1, 0] = s
+    eVe[..., 1, 1] = c
+
+    return np.stack((mean + diff, mean - diff), axis=-1), eVe
+# end def
+
+
+def chol_2x2(m):
+    """Calculates the Cholesky factor of a symmetric positive-definite 2x2 matrix.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+        The matrix of shape (2, 2).
+
+    Returns
+    -------
+    numpy.ndarray
+        The lower triangular factor L of shape (2, 2) with L * L.T = m.
+    """
+
+    a, b, d = float(m[0, 0]), float(m[1, 0]), float(m[1, 1])
+
+    if a <= 0.:
+        raise np.linalg.LinAlgError("Matrix is not positive definite")
+
+    l00 = math.sqrt(a)
+    l10 = b / l00
+    l11_sq = d - l10 * l10
+
+    if l11_sq <= 0.:
+        raise np.linalg.LinAlgError("Matrix is not positive definite")
+
+    return np.array(((l00, 0.), (l10, math.sqrt(l11_sq))))
+# end def
+
+
+def chol_2x2_batch(m):
+    """Calculates the Cholesky factors of stacked symmetric positive-definite 2x2 matrices.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+        The matrices of shape (..., 2, 2).
+
+    Returns
+    -------
+    numpy.ndarray
+        The lower triangular factors L of shape (..., 2, 2) with L * L.T = m.
+    """
+
+    a, b, d = m[..., 0, 0], m[..., 1, 0], m[..., 1, 1]
+
+    if np.any(a <= 0.):
+        raise np.linalg.LinAlgError("Matrix is not positive definite")
+
+    l00 = np.sqrt(a)
+    l10 = b / l00
+    l11_sq = d - l10 * l10
+
+    if np.any(l11_sq <= 0.):
+        raise np.linalg.LinAlgError("Matrix is not positive definite")
+
+    res = np.zeros(m.shape)
+    res[..., 0, 0] = l00
+    res[..., 1, 0] = l10
+    res[..., 1, 1] = np.sqrt(l11_sq)
+
+    return res
+# end def
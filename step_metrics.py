@@ -0,0 +1,250 @@
+from ring_buffer import RingBuffer
+import numpy as np
+import json
+import time
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+class RollingStats:
+    """Keeps the latest samples of a metric in a rolling window for calculating percentiles, and the count, total and
+    max. of all samples.
+
+    Parameters
+    ----------
+    window : int
+        The number of latest samples used for the percentiles.
+    """
+
+    def __init__(self, window):
+        self._window = RingBuffer(window)
+        self.count = 0
+        self.total = 0.
+        self.max = 0.
+    # end def
+
+    def add(self, value):
+        """Adds a sample.
+
+        Parameters
+        ----------
+        value : float
+            The sample.
+        """
+
+        self._window.append(value)
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+    # end def
+
+    def to_dict(self) -> dict:
+        """Returns the statistics.
+
+        Returns
+        -------
+        dict
+            The count, total, mean and max. of all samples and the percentiles p50, p95 and p99 of the rolling window.
+        """
+
+        if len(self._window) > 0:
+            p50, p95, p99 = np.percentile(self._window.last(), (50., 95., 99.))
+        else:
+            p50 = p95 = p99 = 0.
+
+        return {"count": self.count, "total": self.total, "mean": self.total / max(self.count, 1),
+                "p50": float(p50), "p95": float(p95), "p99": float(p99), "max": self.max}
+    # end def
+# end class
+
+
+class _PhaseTimer:
+    """A reusable context manager measuring the duration of a phase.
+
+    Parameters
+    ----------
+    metrics : StepMetrics
+        The metrics to add the duration to.
+    name : str
+        The phase's name.
+    """
+
+    __slots__ = ("_metrics", "_name", "_start")
+
+    def __init__(self, metrics, name):
+        self._metrics = metrics
+        self._name = name
+        self._start = 0.
+    # end def
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+        return self
+    # end def
+
+    def __exit__(self, type, value, traceback):
+        if self._metrics.enabled:
+            self._metrics.add(self._name, time.perf_counter() - self._start)
+    # end def
+# end class
+
+
+class StepMetrics:
+    """Instrumentation of the simulation's step loop. It collects the durations of the step's phases
+    (e.g. vehicle update, measuring, Kalman filtering, trace bookkeeping, drawing) and counters (e.g. measurements per
+    tick, canvas items created) as samples of RollingStats. The metrics can be exported as JSON or passed to listeners
+    every export_interval ticks.
+
+    Parameters
+    ----------
+    window : int, optional
+        The number of latest samples per metric used for the percentiles.
+    export_interval : int, optional
+        The number of ticks after which the listeners get called with the metrics.
+    enabled : bool, optional
+        Indicates if metrics get collected.
+    """
+
+    def __init__(self, window=1000, export_interval=100, enabled=True):
+        self.window = window
+        self.export_interval = export_interval
+        self.enabled = enabled
+
+        self.ticks = 0
+        self._stats = dict()
+        self._timers = dict()
+        self._listeners = list()
+    # end def
+
+    def timer(self, name) -> _PhaseTimer:
+        """Returns the timer of the given phase for use in a with statement, e.g. with metrics.timer("draw"): ...
+
+        Parameters
+        ----------
+        name : str
+            The phase's name.
+
+        Returns
+        -------
+        _PhaseTimer
+            The phase's (reused) timer.
+        """
+
+        if name not in self._timers:
+            self._timers[name] = _PhaseTimer(self, name)
+
+        return self._timers[name]
+    # end def
+
+    def add(self, name, value):
+        """Adds a sample to a metric (a phase duration in [s] or a counter value).
+
+        Parameters
+        ----------
+        name : str
+            The metric's name.
+        value : float
+            The sample.
+        """
+
+        if not self.enabled:
+            return
+
+        if name not in self._stats:
+            self._stats[name] = RollingStats(self.window)
+
+        self._stats[name].add(value)
+    # end def
+
+    def end_tick(self):
+        """Finishes a tick and calls the listeners with the metrics every export_interval ticks."""
+
+        if not self.enabled:
+            return
+
+        self.ticks += 1
+
+        if len(self._listeners) > 0 and self.ticks % self.export_interval == 0:
+            metrics = self.to_dict()
+
+            for l in self._listeners:
+                l(metrics)  # Callback
+        # end if
+    # end def
+
+    def add_listener(self, l: callable):
+        """Adds a listener that gets called with the metrics (see to_dict()) every export_interval ticks.
+
+        Parameters
+        ----------
+        l : callable
+            The listener callback to add.
+        """
+
+        self._listeners.append(l)
+    # end def
+
+    def remove_listener(self, l: callable):
+        """Removes a listener from the list of listeners.
+
+        Parameters
+        ----------
+        l : callable
+            The listener callback to remove.
+        """
+
+        self._listeners.remove(l)
+    # end def
+
+    def reset(self):
+        """Drops all collected metrics."""
+
+        self.ticks = 0
+        self._stats = dict()
+    # end def
+
+    def to_dict(self) -> dict:
+        """Returns all metrics.
+
+        Returns
+        -------
+        dict
+            The number of ticks and the statistics (see RollingStats.to_dict()) by metric name.
+        """
+
+        return {"ticks": self.ticks, "metrics": {name: stats.to_dict() for name, stats in self._stats.items()}}
+    # end def
+
+    def to_json(self, **kwargs) -> str:
+        """Returns all metrics as JSON string.
+
+        Parameters
+        ----------
+        **kwargs : dict, optional
+            Keyword arguments passed to json.dumps().
+
+        Returns
+        -------
+        str
+            The metrics as JSON.
+        """
+
+        return json.dumps(self.to_dict(), **kwargs)
+    # end def
+
+    def export_json(self, filename):
+        """Writes all metrics as JSON to the given file.
+
+        Parameters
+        ----------
+        filename : str
+            The file to write to.
+        """
+
+        with open(filename, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+    # end def
+# end class
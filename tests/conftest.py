@@ -0,0 +1,10 @@
+import os
+import sys
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+# The modules live in the repository's root directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
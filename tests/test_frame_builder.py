@@ -0,0 +1,107 @@
+from frame_builder import FrameBuilder, PendingItem
+import tkinter as tk
+import pytest
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+# Records each canvas command with its arguments and returns increasing item handles on create
+_STUB_CANVAS_PROC = """
+proc .stub_canvas {cmd args} {
+    global calls next_id
+    lappend calls [list $cmd {*}$args]
+    if {$cmd eq "create"} {
+        return [incr next_id]
+    }
+}
+set calls [list]
+set next_id 0
+"""
+
+NASTY_NAMES = ["Radar[1]", "cost$x", "a;b", "{open", "close}", "{x} y", "back\\slash", "quote\"d", "new\nline", ""]
+
+
+class _StubCanvas:
+    """Provides what the FrameBuilder needs from a canvas, backed by a real Tcl interpreter and a stub canvas command."""
+
+    _options = tk.Misc._options
+
+    def __init__(self):
+        try:
+            self.tk = tk.Tcl().tk
+        except tk.TclError:
+            pytest.skip("Tcl is not available")
+
+        self._w = ".stub_canvas"
+        self.tk.eval(_STUB_CANVAS_PROC)
+    # end def
+
+    @property
+    def calls(self):
+        return [tuple(str(arg) for arg in self.tk.splitlist(call)) for call in self.tk.splitlist(self.tk.getvar("calls"))]
+    # end def
+# end class
+
+
+@pytest.fixture
+def canvas():
+    return _StubCanvas()
+# end def
+
+
+def test_flush_returns_created_handles_in_order(canvas):
+    batch = FrameBuilder(canvas)
+    items = [batch.create("line", [0., 1., 2., 3.], dict(fill="black")) for _ in range(3)]
+
+    assert [item.index for item in items] == [0, 1, 2]
+    assert batch.flush() == [1, 2, 3]
+    assert len(batch) == 0
+    assert batch.flush() == list()
+# end def
+
+
+@pytest.mark.parametrize("name", NASTY_NAMES)
+def test_values_are_passed_verbatim(canvas, name):
+    batch = FrameBuilder(canvas)
+    item = batch.create("text", [10., 20.5], dict(text=name, tags=(name, "fixed"), fill=None))
+    batch.itemconfigure(item, dict(text=name + name))
+    batch.coords(item, [1, 2.5])
+    ids = batch.flush()
+
+    create, itemconfigure, coords = canvas.calls
+
+    assert create[:4] == ("create", "text", "10.0", "20.5")
+    assert dict(zip(create[4::2], create[5::2])) == {"-text": name, "-tags": tk._join((name, "fixed"))}
+    assert itemconfigure == ("itemconfigure", str(ids[0]), "-text", name + name)
+    assert coords == ("coords", str(ids[0]), "1", "2.5")
+# end def
+
+
+def test_item_references(canvas):
+    batch = FrameBuilder(canvas)
+    item = batch.create("line", [0, 0, 1, 1], dict())
+    batch.tag_raise(item, 42)
+    batch.tag_lower(7)
+    batch.tag_raise("Radar[1]")
+    batch.delete(item, 42, "cost$x")
+    ids = batch.flush()
+
+    assert canvas.calls[1:] == [("raise", str(ids[0]), "42"), ("lower", "7"), ("raise", "Radar[1]"),
+                                ("delete", str(ids[0]), "42", "cost$x")]
+# end def
+
+
+def test_trailing_underscore_option(canvas):
+    batch = FrameBuilder(canvas)
+    batch.create("line", [0, 0, 1, 1], dict(class_="x$y"))
+    batch.flush()
+
+    assert canvas.calls[0][-2:] == ("-class", "x$y")
+# end def
+
+
+def test_pending_item():
+    assert PendingItem(3).index == 3
+# end def
@@ -0,0 +1,151 @@
+from kalman_filter import EKF, KalmanFilterBank
+from kalman_filter_factory import KalmanFilterFactory, KalmanFilterType
+from fractions import Fraction
+import numpy as np
+import pytest
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+def _join_measurements_exact(R, z):
+    # Information form fusion of 2D measurements in exact rational arithmetic as reference
+    def inv(m):
+        det = m[0][0] * m[1][1] - m[0][1] * m[1][0]
+
+        return [[m[1][1] / det, -m[0][1] / det], [-m[1][0] / det, m[0][0] / det]]
+    # end def
+
+    Y = [[Fraction(0)] * 2 for _ in range(2)]
+    y = [Fraction(0)] * 2
+
+    for R_i, z_i in zip(R, z):
+        Y_i = inv([[Fraction(float(v)) for v in row] for row in R_i])
+
+        for i in range(2):
+            y[i] += sum(Y_i[i][j] * Fraction(float(z_i[j])) for j in range(2))
+
+            for j in range(2):
+                Y[i][j] += Y_i[i][j]
+        # end for
+    # end for
+
+    R_res = inv(Y)
+    z_res = [sum(R_res[i][j] * y[j] for j in range(2)) for i in range(2)]
+
+    return np.asarray(R_res, dtype=float), np.asarray(z_res, dtype=float)
+# end def
+
+
+def test_join_measurements_of_nearly_singular_covariances():
+    rng = np.random.default_rng(0)
+
+    for eps in (1.e-6, 1.e-8, 1.e-10):
+        # Strongly elongated covariance ellipses in different directions
+        theta = rng.uniform(0., np.pi, size=3)
+        rot = np.moveaxis(np.asarray([[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]]), -1, 0)
+        R = np.matmul(rot * np.asarray([1.e4, 1.e4 * eps]), np.swapaxes(rot, -1, -2))
+        z = rng.normal(size=(3, 2)) * 100.
+
+        R_exact, z_exact = _join_measurements_exact(R, z)
+        R_res, z_res = EKF.join_measurements_stacked(R, z)
+
+        np.testing.assert_allclose(R_res, R_exact, rtol=0., atol=1.e-6 * np.abs(R_exact).max())
+        np.testing.assert_allclose(z_res, z_exact, rtol=0., atol=1.e-6 * np.abs(z_exact).max())
+    # end for
+# end def
+
+
+def test_join_measurement_sets_at_once():
+    rng = np.random.default_rng(0)
+    R = np.asarray([[[4., 1.], [1., 3.]], [[2., -.5], [-.5, 1.]], [[1., 0.], [0., 9.]]])
+    z = rng.normal(size=(5, 3, 2))
+
+    R_res, z_res = EKF.join_measurements_stacked(R, z)
+
+    for z_set, z_res_set in zip(z, z_res):
+        R_set, z_set_res = EKF.join_measurements_stacked(R, z_set)
+
+        np.testing.assert_allclose(R_set, R_res)
+        np.testing.assert_allclose(z_set_res, z_res_set)
+    # end for
+
+    R_list, z_list = EKF.join_measurements(list(zip(R, z[0])))
+    np.testing.assert_allclose(R_list, R_res)
+    np.testing.assert_allclose(z_list, z_res[0])
+# end def
+
+
+@pytest.mark.parametrize("steady_state", [False, True])
+def test_bank_matches_single_filters(steady_state):
+    rng = np.random.default_rng(0)
+    q_sigmas = (5., 10., 20.)
+    covs = [np.identity(2) * 5.e2 ** 2, np.asarray([[1.e5, 3.e4], [3.e4, 1.e5]]), np.identity(2) * 1.e3]
+
+    P_init = np.identity(6) * 1.e6  # The default one (1.e10) amplifies the rounding differences
+
+    kfs = [KalmanFilterFactory.get_kalman_filter(KalmanFilterType.PLANE_2D, 5., cov, q_sigma, P_init=P_init,
+                                                 steady_state=steady_state) for q_sigma, cov in zip(q_sigmas, covs)]
+    bank = KalmanFilterBank(kfs[0].F, kfs[0].B, kfs[0].H, capacity=2, steady_state=steady_state)  # Needs to grow
+
+    for i, kf in enumerate(kfs):
+        assert bank.add_track(i, kf.x, kf.P, kf.Q) == i
+
+    u = np.zeros(kfs[0].F.shape[0])
+
+    for step in range(20):
+        z = rng.normal(size=(len(kfs), 2)) * 1.e3 + step * 100.
+        indices = np.arange(len(kfs)) if step % 2 == 0 else np.asarray([2, 0])  # Also update subsets
+
+        bank.predict(u, indices)
+        bank.filter(z[indices], np.asarray(covs)[indices], indices)
+
+        for index in indices:
+            kfs[index].predict(u)
+            kfs[index].filter(z[index], covs[index])
+        # end for
+
+        for index, kf in enumerate(kfs):
+            np.testing.assert_allclose(bank.x[index], kf.x, rtol=1.e-9, atol=1.e-6)
+            np.testing.assert_allclose(bank.P[index], kf.P, rtol=1.e-9)
+        # end for
+    # end for
+# end def
+
+
+def test_steady_state_gain_solves_the_riccati_equation():
+    R = np.asarray([[1.e5, 3.e4], [3.e4, 1.e5]])
+    kf = KalmanFilterFactory.get_kalman_filter(KalmanFilterType.PLANE_2D, 5., R, 10.)
+    K, P_pred, P = EKF.calc_steady_state_gain(kf.F, kf.Q, kf.H, kf.R)
+
+    # One more step of the Riccati recursion doesn't change the solution anymore
+    S = kf.H @ P_pred @ kf.H.T + kf.R
+    K_next = P_pred @ kf.H.T @ np.linalg.inv(S)
+    P_next = P_pred - K_next @ kf.H @ P_pred
+
+    np.testing.assert_allclose(K, K_next, rtol=1.e-9)
+    np.testing.assert_allclose(P, P_next, rtol=1.e-9)
+    np.testing.assert_allclose(kf.F @ P @ kf.F.T + kf.Q, P_pred, rtol=1.e-9)
+# end def
+
+
+def test_bank_tracks_with_equal_q_and_r_share_one_gain():
+    covs = np.asarray([np.identity(2) * 1.e3, np.identity(2) * 1.e4])
+    kfs = [KalmanFilterFactory.get_kalman_filter(KalmanFilterType.PLANE_2D, 5., covs[0], q_sigma, steady_state=True)
+           for q_sigma in (5., 10.) * 50]
+    bank = KalmanFilterBank(kfs[0].F, kfs[0].B, kfs[0].H, steady_state=True)
+
+    for i, kf in enumerate(kfs):
+        bank.add_track(i, kf.x, kf.P, kf.Q)
+
+    bank.predict()
+    bank.filter(np.zeros((len(kfs), 2)), covs[0])
+    assert len(bank._K_ss) == 2
+
+    # Tracks whose R changes get the gain of their new (Q, R)
+    bank.predict()
+    bank.filter(np.zeros((len(kfs), 2)), covs[np.arange(len(kfs)) % 4 // 2])
+    assert len(bank._K_ss) == 4
+    np.testing.assert_array_equal(bank._gain_index[:len(kfs)], np.tile([0, 1, 2, 3], len(kfs) // 4))
+# end def
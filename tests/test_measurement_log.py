@@ -0,0 +1,160 @@
+from measurement_log import MeasurementLog, SensorMeasurementLog
+from sensor import Plane, Radar
+from vehicle import Vehicle
+import numpy as np
+import pytest
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+@pytest.fixture
+def plane():
+    return Plane("P", True, np.asarray([100., 200.]), 1., np.identity(2))
+# end def
+
+
+@pytest.fixture
+def vehicle():
+    return Vehicle("V", True)
+# end def
+
+
+def test_columns_grow_up_to_the_capacity(plane, vehicle):
+    log = MeasurementLog(40)
+
+    capacities = list()
+
+    for i in range(50):
+        log.append_values(float(i), plane, vehicle, np.asarray([i, -i]), plane.pos, False)
+        capacities.append(log.allocated)
+    # end for
+
+    assert capacities == [16] * 16 + [32] * 16 + [40] * 18
+
+    assert len(log) == 40
+    assert log.total_count == 50
+    np.testing.assert_array_equal(log.t, np.arange(10., 50.))
+    np.testing.assert_array_equal(log.val[0], [10, -10])
+    assert [record.t for record in log.last(3)] == [47., 48., 49.]
+# end def
+
+
+def test_records_stay_valid_while_growing(plane, vehicle):
+    log = MeasurementLog(100)
+    records = [log.append_values(float(i), plane, vehicle, np.asarray([i, -i]), plane.pos, False) for i in range(40)]
+
+    assert [record.t for record in records] == [float(i) for i in range(40)]
+    np.testing.assert_array_equal(records[3].val, [3, -3])
+# end def
+
+
+def test_bytes_per_measurement(plane, vehicle):
+    capacity = 64
+    log = MeasurementLog(capacity)
+
+    for i in range(capacity + 1):
+        log.append_values(float(i), plane, vehicle, np.zeros(2), plane.pos, False)
+
+    assert log.nbytes == capacity * (8 + 4 + 4 + 16 + 16)
+
+    # The sensor's own log stores a value and a valid flag per measurement and the timestamp and sensor position per row
+    n_vehicles = 32
+    vehicles = [Vehicle("V{}".format(i), True) for i in range(n_vehicles)]
+    sensor_log = SensorMeasurementLog(capacity, plane)
+
+    for i in range(capacity + 1):
+        sensor_log.append_batch(float(i), vehicles, np.zeros((n_vehicles, 2)), plane.pos)
+
+    assert sensor_log.nbytes == capacity * (n_vehicles * (16 + 1) + 8 + 16)
+# end def
+
+
+def test_log_of_multiple_sensors_and_vehicles(plane, vehicle):
+    radar = Radar("R", True, np.asarray([0., 0.]), 1., np.identity(2))
+    vehicle2 = Vehicle("V2", True)
+    log = MeasurementLog(10)
+
+    log.append_values(0., plane, vehicle, np.asarray([1., 2.]), plane.pos, False)
+    log.append_values(1., radar, vehicle2, np.asarray([2., np.pi / 2.]), radar.pos, True)
+
+    np.testing.assert_array_equal(log.sensor_id, [0, 1])
+    np.testing.assert_array_equal(log.vehicle_id, [0, 1])
+    assert [record.sensor for record in log] == [plane, radar]
+    assert [record.vehicle for record in log] == [vehicle, vehicle2]
+    assert [record.POLAR for record in log] == [False, True]
+    np.testing.assert_allclose(log[0].get_abs_cartesian(), [101., 202.])
+    np.testing.assert_allclose(log[1].get_abs_cartesian(), [0., 2.], atol=1.e-12)
+
+    # Records can be appended to another log like measurements
+    other = MeasurementLog(10)
+    other.append(log[1].t, log[1].sensor, log[1])
+    np.testing.assert_allclose(other[0].get_abs_cartesian(), log[1].get_abs_cartesian())
+# end def
+
+
+def test_overwritten_record_raises(plane, vehicle):
+    log = MeasurementLog(2)
+    record = log.append_values(0., plane, vehicle, np.zeros(2), plane.pos, False)
+
+    for i in range(2):
+        log.append_values(float(i + 1), plane, vehicle, np.zeros(2), plane.pos, False)
+
+    with pytest.raises(IndexError):
+        _ = record.val
+
+    with pytest.raises(IndexError):
+        _ = log[2]
+# end def
+
+
+def test_sensor_log_batches_and_vehicle_views(plane):
+    vehicles = [Vehicle("V{}".format(i), True) for i in range(20)]
+    log = SensorMeasurementLog(3, plane)
+
+    batches = [log.append_batch(float(i), vehicles, np.full((20, 2), float(i)) + np.arange(20)[:, np.newaxis], plane.pos)
+               for i in range(4)]
+    batch = batches[-1]
+
+    # Only the vehicles measured in a row count, the other ones are skipped
+    log.append_batch(4., vehicles[5:7], np.zeros((2, 2)), plane.pos)
+
+    assert list(log) == vehicles and vehicles[0] in log
+    assert len(batch) == 20 and batch.t == 3. and batch.sensor is plane
+    np.testing.assert_array_equal(batch.val[:, 0], 3. + np.arange(20))
+    assert batch[7].vehicle is vehicles[7]
+    np.testing.assert_array_equal(batch[7].get_abs_cartesian(), plane.pos + 10.)
+
+    assert [meas.t for meas in log[vehicles[0]]] == [2., 3.]
+    assert [meas.t for meas in log[vehicles[5]]] == [2., 3., 4.]
+    assert log[vehicles[0]][-1].t == 3. and log[vehicles[5]][-1].t == 4.
+    assert [meas.t for meas in log[vehicles[5]].last(2)] == [3., 4.]
+    assert log[vehicles[5]].last(0) == []
+
+    # Single measurements of the same time share a row
+    other = Vehicle("Other", True)
+    log.append(4., other, np.ones(2), plane.pos)
+    assert log.total_count == 5 and log[other][-1].t == 4.
+    log.append(4., other, np.ones(2), plane.pos)
+    assert log.total_count == 6 and len(log[other]) == 2
+    assert [meas.t for meas in log[vehicles[5]]] == [3., 4.]
+
+    with pytest.raises(IndexError):
+        _ = batches[0].val
+# end def
+
+
+def test_batch_appended_to_a_log(plane):
+    vehicles = [Vehicle("V{}".format(i), True) for i in range(5)]
+    batch = SensorMeasurementLog(10, plane).append_batch(1., vehicles, np.arange(10.).reshape(5, 2), plane.pos)
+    log = MeasurementLog(4)
+
+    log.append_values(0., plane, vehicles[0], np.zeros(2), plane.pos, False)
+    log.append_batch(1., plane, batch)
+
+    assert len(log) == 4 and log.total_count == 6
+    assert [record.vehicle for record in log] == vehicles[1:]
+    np.testing.assert_array_equal(log.val, batch.val[1:])
+    np.testing.assert_array_equal(log.t, [1.] * 4)
+# end def
@@ -0,0 +1,66 @@
+from ring_buffer import RingBuffer
+import numpy as np
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+def test_last_is_chronological_after_wrap_around():
+    buf = RingBuffer(3, shape=(2,))
+
+    for i in range(5):
+        buf.append([i, -i])
+
+    assert len(buf) == 3
+    assert buf.total_count == 5
+    np.testing.assert_array_equal(buf.last(), [[2, -2], [3, -3], [4, -4]])
+    np.testing.assert_array_equal(buf.last(2), [[3, -3], [4, -4]])
+    assert buf.last(0).shape == (0, 2)
+    assert buf.last(10).shape == (3, 2)
+# end def
+
+
+def test_last_is_a_view():
+    buf = RingBuffer(4)
+    buf.append(1.)
+
+    assert np.shares_memory(buf.last(), buf._data)
+# end def
+
+
+def test_resize_keeps_the_latest_entries():
+    buf = RingBuffer(4)
+
+    for i in range(6):
+        buf.append(i)
+
+    buf.resize(8)
+    np.testing.assert_array_equal(buf.last(), [2, 3, 4, 5])
+
+    buf.append(6)
+    np.testing.assert_array_equal(buf.last(), [2, 3, 4, 5, 6])
+
+    buf.resize(2)
+    np.testing.assert_array_equal(buf.last(), [5, 6])
+
+    buf.append(7)
+    np.testing.assert_array_equal(buf.last(), [6, 7])
+# end def
+
+
+def test_clear_resets_the_total_count():
+    buf = RingBuffer(2)
+
+    for i in range(3):
+        buf.append(i)
+
+    buf.clear()
+
+    assert len(buf) == 0
+    assert buf.total_count == 0
+
+    buf.append(9)
+    np.testing.assert_array_equal(buf.last(), [9])
+    assert buf.total_count == 1
+# end def
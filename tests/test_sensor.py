@@ -0,0 +1,59 @@
+from sensor import Radar, RadarMeasurement
+from vehicle import Vehicle
+import numpy as np
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+def _create_vehicles(n):
+    vehicles = [Vehicle("V{}".format(i), True, 100. + 10. * i, 10. + i) for i in range(n)]
+
+    for vehicle in vehicles:
+        vehicle.update(7.)
+
+    return vehicles
+# end def
+
+
+def _create_radars():
+    cov_mat = np.identity(2) * 1.e-24  # Practically noise free, so the measurements can be compared exactly
+    sensor_pos = ([4000., 7000.], [-3000., 500.], [0., 0.])
+
+    return [Radar("R{}".format(i), True, np.asarray(pos), 1., cov_mat) for i, pos in enumerate(sensor_pos)]
+# end def
+
+
+def test_range_bearing_of_many_radars_matches_single_measurements():
+    vehicles = _create_vehicles(5)
+    radars = _create_radars()
+    positions = np.asarray([vehicle.r for vehicle in vehicles])
+    sensor_pos = np.asarray([radar.pos for radar in radars])
+
+    meas = Radar.calc_range_bearing(sensor_pos, positions)
+    assert meas.shape == (len(radars), len(vehicles), 2)
+
+    for radar, meas_radar in zip(radars, meas):
+        np.testing.assert_allclose(Radar.calc_range_bearing(radar.pos, positions), meas_radar)
+
+        for vehicle, meas_vehicle in zip(vehicles, meas_radar):
+            np.testing.assert_allclose(radar._measure(vehicle).val, meas_vehicle, rtol=1.e-12, atol=1.e-9)
+    # end for
+# end def
+
+
+def test_polar_to_cartesian_matches_single_measurements():
+    vehicles = _create_vehicles(5)
+    radars = _create_radars()
+    sensor_pos = np.asarray([radar.pos for radar in radars])
+
+    records = [[radar._measure(vehicle) for vehicle in vehicles] for radar in radars]
+    meas = np.asarray([[record.val for record in records_radar] for records_radar in records])
+    expected = np.asarray([[record.get_abs_cartesian() for record in records_radar] for records_radar in records])
+
+    np.testing.assert_allclose(RadarMeasurement.polar_to_cartesian(meas, sensor_pos), expected)
+    np.testing.assert_allclose(RadarMeasurement.polar_to_cartesian(meas[1], sensor_pos[1]), expected[1])
+    np.testing.assert_allclose(expected, np.broadcast_to([vehicle.r for vehicle in vehicles], expected.shape),
+                               atol=1.e-6)
+# end def
@@ -0,0 +1,66 @@
+from sensor import Plane
+from sensor_group import HomogeneousTriggeredSensorGroup
+from vehicle_fleet import VehicleFleet
+import numpy as np
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+def _create_group():
+    fleet = VehicleFleet(capacity=8)
+
+    for i in range(8):
+        fleet.add_vehicle("V{}".format(i), True, 100. + 10. * i, 10. + i)
+
+    fleet.update(100.)
+
+    sensors = [Plane("P{}".format(i), True, np.asarray(pos), 1., np.identity(2))
+               for i, pos in enumerate(([0., 0.], [10000., -3000.], [5000., 5000.]))]
+
+    for i, sensor in enumerate(sensors):
+        sensor.set_rng(np.random.default_rng(i))
+
+    group = HomogeneousTriggeredSensorGroup("G", sensors, meas_interval=5., cov_mat=np.identity(2) * 5.e2 ** 2)
+
+    return fleet.vehicles, sensors, group
+# end def
+
+
+def test_measure_all_from_batches_matches_single_measurements():
+    vehicles, sensors, group = _create_group()
+    vehicles_ref, sensors_ref, group_ref = _create_group()
+
+    # The group only listens to the sensors' batches, i.e. no per-vehicle measurement objects are needed
+    assert all(len(sensor.listeners) == 0 for sensor in sensors)
+
+    for step in range(3):
+        for sensor, sensor_ref in zip(sensors, sensors_ref):
+            sensor.measure_all(vehicles)
+            sensor_ref.measure_all(vehicles_ref)
+        # end for
+
+        batch = group.measure_all(vehicles)
+        batch_ref = group_ref.measure_all(list(vehicles_ref))  # Another vehicle list takes the per-vehicle path
+
+        np.testing.assert_allclose(batch.val, batch_ref.val)
+    # end for
+
+    assert [meas.vehicle for meas in batch] == vehicles
+    np.testing.assert_allclose(group.measurements[vehicles[3]][-1].val, batch.val[3])
+# end def
+
+
+def test_measure_after_batches():
+    vehicles, sensors, group = _create_group()
+
+    for sensor in sensors:
+        sensor.measure_all(vehicles)
+
+    meas = group._measure(vehicles[2])
+
+    assert meas.vehicle is vehicles[2]
+    assert all(len(group.temp_measurements[vehicle]) == len(sensors) for vehicle in vehicles
+               if vehicle is not vehicles[2])
+# end def
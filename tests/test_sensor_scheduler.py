@@ -0,0 +1,50 @@
+from sensor_scheduler import SensorScheduler
+from sensor import Plane
+import numpy as np
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+def _create_plane(name, meas_interval):
+    return Plane(name, True, np.asarray([0., 0.]), meas_interval, np.identity(2))
+# end def
+
+
+def test_triggers_due_sensors_by_priority_and_order():
+    scheduler = SensorScheduler()
+    a, b, c, d = _create_plane("A", 2.), _create_plane("B", 2.), _create_plane("C", 3.), _create_plane("D", None)
+
+    scheduler.add_sensor(a)
+    scheduler.add_sensor(b, priority=-1)
+    scheduler.add_sensor(c)
+    scheduler.add_sensor(d)
+
+    assert len(scheduler) == 4
+    assert scheduler.next_trigger_time == 2.
+    assert scheduler.trigger_due(1.) == []
+    assert scheduler.trigger_due(2.) == [b, a]
+    assert scheduler.next_trigger_time == 3.
+    assert scheduler.trigger_due(6.) == [b, a, c]  # Each sensor triggers at most once per call
+    assert scheduler.next_trigger_time == 6.
+# end def
+
+
+def test_reschedule_on_interval_change():
+    scheduler = SensorScheduler()
+    a = _create_plane("A", 5.)
+    scheduler.add_sensor(a)
+
+    a.set_meas_interval(1.)
+    assert scheduler.next_trigger_time == 1.
+    assert scheduler.trigger_due(1.) == [a]
+
+    a.set_meas_interval(10.)
+    assert scheduler.next_trigger_time == 11.
+    assert scheduler.trigger_due(5.) == []  # The stale entry at 5 must not trigger
+
+    a.meas_interval = None
+    scheduler.reschedule(a)
+    assert scheduler.next_trigger_time is None
+# end def
@@ -0,0 +1,58 @@
+from simulation_engine import SimulationEngine
+from sensor import Plane
+import numpy as np
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+def test_skip_idle_without_sensors_and_limits_terminates():
+    engine = SimulationEngine(seed=0)
+
+    assert engine.next_event_time() is None
+    assert engine.skip_idle() == 0
+    assert engine.t == 0.
+# end def
+
+
+def test_skip_idle_without_sensors_stops_at_limits():
+    engine = SimulationEngine(seed=0)
+
+    assert engine.skip_idle(t_end=5.) == 5
+    assert engine.skip_idle(n_steps=3) == 3
+    assert engine.t == 8.
+# end def
+
+
+def test_skip_idle_stops_at_next_event():
+    engine = SimulationEngine(seed=0)
+    engine.add_sensor(Plane("P", True, np.asarray([0., 0.]), 3., np.identity(2)))
+
+    assert engine.skip_idle() == 3
+    assert engine.t == engine.next_event_time() == 3.
+# end def
+
+
+def test_skip_idle_jumps_over_long_idle_periods():
+    engine = SimulationEngine(seed=0)
+    engine.add_sensor(Plane("P", True, np.asarray([0., 0.]), 1.e9, np.identity(2)))
+
+    assert engine.skip_idle() == 1000000000
+    assert engine.t == 1.e9
+# end def
+
+
+def test_skip_idle_stops_at_the_first_step_at_or_after_the_limits():
+    engine = SimulationEngine(seed=0, t_incr=.1)
+    engine.add_sensor(Plane("P", True, np.asarray([0., 0.]), .35, np.identity(2)))
+
+    assert engine.skip_idle() == 4
+    assert engine.t >= .35
+
+    engine = SimulationEngine(seed=0, t_incr=.1)
+
+    assert engine.skip_idle(t_end=.3) == 3
+    assert engine.skip_idle(t_end=.3) == 0
+    assert engine.skip_idle(n_steps=0) == 0
+# end def
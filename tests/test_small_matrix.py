@@ -0,0 +1,52 @@
+from small_matrix import det_2x2, det_2x2_batch, inv_2x2, inv_2x2_batch, eig_sym_2x2, eig_sym_2x2_batch, chol_2x2, \
+    chol_2x2_batch
+import numpy as np
+import pytest
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+@pytest.fixture
+def spd_matrices():
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=(20, 2, 2))
+
+    return np.matmul(a, np.swapaxes(a, -1, -2)) + .1 * np.identity(2)
+# end def
+
+
+def test_det(spd_matrices):
+    expected = np.linalg.det(spd_matrices)
+
+    np.testing.assert_allclose(det_2x2_batch(spd_matrices), expected)
+    np.testing.assert_allclose([det_2x2(m) for m in spd_matrices], expected)
+# end def
+
+
+def test_inv(spd_matrices):
+    expected = np.linalg.inv(spd_matrices)
+
+    np.testing.assert_allclose(inv_2x2_batch(spd_matrices), expected)
+    np.testing.assert_allclose([inv_2x2(m) for m in spd_matrices], expected)
+# end def
+
+
+def test_eig_sym(spd_matrices):
+    for m, (e_val, e_vec), e_val_batch, e_vec_batch in zip(spd_matrices, map(eig_sym_2x2, spd_matrices),
+                                                          *eig_sym_2x2_batch(spd_matrices)):
+        np.testing.assert_allclose(e_val, e_val_batch)
+        np.testing.assert_allclose(e_vec, e_vec_batch)
+        np.testing.assert_allclose(np.sort(e_val), np.linalg.eigvalsh(m))
+        np.testing.assert_allclose(np.matmul(m, e_vec), e_vec * e_val, atol=1.e-12)
+    # end for
+# end def
+
+
+def test_chol(spd_matrices):
+    expected = np.linalg.cholesky(spd_matrices)
+
+    np.testing.assert_allclose(chol_2x2_batch(spd_matrices), expected)
+    np.testing.assert_allclose([chol_2x2(m) for m in spd_matrices], expected)
+# end def
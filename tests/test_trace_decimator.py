@@ -0,0 +1,70 @@
+from trace_decimator import TraceDecimator
+from ring_buffer import RingBuffer
+import numpy as np
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+def _random_walk(n, seed=0):
+    return np.cumsum(np.random.default_rng(seed).normal(size=(n, 2)), axis=0)
+# end def
+
+
+def test_incremental_equals_rebuild():
+    trace = RingBuffer(1000, shape=(2,))
+    decimator = TraceDecimator(trace)
+
+    for i, pos in enumerate(_random_walk(500)):
+        trace.append(pos)
+
+        if i % 7 == 0:
+            decimator.decimate(1.)
+    # end for
+
+    points, steps = decimator.decimate(1.)
+    points_rebuilt, steps_rebuilt = TraceDecimator(trace).decimate(1.)
+
+    np.testing.assert_array_equal(steps, steps_rebuilt)
+    np.testing.assert_array_equal(points, points_rebuilt)
+    assert len(steps) < len(trace)
+    assert np.all(np.linalg.norm(np.diff(points[:-1], axis=0), axis=1) >= 2.)  # The newest point is kept anyway
+# end def
+
+
+def test_oldest_and_newest_point_are_kept():
+    trace = RingBuffer(50, shape=(2,))
+    decimator = TraceDecimator(trace)
+
+    for pos in _random_walk(120):
+        trace.append(pos)
+        points, steps = decimator.decimate(.1)  # Coarse, i.e. most points get dropped
+
+        assert steps[0] == 0 and steps[-1] == len(trace) - 1
+        np.testing.assert_array_equal(points[[0, -1]], trace.last()[[0, -1]])
+    # end for
+# end def
+
+
+def test_reset_after_clear():
+    trace = RingBuffer(200, shape=(2,))
+    decimator = TraceDecimator(trace)
+
+    for pos in _random_walk(80):
+        trace.append(pos)
+
+    decimator.decimate(1.)
+    trace.clear()
+    decimator.reset()
+
+    # More points than before, so the cached decimation doesn't look outdated by the total count
+    for pos in _random_walk(120, seed=1):
+        trace.append(pos)
+
+    points, steps = decimator.decimate(1.)
+    points_rebuilt, steps_rebuilt = TraceDecimator(trace).decimate(1.)
+
+    np.testing.assert_array_equal(steps, steps_rebuilt)
+    np.testing.assert_array_equal(points, points_rebuilt)
+# end def
@@ -0,0 +1,126 @@
+from collections import OrderedDict, deque
+import numpy as np
+import math
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+class _DecimationState:
+    """The decimation of a trace for one scale.
+
+    Parameters
+    ----------
+    seq : int
+        The sequence number of the first trace point to process.
+    """
+
+    __slots__ = ("seen", "kept", "last")
+
+    def __init__(self, seq):
+        self.seen = seq  # The sequence number of the next trace point to process
+        self.kept = deque()  # The sequence numbers of the kept trace points
+        self.last = None  # The last kept trace point
+    # end def
+# end class
+
+
+class TraceDecimator:
+    """Decimates a trace in screen space for drawing: a trace point is only kept, if it's at least min_dist_px pixels
+    away from the previously kept one. This way the number of drawn points is bounded by the screen resolution instead
+    of the trace length. The oldest and the newest point are always kept.
+    Since only the scale (and not the translation) matters, the decimation is cached per scale (i.e. zoom level) and
+    gets updated incrementally with the points appended to the trace since the last call. Since the trace's total
+    count starts over on clearing it, reset() needs to be called after clearing the trace.
+
+    Parameters
+    ----------
+    trace : RingBuffer
+        The trace to decimate.
+    min_dist_px : float, optional
+        The min. distance [px] between two kept points.
+    max_cached_scales : int, optional
+        The max. number of scales to keep the decimation for. The least recently used one gets dropped first.
+    """
+
+    def __init__(self, trace, min_dist_px=2., max_cached_scales=8):
+        self.trace = trace
+        self.min_dist_px = min_dist_px
+        self.max_cached_scales = max_cached_scales
+
+        self._states = OrderedDict()  # Scale -> _DecimationState
+    # end def
+
+    def reset(self):
+        """Drops the cached decimations, e.g. after the trace got cleared."""
+
+        self._states.clear()
+    # end def
+
+    def decimate(self, scale):
+        """Returns the decimated trace.
+
+        Parameters
+        ----------
+        scale : float
+            The scale from world to screen coordinates [px / world unit].
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+            The kept points of shape (m, 2) in chronological order and their positions (indices) within the trace.
+        """
+
+        n = len(self.trace)
+        total = self.trace.total_count
+        first = total - n  # The sequence number of the oldest point in the trace
+
+        if n == 0:
+            return np.zeros((0,) + self.trace.shape), np.zeros(0, dtype=int)
+
+        state = self._states.get(scale)
+
+        # Not cached, points got overwritten in between or the trace got cleared (which resets its total count)
+        if state is None or state.seen < first or state.seen > total:
+            state = _DecimationState(first)
+
+        self._states[scale] = state
+        self._states.move_to_end(scale)
+
+        while len(self._states) > self.max_cached_scales:
+            self._states.popitem(last=False)
+
+        # Drop the points overwritten in the meantime
+        while len(state.kept) > 0 and state.kept[0] < first:
+            state.kept.popleft()
+
+        if len(state.kept) == 0:
+            state.last = None
+
+        # Only process the points appended since the last call
+        min_dist = self.min_dist_px / abs(scale)
+
+        for seq, (x, y) in enumerate(self.trace.last(total - state.seen).tolist(), state.seen):
+            if state.last is None or math.hypot(x - state.last[0], y - state.last[1]) >= min_dist:
+                state.kept.append(seq)
+                state.last = (x, y)
+            # end if
+        # end for
+
+        state.seen = total
+
+        # Always keep the oldest and the newest point
+        seqs = list(state.kept)
+
+        if len(seqs) == 0 or seqs[0] != first:
+            seqs.insert(0, first)
+
+        if seqs[-1] != total - 1:
+            seqs.append(total - 1)
+
+        steps = np.asarray(seqs) - first
+
+        return self.trace.last()[steps], steps
+    # end def
+# end class
@@ -1,4 +1,5 @@
 import functools
+import os
 
 
 class ArgumentValidationError(ValueError):
@@ -57,6 +58,43 @@ def ordinal(num):
 # end def
 
 
+def parse_validation_mode(value):
+    """Parses the validation mode setting.
+
+    Parameters
+    ----------
+    value : str
+        The setting: "full" (check every call), "sampled[:N]" (check one call in N, default 100) or "off".
+
+    Returns
+    -------
+    (str, int)
+        The validation mode ("full", "sampled" or "off") and the sample interval N.
+    """
+
+    mode, _, interval = value.strip().lower().partition(":")
+
+    if mode not in ("full", "sampled", "off"):
+        raise ValueError('Invalid type check mode "{0}" (use "full", "sampled[:N]" or "off")'.format(value))
+
+    if mode == "sampled" and interval:
+        interval = int(interval)
+
+        if interval < 1:
+            raise ValueError('Invalid type check sample interval "{0}"'.format(value))
+    else:
+        interval = 100 if mode == "sampled" else 1
+    # end if
+
+    return mode, interval
+# end def
+
+
+# The validation mode gets read once at import time from the environment variable SDF_TYPE_CHECK.
+# With "off", the decorators return the undecorated functions, i.e. there's no per-call cost at all.
+VALIDATION_MODE, VALIDATION_SAMPLE_INTERVAL = parse_validation_mode(os.environ.get("SDF_TYPE_CHECK", "full"))
+
+
 def accepts(*accepted_arg_types):
     """A decorator to validate the parameter types of a given function.
     It is passed a tuple of types. eg. (<type 'tuple'>, <type 'int'>)
@@ -65,6 +103,12 @@ function_args
           tuple of types. The argument passed must only be types."""
 
     def accept_decorator(validate_function):
+        if VALIDATION_MODE == "off":
+            return validate_function
+
+        sampled = VALIDATION_MODE == "sampled"
+        n_calls = 0
+
         # Check if the number of arguments to the validator
         # function is the same as the arguments provided
         # to the actual function to validate. We don't need
@@ -73,6 +117,16 @@ function_args
         # automatically (also with a TypeError).
         @functools.wraps(validate_function)
         def decorator_wrapper(*function_args, **function_args_dict):
+            nonlocal n_calls
+
+            # In sampled mode only validate one call in VALIDATION_SAMPLE_INTERVAL
+            if sampled:
+                n_calls += 1
+
+                if n_calls % VALIDATION_SAMPLE_INTERVAL != 0:
+                    return validate_function(*function_args, **function_args_dict)
+            # end if
+
             # Since there is no known way to find out, if the first parameter is "self" of a calling class,
             # we just can check the length
             if len(function_args) == len(accepted_arg_types) + 1:
@@ -128,8 +182,24 @@ def returns(*accepted_return_type_tuple):
         if len(accepted_return_type_tuple) == 0:
             raise TypeError('You must specify a return type.')
 
+        if VALIDATION_MODE == "off":
+            return validate_function
+
+        sampled = VALIDATION_MODE == "sampled"
+        n_calls = 0
+
         @functools.wraps(validate_function)
         def decorator_wrapper(*function_args):
+            nonlocal n_calls
+
+            # In sampled mode only validate one call in VALIDATION_SAMPLE_INTERVAL
+            if sampled:
+                n_calls += 1
+
+                if n_calls % VALIDATION_SAMPLE_INTERVAL != 0:
+                    return validate_function(*function_args)
+            # end if
+
             # More than one return type has been specified.
             if len(accepted_return_type_tuple) > 1:
                 raise TypeError('You must specify one return type.')
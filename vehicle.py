@@ -68,4 +68,37 @@ class Vehicle:
 
         self.rddxrdn = self.rdd * self.rdn
     # end def
+
+    def calc_states(self, t):
+        """Calculates the Vehicle's states for an array of timestamps in one vectorized pass.
+        The Vehicle's current state is not changed.
+
+        Parameters
+        ----------
+        t : numpy.ndarray
+            The timestamps of shape (T,) to calculate the Vehicle's states for.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            The states r, rd, rdd, rdt, rdn, rddxrdt and rddxrdn, each of shape (T, 2).
+        """
+
+        t = np.asarray(t, dtype=float)
+
+        sin1 = np.sin(self.omega * t)
+        cos1 = np.cos(self.omega * t)
+        sin2 = np.sin(2 * self.omega * t)
+        cos2 = np.cos(2 * self.omega * t)
+
+        r = self.A * np.stack((sin1, sin2), axis=-1)
+        rd = self.v_max * np.stack((cos1 / 2.0, cos2), axis=-1)
+        rdd = -self.q_max * np.stack((sin1 / 4.0, sin2), axis=-1)
+
+        rd_norm = np.hypot(rd[..., 0], rd[..., 1])[..., np.newaxis]
+        rdt = rd / rd_norm
+        rdn = np.stack((-rd[..., 1], rd[..., 0]), axis=-1) / rd_norm
+
+        return r, rd, rdd, rdt, rdn, rdd * rdt, rdd * rdn
+    # end def
 # end class
@@ -0,0 +1,255 @@
+from vehicle import Vehicle
+import numpy as np
+
+
+__author__ = "Anton Höß"
+__copyright__ = "Copyright 2020"
+
+
+def _fleet_property(name):
+    """Creates a property that reads and writes the given parameter or state from/to the vehicle's fleet.
+
+    Parameters
+    ----------
+    name : str
+        The parameter's or state's name (e.g. "v_max" or "r").
+
+    Returns
+    -------
+    property
+        The property.
+    """
+
+    return property(lambda self: self.fleet.get_value(name, self.index),
+                    lambda self, value: self.fleet.set_value(name, self.index, value))
+# end def
+
+
+class FleetVehicle(Vehicle):
+    """A vehicle whose parameters and states are stored in a VehicleFleet.
+    All parameters and states are read from and written to the fleet's arrays, so it can be used like any other
+    Vehicle (e.g. by the sensors). The state arrays returned are views into the fleet's state arrays, i.e. they get
+    overwritten on the next update of the fleet - copy them if they need to be kept.
+
+    Parameters
+    ----------
+    fleet : VehicleFleet
+        The fleet holding the vehicle's parameters and states.
+    index : int
+        The vehicle's index within the fleet.
+    name : str
+        The name of the vehicle.
+    active : bool
+        Defines if the vehicle is active on starting the simulation (can be activated later).
+    v : float, optional
+        The vehicle's velocity.
+    q : float, optional
+        The vehicle's acceleration.
+    """
+
+    def __init__(self, fleet, index, name, active, v=100., q=10.):
+        self.fleet = fleet
+        self.index = index
+
+        Vehicle.__init__(self, name, active, v, q)
+    # end def
+
+    A = _fleet_property("A")
+    omega = _fleet_property("omega")
+    v_max = _fleet_property("v_max")
+    q_max = _fleet_property("q_max")
+
+    r = _fleet_property("r")
+    rd = _fleet_property("rd")
+    rdd = _fleet_property("rdd")
+    rdt = _fleet_property("rdt")
+    rdn = _fleet_property("rdn")
+    rddxrdt = _fleet_property("rddxrdt")
+    rddxrdn = _fleet_property("rddxrdn")
+# end class
+
+
+class VehicleFleet:
+    """A struct-of-arrays container for many vehicles. All vehicle parameters and states are stored in contiguous
+    arrays, which allows to update all vehicles with one broadcasted computation. The individual vehicles are
+    accessible as FleetVehicle objects.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        The initial number of vehicles to allocate memory for. The fleet grows automatically if needed.
+    """
+
+    _PARAM_NAMES = ("A", "omega", "v_max", "q_max")
+    _STATE_NAMES = ("r", "rd", "rdd", "rdt", "rdn", "rddxrdt", "rddxrdn")
+
+    def __init__(self, capacity=16):
+        self._n = 0
+        self._capacity = max(int(capacity), 1)
+
+        self._params = {name: np.zeros(self._capacity) for name in self._PARAM_NAMES}
+        self._states = {name: np.zeros((self._capacity, 2)) for name in self._STATE_NAMES}
+
+        self.vehicles = list()
+    # end def
+
+    def __len__(self):
+        return self._n
+    # end def
+
+    def __iter__(self):
+        return iter(self.vehicles)
+    # end def
+
+    def __getitem__(self, index):
+        return self.vehicles[index]
+    # end def
+
+    def __getattr__(self, name):
+        # Only called if the attribute wasn't found the usual way - provides the parameter and state arrays
+        if name in self._PARAM_NAMES:
+            return self._params[name][:self._n]
+
+        elif name in self._STATE_NAMES:
+            return self._states[name][:self._n]
+
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+    # end def
+
+    def _get_array(self, name):
+        if name in self._params:
+            return self._params[name]
+        else:
+            return self._states[name]
+        # end if
+    # end def
+
+    def get_value(self, name, index):
+        """Returns a parameter (as scalar) or a state (as view into the state array) of a single vehicle.
+
+        Parameters
+        ----------
+        name : str
+            The parameter's or state's name (e.g. "v_max" or "r").
+        index : int
+            The vehicle's index within the fleet.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            The parameter value or the view on the state.
+        """
+
+        return self._get_array(name)[index]
+    # end def
+
+    def set_value(self, name, index, value):
+        """Sets a parameter or a state of a single vehicle.
+
+        Parameters
+        ----------
+        name : str
+            The parameter's or state's name (e.g. "v_max" or "r").
+        index : int
+            The vehicle's index within the fleet.
+        value : float or numpy.ndarray
+            The value to set.
+        """
+
+        self._get_array(name)[index] = value
+    # end def
+
+    def _grow(self):
+        """Doubles the capacity of all parameter and state arrays."""
+
+        self._capacity *= 2
+
+        for name, arr in self._params.items():
+            self._params[name] = np.zeros(self._capacity)
+            self._params[name][:self._n] = arr[:self._n]
+        # end for
+
+        for name, arr in self._states.items():
+            self._states[name] = np.zeros((self._capacity, 2))
+            self._states[name][:self._n] = arr[:self._n]
+        # end for
+    # end def
+
+    def add_vehicle(self, name, active, v=100., q=10.):
+        """Creates a new vehicle within the fleet.
+
+        Parameters
+        ----------
+        name : str
+            The name of the vehicle.
+        active : bool
+            Defines if the vehicle is active on starting the simulation (can be activated later).
+        v : float, optional
+            The vehicle's velocity.
+        q : float, optional
+            The vehicle's acceleration.
+
+        Returns
+        -------
+        FleetVehicle
+            The created vehicle.
+        """
+
+        if self._n == self._capacity:
+            self._grow()
+
+        self._n += 1
+        vehicle = FleetVehicle(self, self._n - 1, name, active, v, q)
+        self.vehicles.append(vehicle)
+
+        return vehicle
+    # end def
+
+    def update(self, t):
+        """Updates the states (position, velocity, acceleration) of all vehicles of the fleet at once.
+
+        Parameters
+        ----------
+        t : float
+            The time to calculate the vehicles' states for.
+        """
+
+        n = self._n
+        A = self._params["A"][:n, np.newaxis]
+        omega = self._params["omega"][:n]
+        v_max = self._params["v_max"][:n, np.newaxis]
+        q_max = self._params["q_max"][:n, np.newaxis]
+
+        r = self._states["r"][:n]
+        rd = self._states["rd"][:n]
+        rdd = self._states["rdd"][:n]
+        rdt = self._states["rdt"][:n]
+        rdn = self._states["rdn"][:n]
+
+        sin1 = np.sin(omega * t)
+        cos1 = np.cos(omega * t)
+        sin2 = np.sin(2 * omega * t)
+        cos2 = np.cos(2 * omega * t)
+
+        r[:, 0] = sin1
+        r[:, 1] = sin2
+        r *= A
+
+        rd[:, 0] = cos1 / 2.0
+        rd[:, 1] = cos2
+        rd *= v_max
+
+        rdd[:, 0] = sin1 / 4.0
+        rdd[:, 1] = sin2
+        rdd *= -q_max
+
+        rd_norm = np.hypot(rd[:, 0], rd[:, 1])[:, np.newaxis]
+        np.divide(rd, rd_norm, out=rdt)
+        rdn[:, 0] = -rd[:, 1]
+        rdn[:, 1] = rd[:, 0]
+        rdn /= rd_norm
+
+        np.multiply(rdd, rdt, out=self._states["rddxrdt"][:n])
+        np.multiply(rdd, rdn, out=self._states["rddxrdn"][:n])
+    # end def
+# end class
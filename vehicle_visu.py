@@ -1,5 +1,6 @@
 import tkinter as tk
 from base_visu import BaseVisu, TraceVisu
+from trace_decimator import TraceDecimator
 
 
 __author__ = "Anton Höß"
@@ -30,13 +31,15 @@ class VehicleVisu(BaseVisu, TraceVisu):
         self.color = color
         self.trace_length_max = trace_length_max
 
-        self._trace_pos = []
-        self._trace_vel = []
-        self._trace_acc = []
-        self._trace_tangent = []
-        self._trace_normal = []
-        self._trace_acc_times_tangent = []
-        self._trace_acc_times_normal = []
+        self._trace_pos = self.create_trace()
+        self._trace_vel = self.create_trace()
+        self._trace_acc = self.create_trace()
+        self._trace_tangent = self.create_trace()
+        self._trace_normal = self.create_trace()
+        self._trace_acc_times_tangent = self.create_trace()
+        self._trace_acc_times_normal = self.create_trace()
+
+        self._lod_pos = TraceDecimator(self._trace_pos)  # The pos trace can get much longer than its drawn extent
     # end def
 
     def add_cur_vals_to_traces(self):
@@ -132,10 +135,13 @@ class VehicleVisu(BaseVisu, TraceVisu):
             Defines the scaling of the traces.
         """
 
+        self.canvas.begin_layer(self)
+
         # Draw trace arrays
         # -----------------
         if draw_pos_trace:
-            self._draw_trace(self._trace_pos, draw_arrow=True, fill_format="#{0:02x}00{1:02x}", width=5.0,
+            pos, steps = self._lod_pos.decimate(abs(self.canvas.get_transform()[0]))
+            self._draw_trace(pos, draw_arrow=True, fill_format="#{0:02x}00{1:02x}", steps=steps, width=5.0,
                              arrowshape=(16, 20, 6))
 
         if draw_vel_trace:
@@ -209,11 +215,12 @@ class VehicleVisu(BaseVisu, TraceVisu):
         self._trace_normal.clear()
         self._trace_acc_times_tangent.clear()
         self._trace_acc_times_normal.clear()
+        self._lod_pos.reset()  # The sequence numbers start over
     # end def
 
     # Draw pos trace array
     # proj_dim = projection dimension: 0 = No projection, 1 = X-axis, 2 = Y-axis
-    def _draw_trace(self, trace, draw_arrow=True, proj_dim=0, proj_scale=1., fill_format="#000000", **kwargs):
+    def _draw_trace(self, trace, draw_arrow=True, proj_dim=0, proj_scale=1., fill_format="#000000", steps=None, **kwargs):
         """Draws a trace onto the VehicleVisu's canvas.
 
         Parameters
@@ -231,9 +238,11 @@ class VehicleVisu(BaseVisu, TraceVisu):
             Defines the scaling of the traces.
         fill_format : str, optional
             Defines the format string for creating the color gradient depending on the relative trace position.
+        steps : numpy.ndarray, optional
+            The positions of the trace's points within the original trace, if the trace got decimated.
         **kwargs : dict, optional
             Keyword arguments passed to tkinter.Canvas.create_line().
         """
 
-        BaseVisu.draw_trace(self.canvas, trace=trace, draw_arrow=draw_arrow, proj_dim=proj_dim, proj_scale=proj_scale, fill_format=fill_format, color=self.color, trace_length_max=self.trace_length_max, **kwargs)
+        BaseVisu.draw_trace(self.canvas, trace=trace, draw_arrow=draw_arrow, proj_dim=proj_dim, proj_scale=proj_scale, fill_format=fill_format, color=self.color, trace_length_max=self.trace_length_max, n_color_bands=self.n_color_bands, steps=steps, **kwargs)
     # end def